@@ -16,38 +16,76 @@ All requests with bodies use generic params variable to pass JSON body
 """
 
 
+from __future__ import annotations
+
 import logging
 import asyncio
+import importlib
+import re
 from pathlib import Path
-from typing import Any, Generator, List
+from typing import TYPE_CHECKING, Any, Dict, Generator, List, Union
 from datetime import datetime
-from dracoon.branding import DRACOONBranding
 from dracoon.client.models import ProxyConfig
-from dracoon.config import DRACOONConfig
-from dracoon.config.responses import GeneralSettingsInfo, InfrastructureProperties, SystemDefaults
-from dracoon.nodes.models import Callback
-from dracoon.nodes.responses import S3FileUploadStatus
-from dracoon.public.responses import AuthADInfo, AuthOIDCInfo, SystemInfo
-from dracoon.roles import DRACOONRoles
-from dracoon.user.models import UserAccount
-
-from .crypto.models import PlainUserKeyPairContainer
-from .downloads import DRACOONDownloads
-from .public import DRACOONPublic
+from dracoon.client.token_store import TokenStore
+from dracoon.concurrency import DEFAULT_CONCURRENCY, gather_bounded
+
 from .client import DRACOONClient, DRACOONConnection, OAuth2ConnectionType
-from .eventlog import DRACOONEvents
-from .nodes import CHUNK_SIZE, MIN_CHUNK_SIZE, DRACOONNodes
-from .shares import DRACOONShares
-from .user import DRACOONUser
-from .users import DRACOONUsers
-from .groups import DRACOONGroups
-from .settings import DRACOONSettings
-from .reports import DRACOONReports
-from .crypto import decrypt_private_key
+from .instance import INSTANCE_INFO_TTL, InstanceInfoCache
 from .logger import create_logger
 from .errors import (CryptoMissingFileKeyError, CryptoMissingKeypairError, DRACOONCryptoError,
                      HTTPNotFoundError, InvalidArgumentError, InvalidFileError, InvalidPathError, ClientDisconnectedError)
 
+if TYPE_CHECKING:
+    from dracoon.branding import DRACOONBranding
+    from dracoon.config import DRACOONConfig
+    from dracoon.config.responses import GeneralSettingsInfo, InfrastructureProperties, SystemDefaults
+    from dracoon.crypto.models import PlainUserKeyPairContainer
+    from dracoon.nodes import DRACOONNodes
+    from dracoon.nodes.models import Callback, Node
+    from dracoon.nodes.responses import S3FileUploadStatus
+    from dracoon.public.responses import AuthADInfoList, AuthOIDCInfoList, SystemInfo
+    from dracoon.roles import DRACOONRoles
+    from dracoon.user.models import UserAccount
+    from .downloads import DRACOONDownloads
+    from .public import DRACOONPublic
+    from .eventlog import DRACOONEvents
+    from .shares import DRACOONShares
+    from .user import DRACOONUser
+    from .users import DRACOONUsers
+    from .groups import DRACOONGroups
+    from .settings import DRACOONSettings
+    from .reports import DRACOONReports
+    from .reports.models import CreateReport
+    from .reports.responses import Report
+
+# adapters (and their modules) are imported on first use
+ADAPTERS = {
+    'DRACOONBranding': 'dracoon.branding',
+    'DRACOONConfig': 'dracoon.config',
+    'DRACOONDownloads': 'dracoon.downloads',
+    'DRACOONEvents': 'dracoon.eventlog',
+    'DRACOONGroups': 'dracoon.groups',
+    'DRACOONNodes': 'dracoon.nodes',
+    'DRACOONPublic': 'dracoon.public',
+    'DRACOONReports': 'dracoon.reports',
+    'DRACOONRoles': 'dracoon.roles',
+    'DRACOONSettings': 'dracoon.settings',
+    'DRACOONShares': 'dracoon.shares',
+    'DRACOONUser': 'dracoon.user',
+    'DRACOONUsers': 'dracoon.users'
+}
+
+
+def import_adapter(name: str) -> Any:
+    """ import adapter type (and its module) """
+    return getattr(importlib.import_module(ADAPTERS[name]), name)
+
+
+def __getattr__(name: str) -> Any:
+    """ lazy import of adapters (e.g. from dracoon import DRACOONReports) """
+    if name in ADAPTERS:
+        return import_adapter(name)
+    raise AttributeError(f"module 'dracoon' has no attribute '{name}'")
 
 
 class DRACOON:
@@ -55,95 +93,109 @@ class DRACOON:
 
     def __init__(self, base_url: str, client_id: str = 'dracoon_legacy_scripting', client_secret: str = '', redirect_uri: str = None,
                  log_file: str = 'dracoon.log', log_level = logging.INFO, log_stream: bool = False, raise_on_err: bool = False, 
-                 proxy_config: ProxyConfig = None, log_file_out: bool = False):
+                 proxy_config: ProxyConfig = None, log_file_out: bool = False, info_ttl: int = INSTANCE_INFO_TTL, info_cache_file: str = None,
+                 token_store: TokenStore = None):
         """ intialize with instance information: base DRACOON url and OAuth app client credentials """
         self.client = DRACOONClient(base_url=base_url, client_id=client_id, client_secret=client_secret, raise_on_err=raise_on_err, 
-                                    proxy_config=proxy_config, redirect_uri=redirect_uri)
+                                    proxy_config=proxy_config, redirect_uri=redirect_uri, token_store=token_store)
         self.logger = create_logger(log_file=log_file, log_level=log_level, log_stream=log_stream, log_file_out=log_file_out)
         self.logger.info("Created DRACOON client.")
         self.plain_keypair = None
         self.user_info =  None
+        self.system_info = None
+        self.auth_ad_info = None
+        self.auth_oidc_info = None
+        self.general_settings = None
+        self.system_defaults = None
+        self.infrastructure_policies = None
+        # instance information is fetched on first use (see get_system_info() etc.)
+        self.instance_info = InstanceInfoCache(base_url=base_url, ttl=info_ttl, file_path=info_cache_file)
+        self.adapters: Dict[str, Any] = {}
         
+    def get_adapter(self, adapter_name: str) -> Any:
+        """ get adapter (created once per connection) """
+        adapter = self.adapters.get(adapter_name)
+
+        if adapter is None or not self.client.connection:
+            adapter_type = import_adapter(adapter_name)
+            adapter = adapter_type(self.client)
+            self.adapters[adapter_name] = adapter
+
+        return adapter
+
     @property
     def config(self) -> DRACOONConfig:
-        return DRACOONConfig(self.client)
-  
-    @property 
+        return self.get_adapter('DRACOONConfig')
+    
+    @property
     def nodes(self) -> DRACOONNodes:
-        return DRACOONNodes(self.client)
+        return self.get_adapter('DRACOONNodes')
     
-    @property  
+    @property
     def public(self) -> DRACOONPublic:
-        return DRACOONPublic(self.client)
+        return self.get_adapter('DRACOONPublic')
     
-    @property 
+    @property
     def user(self) -> DRACOONUser:
-        return DRACOONUser(self.client)
+        return self.get_adapter('DRACOONUser')
     
-    @property 
+    @property
     def reports(self) -> DRACOONReports:
-        return DRACOONReports(self.client)
+        return self.get_adapter('DRACOONReports')
     
     @property
     def roles(self) -> DRACOONRoles:
-        return DRACOONRoles(self.client)
+        return self.get_adapter('DRACOONRoles')
     
-    @property 
+    @property
     def settings(self) -> DRACOONSettings:
-        return DRACOONSettings(self.client)
+        return self.get_adapter('DRACOONSettings')
     
     @property
     def users(self) -> DRACOONUsers:
-       return DRACOONUsers(self.client) 
-   
-    @property 
+        return self.get_adapter('DRACOONUsers')
+    
+    @property
     def groups(self) -> DRACOONGroups:
-        return DRACOONGroups(self.client)
+        return self.get_adapter('DRACOONGroups')
     
-    @property 
+    @property
     def eventlog(self) -> DRACOONEvents:
-        return DRACOONEvents(self.client)
+        return self.get_adapter('DRACOONEvents')
     
     @property
     def shares(self) -> DRACOONShares:
-       return DRACOONShares(self.client) 
-   
+        return self.get_adapter('DRACOONShares')
+    
     @property
     def downloads(self) -> DRACOONDownloads:
-       return DRACOONDownloads(self.client)
-
+        return self.get_adapter('DRACOONDownloads')
+    
     @property
     def branding(self) -> DRACOONBranding:
-       return DRACOONBranding(self.client) 
-   
+        return self.get_adapter('DRACOONBranding')
+    
     async def connect(self, connection_type: OAuth2ConnectionType = OAuth2ConnectionType.auth_code, username: str = None, 
-                      password: str = None, auth_code: str = None, refresh_token: str = None, redirect_uri: str = None, full_info: bool = True) -> DRACOONConnection:
-        """ establishes a connection required for all adapters """
+                      password: str = None, auth_code: str = None, refresh_token: str = None, redirect_uri: str = None, full_info: bool = True, 
+                      reuse_stored: bool = False) -> DRACOONConnection:
+        """ establishes a connection required for all adapters (reuse_stored: see DRACOONClient.connect()) """
+        # adapters are created again for new connection
+        self.adapters.clear()
         self.connection = await self.client.connect(connection_type=connection_type, username=username, password=password, 
-                                               auth_code=auth_code, refresh_token=refresh_token, redirect_uri=redirect_uri)
+                                               auth_code=auth_code, refresh_token=refresh_token, redirect_uri=redirect_uri,
+                                               reuse_stored=reuse_stored)
 
         self.logger.info("Initialized DRACOON adapters.")
         
+        # account information might belong to another user
+        self.user_info = None
+        self.instance_info.entries.pop('user_info', None)
+        
         if full_info:
-            user_info_res = self.user.get_account_information()
-            system_info_res = self.public.get_system_info()
-            oidc_auth_info_res = self.public.get_auth_openid_info()
-            ad_auth_info_res = self.public.get_auth_ad_info()
-            
-            system_defaults = self.config.get_system_defaults()
-            infrastructure_policies = self.config.get_infrastructure_properties()
-            general_settings = self.config.get_general_settings()
             self.logger.debug("Getting DRACOON instance information...")
 
-            reqs = await asyncio.gather(user_info_res, system_info_res, oidc_auth_info_res, ad_auth_info_res, system_defaults, infrastructure_policies, general_settings)
-            
-            self.user_info: UserAccount = reqs[0]
-            self.system_info: SystemInfo = reqs[1]
-            self.auth_ad_info: AuthADInfo = reqs[3]
-            self.auth_oidc_info: AuthOIDCInfo = reqs[2]
-            self.general_settings: GeneralSettingsInfo = reqs[6]
-            self.system_defaults: SystemDefaults = reqs[4]
-            self.infrastructure_policies: InfrastructureProperties = reqs[5]
+            await asyncio.gather(self.get_user_info(), self.get_system_info(), self.get_auth_oidc_info(), self.get_auth_ad_info(), 
+                                 self.get_system_defaults(), self.get_infrastructure_policies(), self.get_general_settings())
 
             self.logger.info("Retrieved instance and account information.")
             self.logger.debug("Logged in as user id %s.", self.user_info.id)
@@ -151,9 +203,64 @@ class DRACOON:
         
         return self.connection
         
+    async def get_instance_info(self, name: str, model: type, fetch_fn, refresh: bool = False, persist: bool = True) -> Any:
+        """ get (cached) instance information - fetched on first use or if expired """
+        value = None if refresh else self.instance_info.get(name=name, model=model)
+
+        if value is None:
+            value = await fetch_fn()
+            self.instance_info.set(name=name, value=value, persist=persist)
+            self.logger.debug("Retrieved instance information: %s", name)
+
+        setattr(self, name, value)
+        return value
+
+    async def get_user_info(self, refresh: bool = False) -> UserAccount:
+        """ get (cached) account information of authenticated user """
+        from dracoon.user.models import UserAccount
+        return await self.get_instance_info(name='user_info', model=UserAccount, fetch_fn=self.user.get_account_information, 
+                                            refresh=refresh, persist=False)
+
+    async def get_system_info(self, refresh: bool = False) -> SystemInfo:
+        """ get (cached) system information (e.g. S3 storage) """
+        from dracoon.public.responses import SystemInfo
+        return await self.get_instance_info(name='system_info', model=SystemInfo, fetch_fn=self.public.get_system_info, refresh=refresh)
+
+    async def get_auth_ad_info(self, refresh: bool = False) -> AuthADInfoList:
+        """ get (cached) active directory information """
+        from dracoon.public.responses import AuthADInfoList
+        return await self.get_instance_info(name='auth_ad_info', model=AuthADInfoList, fetch_fn=self.public.get_auth_ad_info, refresh=refresh)
+
+    async def get_auth_oidc_info(self, refresh: bool = False) -> AuthOIDCInfoList:
+        """ get (cached) openid information """
+        from dracoon.public.responses import AuthOIDCInfoList
+        return await self.get_instance_info(name='auth_oidc_info', model=AuthOIDCInfoList, fetch_fn=self.public.get_auth_openid_info, 
+                                            refresh=refresh)
+
+    async def get_system_defaults(self, refresh: bool = False) -> SystemDefaults:
+        """ get (cached) system defaults """
+        from dracoon.config.responses import SystemDefaults
+        return await self.get_instance_info(name='system_defaults', model=SystemDefaults, fetch_fn=self.config.get_system_defaults, 
+                                            refresh=refresh)
+
+    async def get_infrastructure_policies(self, refresh: bool = False) -> InfrastructureProperties:
+        """ get (cached) infrastructure properties """
+        from dracoon.config.responses import InfrastructureProperties
+        return await self.get_instance_info(name='infrastructure_policies', model=InfrastructureProperties, 
+                                            fetch_fn=self.config.get_infrastructure_properties, refresh=refresh)
+
+    async def get_general_settings(self, refresh: bool = False) -> GeneralSettingsInfo:
+        """ get (cached) general settings """
+        from dracoon.config.responses import GeneralSettingsInfo
+        return await self.get_instance_info(name='general_settings', model=GeneralSettingsInfo, fetch_fn=self.config.get_general_settings, 
+                                            refresh=refresh)
+
     async def logout(self, revoke_refresh_token: bool = False) -> None:
         """ closes the httpx client and revokes tokens """
         await self.client.logout(revoke_refresh_token=revoke_refresh_token)
+        self.adapters.clear()
+        self.user_info = None
+        self.instance_info.entries.pop('user_info', None)
         self.logger.info("Revoked token(s).")
 
     async def test_connection(self) -> bool:
@@ -178,6 +285,12 @@ class DRACOON:
             self.logger.error("DRACOON client not connected: Keypair not retrieved.")
             raise ClientDisconnectedError()
         
+        if self.user_info is None:
+            await self.get_user_info()
+        
+        # crypto is imported on first use
+        from .crypto import decrypt_private_key
+
         enc_keypair = await self.user.get_user_keypair(raise_on_err=True)
         try:
             plain_keypair = decrypt_private_key(secret, enc_keypair)
@@ -197,9 +310,14 @@ class DRACOON:
                      modification_date: str = None, creation_date: str = None, 
                      raise_on_err: bool = False, callback_fn: Callback  = None,
                      target_parent_id: int = None,
-                     chunksize: int = CHUNK_SIZE
+                     chunksize: int = None
                      ) -> S3FileUploadStatus:  
-        """ upload a file to a target """
+        """ upload a file to a target (default chunksize: CHUNK_SIZE of nodes adapter) """
+        from .nodes import CHUNK_SIZE, MIN_CHUNK_SIZE
+
+        if chunksize is None:
+            chunksize = CHUNK_SIZE
+
         if not self.client.connection:
             self.logger.error("DRACOON client not connected: Upload failed.")
             err = ClientDisconnectedError(message="DRACOON client not connected.")
@@ -208,25 +326,7 @@ class DRACOON:
         if self.client.raise_on_err:
             raise_on_err = True
             
-        if target_parent_id is None and target_path is None:
-            self.logger.critical('Upload failed: Missing target info - id or path must be provided.')
-            err = InvalidPathError(message='Missing mandatory arguments: target path or target parent id')
-            await self.client.handle_generic_error(err=err)
-            
-            
-        if target_parent_id is not None:
-            node_info = await self.nodes.get_node(node_id=target_parent_id, raise_on_err=raise_on_err)
-        elif target_path is not None:
-            node_info = await self.nodes.get_node_from_path(path=target_path, raise_on_err=raise_on_err)
-        else:
-            raise InvalidArgumentError("Missing node info: Provide target path or node id.")
-        
-        if not node_info:
-            self.logger.critical('Upload failed: Invalid target path.')
-            msg = 'Node %s not found.', target_path
-            self.logger.debug(msg)
-            err = InvalidPathError(message=msg)
-            await self.client.handle_generic_error(err=err)
+        node_info = await self.get_upload_target(target_path=target_path, target_parent_id=target_parent_id, raise_on_err=raise_on_err)
             
         if file_name is None: 
             file_name = Path(file_path).name
@@ -252,7 +352,9 @@ class DRACOON:
         
         use_s3_storage = False
         
-        if self.system_info.useS3Storage:
+        system_info = await self.get_system_info()
+        
+        if system_info.useS3Storage:
             use_s3_storage = True    
             if chunksize < MIN_CHUNK_SIZE: chunksize = MIN_CHUNK_SIZE
 
@@ -291,9 +393,123 @@ class DRACOON:
         
         return upload
 
+    async def get_upload_target(self, target_path: str = None, target_parent_id: int = None, raise_on_err: bool = False) -> Node:
+        """ get target node (room / folder) of an upload by id or path """
+        if target_parent_id is None and target_path is None:
+            self.logger.critical('Upload failed: Missing target info - id or path must be provided.')
+            err = InvalidPathError(message='Missing mandatory arguments: target path or target parent id')
+            await self.client.handle_generic_error(err=err)
+            
+        if target_parent_id is not None:
+            node_info = await self.nodes.get_node(node_id=target_parent_id, raise_on_err=raise_on_err)
+        elif target_path is not None:
+            node_info = await self.nodes.get_node_from_path(path=target_path, raise_on_err=raise_on_err)
+        else:
+            raise InvalidArgumentError("Missing node info: Provide target path or node id.")
+        
+        if not node_info:
+            self.logger.critical('Upload failed: Invalid target path.')
+            msg = 'Node %s not found.', target_path
+            self.logger.debug(msg)
+            err = InvalidPathError(message=msg)
+            await self.client.handle_generic_error(err=err)
+            
+        return node_info
+
+    async def upload_files(self, file_paths: List[str], target_path: str = None, target_parent_id: int = None, 
+                           resolution_strategy: str = 'autorename', raise_on_err: bool = False, 
+                           chunksize: int = None, concurrency: int = DEFAULT_CONCURRENCY
+                           ) -> List[Union[Node, S3FileUploadStatus]]:
+        """ 
+        upload many (small) files to the same target 
+        target is resolved once, uploads run concurrently (upload channel, content, completion)
+        and status of S3 uploads is polled for all files together 
+        """
+        from .nodes import CHUNK_SIZE, MIN_CHUNK_SIZE
+        from .nodes.responses import S3Status
+
+        if chunksize is None:
+            chunksize = CHUNK_SIZE
+
+        if not self.client.connection:
+            self.logger.error("DRACOON client not connected: Upload failed.")
+            err = ClientDisconnectedError(message="DRACOON client not connected.")
+            await self.client.handle_generic_error(err=err)
+            
+        if self.client.raise_on_err:
+            raise_on_err = True
+
+        node_info = await self.get_upload_target(target_path=target_path, target_parent_id=target_parent_id, raise_on_err=raise_on_err)
+
+        target_id = node_info.id
+        is_encrypted = node_info.isEncrypted
+        use_s3_storage = (await self.get_system_info()).useS3Storage
+        
+        if use_s3_storage and chunksize < MIN_CHUNK_SIZE: 
+            chunksize = MIN_CHUNK_SIZE
+        
+        if is_encrypted and not self.check_keypair():
+            self.logger.critical("Upload failed: Keypair not unlocked.")
+            raise CryptoMissingKeypairError('DRACOON crypto upload requires unlocked keypair. Please unlock keypair first.')
+
+        self.logger.info("Uploading %s files.", len(file_paths))
+        self.logger.debug("Destination: %s", target_id)
+        self.logger.debug("Encrypted: %s", is_encrypted)
+        self.logger.debug("Using S3 storage: %s", use_s3_storage)
+
+        async def upload_file(file_path: str):
+            file = Path(file_path)
+            file_stat = file.stat()
+            modification_date = datetime.fromtimestamp(file_stat.st_mtime).strftime('%Y-%m-%dT%H:%M:%S')
+            creation_date = datetime.fromtimestamp(file_stat.st_ctime).strftime('%Y-%m-%dT%H:%M:%S')
+
+            upload_channel_payload = self.nodes.make_upload_channel(parent_id=target_id, name=file.name, direct_s3_upload=use_s3_storage, 
+                                                                    modification_date=modification_date, creation_date=creation_date)
+            upload_channel = await self.nodes.create_upload_channel(upload_channel=upload_channel_payload, raise_on_err=raise_on_err)
+
+            if is_encrypted and use_s3_storage:
+                upload = await self.nodes.upload_s3_encrypted(file_path=file_path, upload_channel=upload_channel, plain_keypair=self.plain_keypair,
+                                                              resolution_strategy=resolution_strategy, raise_on_err=raise_on_err, 
+                                                              chunksize=chunksize, poll_status=False)
+            elif is_encrypted:
+                upload = await self.nodes.upload_encrypted(file_path=file_path, upload_channel=upload_channel, plain_keypair=self.plain_keypair, 
+                                                           resolution_strategy=resolution_strategy, raise_on_err=raise_on_err, chunksize=chunksize)
+            elif use_s3_storage:
+                upload = await self.nodes.upload_s3_unencrypted(file_path=file_path, upload_channel=upload_channel, 
+                                                                resolution_strategy=resolution_strategy, raise_on_err=raise_on_err, 
+                                                                chunksize=chunksize, poll_status=False)
+            else:
+                upload = await self.nodes.upload_unencrypted(file_path=file_path, upload_channel=upload_channel, 
+                                                             resolution_strategy=resolution_strategy, raise_on_err=raise_on_err, chunksize=chunksize)
+            
+            return upload_channel.uploadId, upload
+
+        uploads = await gather_bounded([upload_file(file_path) for file_path in file_paths], limit=concurrency)
+        
+        if not use_s3_storage:
+            self.logger.info("Upload of %s files completed.", len(file_paths))
+            return [upload for _, upload in uploads]
+
+        # poll S3 upload status for all files together
+        pending_uploads = [upload_id for upload_id, upload in uploads if upload is not None]
+        upload_status = await self.nodes.wait_for_s3_uploads(upload_ids=pending_uploads, raise_on_err=raise_on_err)
+
+        if is_encrypted:
+            key_reqs = [self.nodes.distribute_missing_file_keys(file_id=status.node.id, plain_keypair=self.plain_keypair, raise_on_err=raise_on_err) 
+                        for status in upload_status.values() if status.status == S3Status.done.value]
+            await gather_bounded(key_reqs, limit=concurrency)
+
+        self.logger.info("Upload of %s files completed.", len(file_paths))
+
+        return [upload_status.get(upload_id) if upload is not None else None for upload_id, upload in uploads]
+
     async def download(self, target_path: str, file_path: str = None, raise_on_err: bool = False, 
-                       callback_fn: Callback  = None, file_name: str = None, source_node_id: int = None, chunksize: int = CHUNK_SIZE):
-        """ download a file to a target """
+                       callback_fn: Callback  = None, file_name: str = None, source_node_id: int = None, chunksize: int = None):
+        """ download a file to a target (default chunksize: CHUNK_SIZE of nodes adapter) """
+        from .nodes import CHUNK_SIZE
+
+        if chunksize is None:
+            chunksize = CHUNK_SIZE
 
         if not self.client.connection:
             await self.client.disconnect()
@@ -349,6 +565,62 @@ class DRACOON:
             raise CryptoMissingKeypairError(message='Keypair must be entered for encrypted nodes.')
 
 
+    async def get_report_files(self, report: Report, raise_on_err: bool = False) -> List[Node]:
+        """ get generated files of a report (stored in report target room) """
+        if report.target is None:
+            raise InvalidArgumentError(message='Report has no target room.')
+
+        # filter values cannot contain filter separators: longest part of name is filtered, full name is matched below
+        name_filter = max((part.strip() for part in re.split(r'[|:]', report.name or '')), key=len)
+        node_filter = f'type:eq:file|name:cn:{name_filter}' if name_filter else 'type:eq:file'
+
+        files = []
+        offset = 0
+        while True:
+            nodes = await self.nodes.get_nodes(parent_id=report.target.id, offset=offset, filter=node_filter, 
+                                               limit=500, raise_on_err=raise_on_err)
+            files.extend(nodes.items)
+            offset += len(nodes.items)
+            if not nodes.items or offset >= nodes.range.total:
+                break
+
+        files = [file for file in files if (report.name or '').lower() in file.name.lower()]
+
+        # files of previous reports with the same name are skipped
+        if report.created is not None:
+            files = [file for file in files if file.createdAt is None or file.createdAt >= report.created]
+
+        return files
+
+    async def download_report(self, report: Report, target_path: str, raise_on_err: bool = False, 
+                              concurrency: int = DEFAULT_CONCURRENCY) -> List[str]:
+        """ download generated files of a report to a target folder - returns file paths """
+        files = await self.get_report_files(report=report, raise_on_err=raise_on_err)
+
+        await gather_bounded([self.download(target_path=target_path, source_node_id=file.id, raise_on_err=raise_on_err) for file in files], 
+                             limit=concurrency)
+
+        self.logger.info("Downloaded %s report file(s).", len(files))
+        return [str(Path(target_path) / file.name) for file in files]
+
+    async def run_report(self, report: CreateReport, target_path: str, raise_on_err: bool = False) -> List[str]:
+        """ create a report, wait until it is generated and download its files - returns file paths """
+        from dracoon.reports.responses import ReportState
+
+        created = await self.reports.create_report(report=report, raise_on_err=True)
+
+        if created is None or created.id is None:
+            raise InvalidArgumentError(message='Report id not returned.')
+
+        created = await self.reports.wait_for_report(report_id=created.id)
+
+        if created.error is not None or created.state != ReportState.finished:
+            self.logger.error("Report generation failed: %s", created.id)
+            err = InvalidArgumentError(message=f'Report not generated: {created.error.message if created.error else created.state}')
+            await self.client.handle_generic_error(err=err)
+
+        return await self.download_report(report=created, target_path=target_path, raise_on_err=raise_on_err)
+
     def get_code_url(self) -> str:
         """ get code url for authorization code flow """
         self.logger.info("Getting authorization URL.")
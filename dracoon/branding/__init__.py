@@ -99,7 +99,7 @@ class DRACOONBranding:
             await self.dracoon.handle_http_error(err=e, raise_on_err=raise_on_err)
         
         self.logger.info("Retrieved branding.")
-        return UpdateBrandingResponse(**res.json())
+        return UpdateBrandingResponse.model_validate_json(res.content)
     
     async def update_branding(self, branding_update: UpdateBrandingRequest, raise_on_err: bool = False) -> UpdateBrandingResponse:
         if not await self.dracoon.test_connection() and self.dracoon.connection:
@@ -122,7 +122,7 @@ class DRACOONBranding:
             await self.dracoon.handle_http_error(err=e, raise_on_err=raise_on_err)
         
         self.logger.info("Updated branding.")
-        return UpdateBrandingResponse(**res.json())
+        return UpdateBrandingResponse.model_validate_json(res.content)
     
     async def upload_branding_image(self, type: ImageType, file_path: str, raise_on_err: bool = False) -> Upload:
         if not await self.dracoon.test_connection() and self.dracoon.connection:
@@ -154,7 +154,7 @@ class DRACOONBranding:
             await self.dracoon.handle_http_error(err=e, raise_on_err=raise_on_err)
         
         self.logger.info("Uploaded branding image.")
-        return Upload(**res.json())
+        return Upload.model_validate_json(res.content)
     
 class DRACOONPublicBranding:
 
@@ -195,7 +195,7 @@ class DRACOONPublicBranding:
             await self.dracoon.handle_http_error(err=e, raise_on_err=raise_on_err)
         
         self.logger.info("Retrieved branding.")
-        return CacheableBrandingResponse(**res.json())
+        return CacheableBrandingResponse.model_validate_json(res.content)
     
     async def get_public_branding_image(self, type: ImageType, size: ImageSize) -> Tuple[bytes, str]:
 
@@ -13,18 +13,24 @@ import asyncio
 import logging
 
 from datetime import datetime
+from typing import Any, AsyncIterator, Optional
 
 import httpx
 from tenacity import retry_if_exception_type, stop_after_attempt, wait_exponential
 
 from dracoon.client.models import DRACOONConnection, OAuth2ConnectionType, ProxyConfig, RetryConfig
+from dracoon.client.token_store import TokenStore
+from dracoon.serialization import JSON_CONTENT_TYPE, json_dumps, json_loads
+from dracoon.streaming import JSONItemParser
 from dracoon.errors import (HTTPTooManyRequestsError, MissingCredentialsError, HTTPBadRequestError, HTTPUnauthorizedError, 
                             HTTPPaymentRequiredError, HTTPForbiddenError, HTTPNotFoundError, HTTPConflictError, HTTPPreconditionsFailedError,
-                            HTTPUnknownError, HTTPServerError, ConnectionError)
+                            HTTPUnknownError, HTTPServerError, ConnectionError, DRACOONHttpError)
 
 # constants for client config
 USER_AGENT = 'dracoon-python-1.13.0'
 DEFAULT_TIMEOUT_CONFIG = httpx.Timeout(10, connect=30, read=30)
+# stored access tokens expiring within margin are refreshed (in seconds)
+TOKEN_REFRESH_MARGIN = 60
 RETRY_CONFIG_BASE = RetryConfig(retry=retry_if_exception_type((HTTPTooManyRequestsError, HTTPServerError, ConnectionError)),
                            stop=stop_after_attempt(5),
                            wait=wait_exponential(multiplier=1.2, min=5, max=15),
@@ -33,6 +39,19 @@ RETRY_CONFIG_BASE = RetryConfig(retry=retry_if_exception_type((HTTPTooManyReques
 RETRY_CONFIG = RETRY_CONFIG_BASE.model_dump()
 
 
+class DRACOONHttpClient(httpx.AsyncClient):
+    """ httpx async client encoding JSON request bodies with the configured JSON backend """
+
+    def build_request(self, method: str, url, *, json: Any = None, content: Any = None, headers: Any = None, **kwargs) -> httpx.Request:
+        if json is not None and content is None:
+            content = json_dumps(json)
+            headers = httpx.Headers(headers)
+            headers["Content-Type"] = JSON_CONTENT_TYPE
+            json = None
+        
+        return super().build_request(method, url, content=content, json=json, headers=headers, **kwargs)
+
+
 class DRACOONClient:
     """ DRACOON client with an httpx async client """
     """ requires OAuth connection details and base url """
@@ -45,7 +64,7 @@ class DRACOONClient:
     }
 
     def __init__(self, base_url: str, client_id: str = 'dracoon_legacy_scripting', client_secret: str = '', redirect_uri: str = None,
-                 raise_on_err: bool = False, proxy_config: ProxyConfig = None):
+                 raise_on_err: bool = False, proxy_config: ProxyConfig = None, token_store: TokenStore = None):
         """ client is initialized with DRACOON instance details (url and OAuth client credentials) """
         
         # custom transport for retries on connection errors
@@ -54,7 +73,7 @@ class DRACOONClient:
         self.base_url = base_url
         self.client_id = client_id
         self.client_secret = client_secret
-        self.http = httpx.AsyncClient(headers=self.headers, timeout=DEFAULT_TIMEOUT_CONFIG, proxies=proxy_config, transport=DEFAULT_HTTPX_TRANSPORT)
+        self.http = DRACOONHttpClient(headers=self.headers, timeout=DEFAULT_TIMEOUT_CONFIG, proxies=proxy_config, transport=DEFAULT_HTTPX_TRANSPORT)
         self.uploader = httpx.AsyncClient(timeout=DEFAULT_TIMEOUT_CONFIG, proxies=proxy_config, transport=DEFAULT_HTTPX_TRANSPORT)
         self.downloader = httpx.AsyncClient(timeout=DEFAULT_TIMEOUT_CONFIG, proxies=proxy_config, transport=DEFAULT_HTTPX_TRANSPORT)
         self.connected = False
@@ -64,6 +83,12 @@ class DRACOONClient:
             self.redirect_uri = f"{self.base_url}/oauth/callback"
         self.connection: DRACOONConnection = None
         self.raise_on_err = raise_on_err
+        # optional persistent token store (shared by processes)
+        self.token_store = token_store
+        self.token_key: str = None
+        # shared state of adapters (e.g. completion watchers), adapters are created on demand
+        self.watchers = {}
+        self.caches = {}
         self.logger = logging.getLogger('dracoon.client')
         self.logger.info("DRACOON client created.")
         self.logger.debug(f"DRACOON client config: {self.base_url} // {self.client_id}")
@@ -90,8 +115,53 @@ class DRACOONClient:
 
    
     async def connect(self, connection_type: OAuth2ConnectionType, username: str = None, password: str = None, 
-                      auth_code: str = None, refresh_token: str = None, redirect_uri: str = None) -> DRACOONConnection:
-        """ connects based on given OAuth2ConnectionType """
+                      auth_code: str = None, refresh_token: str = None, redirect_uri: str = None, 
+                      reuse_stored: bool = False) -> DRACOONConnection:
+        """ 
+        connects based on given OAuth2ConnectionType (reuses valid tokens of token store if configured)
+        password and auth code flow only reuse stored tokens with reuse_stored - password or auth code is NOT verified then
+        """
+        if self.token_store is None:
+            return await self.authenticate(connection_type=connection_type, username=username, password=password, auth_code=auth_code,
+                                           refresh_token=refresh_token, redirect_uri=redirect_uri)
+
+        self.token_key = self.get_token_key(username)
+
+        # only one client (process) requests tokens, all others reuse the stored tokens
+        async with self.token_store.lock(self.token_key):
+            is_refresh = connection_type == OAuth2ConnectionType.refresh_token
+            stored = await self.token_store.load(self.token_key) if is_refresh or reuse_stored else None
+            is_own = self.connection is not None and stored is not None and stored.access_token == self.connection.access_token
+
+            if stored is not None and self.is_token_valid(stored) and not (is_refresh and is_own):
+                self.logger.info("Using stored connection.")
+                self.use_connection(stored)
+                return self.connection
+
+            # stored refresh token is the latest (another process may have refreshed)
+            if stored is not None and refresh_token is None:
+                try:
+                    connection = await self.authenticate(connection_type=OAuth2ConnectionType.refresh_token, refresh_token=stored.refresh_token)
+                except DRACOONHttpError:
+                    if is_refresh:
+                        await self.token_store.delete(self.token_key)
+                        raise
+                    self.logger.warning("Stored refresh token invalid - using %s.", connection_type.name)
+                    connection = None
+
+                if connection is not None:
+                    await self.token_store.save(self.token_key, connection)
+                    return connection
+
+            connection = await self.authenticate(connection_type=connection_type, username=username, password=password, auth_code=auth_code,
+                                                 refresh_token=refresh_token, redirect_uri=redirect_uri)
+            await self.token_store.save(self.token_key, connection)
+
+        return connection
+
+    async def authenticate(self, connection_type: OAuth2ConnectionType, username: str = None, password: str = None, 
+                           auth_code: str = None, refresh_token: str = None, redirect_uri: str = None) -> DRACOONConnection:
+        """ requests tokens based on given OAuth2ConnectionType """
         token_url = self.base_url + '/oauth/token'
         now = datetime.now()
 
@@ -132,8 +202,8 @@ class DRACOONClient:
                 await self.handle_http_error(e, True)
 
 
-            self.connection = DRACOONConnection(now, res.json()["access_token"], res.json()["expires_in"],
-                                         res.json()["refresh_token"])
+            token = json_loads(res.content)
+            self.connection = DRACOONConnection(now, token["access_token"], token["expires_in"], token["refresh_token"])
 
         # TODO: refactor to own _method
         if connection_type == OAuth2ConnectionType.auth_code:
@@ -154,8 +224,8 @@ class DRACOONClient:
                 self.logger.error("Authorization code authentication failed.")
                 await self.handle_http_error(e, True)
 
-            self.connection = DRACOONConnection(now, res.json()["access_token"], res.json()["expires_in"],
-                                         res.json()["refresh_token"])
+            token = json_loads(res.content)
+            self.connection = DRACOONConnection(now, token["access_token"], token["expires_in"], token["refresh_token"])
 
             self.logger.info("Established connection.")
             self.logger.debug("Access token valid: %s", self.connection.access_token_validity)
@@ -186,14 +256,35 @@ class DRACOONClient:
                 await self.handle_http_error(e, True)
 
 
-            self.connection = DRACOONConnection(now, res.json()["access_token"], res.json()["expires_in"],
-                                         res.json()["refresh_token"])
+            token = json_loads(res.content)
+            self.connection = DRACOONConnection(now, token["access_token"], token["expires_in"], token["refresh_token"])
 
-        self.connected = True
-        self.http.headers["Authorization"] = "Bearer " + self.connection.access_token
+        self.use_connection(self.connection)
   
         return self.connection
 
+    def use_connection(self, connection: DRACOONConnection) -> None:
+        """ use connection (tokens) for authenticated requests """
+        self.connection = connection
+        self.connected = True
+        self.http.headers["Authorization"] = "Bearer " + self.connection.access_token
+
+    def get_token_key(self, username: str = None) -> str:
+        """ key of connection in token store (instance, OAuth client and user if known) """
+        if username is None and self.token_key is not None:
+            return self.token_key
+
+        key = f'{self.base_url}|{self.client_id}'
+        if username:
+            key += f'|{username}'
+
+        return key
+
+    def is_token_valid(self, connection: DRACOONConnection) -> bool:
+        """ check access token validity of a connection (with margin for running requests) """
+        age = (datetime.now() - connection.connected_at).total_seconds()
+        return age < connection.access_token_validity - TOKEN_REFRESH_MARGIN
+
     async def disconnect(self):
         """ close async httpx clients """
         await self.http.aclose()
@@ -226,8 +317,12 @@ class DRACOONClient:
             self.logger.error("Revoking token(s) failed.")
             await self.handle_http_error(err=e, raise_on_err=self.raise_on_err)
 
+        if self.token_store is not None and self.token_key is not None:
+            await self.token_store.delete(self.token_key)
+
         self.connected = False
         self.connection = None
+        self.caches.clear()
         await self.disconnect()
 
     async def check_access_token(self, test: bool = False):
@@ -235,7 +330,7 @@ class DRACOONClient:
 
         if not test and self.connection:
             now = datetime.now()
-            return (now - self.connection.connected_at).seconds < self.connection.access_token_validity
+            return (now - self.connection.connected_at).total_seconds() < self.connection.access_token_validity
         elif test and self.connection:
             return await self.test_connection()
         else:
@@ -270,6 +365,24 @@ class DRACOONClient:
         return await self.check_access_token()
 
 
+    async def stream_items(self, url: str, items_key: Optional[str] = 'items', raise_on_err: bool = False) -> AsyncIterator[Any]:
+        """ stream items of a list response (items are parsed while response is received) """
+        parser = JSONItemParser(items_key=items_key)
+
+        try:
+            async with self.http.stream('GET', url) as res:
+                if res.is_error:
+                    await res.aread()
+                res.raise_for_status()
+                async for chunk in res.aiter_bytes():
+                    for item in parser.feed(chunk):
+                        yield item
+        except httpx.RequestError as e:
+            await self.handle_connection_error(e)
+        except httpx.HTTPStatusError as e:
+            self.logger.error("Streaming items failed.")
+            await self.handle_http_error(err=e, raise_on_err=raise_on_err)
+
     async def handle_http_error(self, err: httpx.HTTPStatusError, raise_on_err: bool, is_xml: bool = False, close_client: bool = False, debug_content: bool = True):
         """ handle http error in httpx client """
         if self.raise_on_err:
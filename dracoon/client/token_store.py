@@ -0,0 +1,200 @@
+"""
+Token stores for DRACOON client
+
+Persist the connection (access and refresh token) to reuse it across
+processes (e.g. cron jobs, worker processes). Stores provide a lock per key
+to coordinate token refresh: only one process refreshes, all others reuse
+the refreshed tokens.
+
+"""
+
+import asyncio
+import json
+import os
+import tempfile
+import time
+from abc import ABC, abstractmethod
+from contextlib import asynccontextmanager
+from datetime import datetime
+from typing import AsyncIterator, Dict, Optional
+
+from dracoon.client.models import DRACOONConnection
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None
+    import msvcrt
+
+# wait between attempts to acquire a file lock (in seconds)
+LOCK_POLL_WAIT = 0.05
+# maximum wait for a file lock (in seconds)
+LOCK_TIMEOUT = 30
+
+
+def dump_connection(connection: DRACOONConnection) -> Dict[str, str]:
+    """ serialize connection """
+    return {
+        'connected_at': connection.connected_at.isoformat(),
+        'access_token': connection.access_token,
+        'access_token_validity': connection.access_token_validity,
+        'refresh_token': connection.refresh_token
+    }
+
+
+def load_connection(data: Dict[str, str]) -> DRACOONConnection:
+    """ deserialize connection """
+    return DRACOONConnection(connected_at=datetime.fromisoformat(data['connected_at']), access_token=data['access_token'],
+                             access_token_validity=int(data['access_token_validity']), refresh_token=data['refresh_token'])
+
+
+class TokenStore(ABC):
+    """ base class of token stores - stores connections by key (e.g. instance, client and user) """
+
+    def __init__(self):
+        self.locks: Dict[str, asyncio.Lock] = {}
+
+    @abstractmethod
+    async def load(self, key: str) -> Optional[DRACOONConnection]:
+        """ get stored connection """
+
+    @abstractmethod
+    async def save(self, key: str, connection: DRACOONConnection) -> None:
+        """ store connection """
+
+    @abstractmethod
+    async def delete(self, key: str) -> None:
+        """ remove stored connection """
+
+    @asynccontextmanager
+    async def lock(self, key: str) -> AsyncIterator[None]:
+        """ lock key (in process) - e.g. while refreshing tokens """
+        lock = self.locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            yield
+
+
+class MemoryTokenStore(TokenStore):
+    """ store connections in memory (shared by clients of a process) """
+
+    def __init__(self):
+        super().__init__()
+        self.connections: Dict[str, DRACOONConnection] = {}
+
+    async def load(self, key: str) -> Optional[DRACOONConnection]:
+        return self.connections.get(key)
+
+    async def save(self, key: str, connection: DRACOONConnection) -> None:
+        self.connections[key] = connection
+
+    async def delete(self, key: str) -> None:
+        self.connections.pop(key, None)
+
+
+class FileTokenStore(TokenStore):
+    """ store connections in a JSON file (readable by owner only) - locked across processes """
+
+    def __init__(self, file_path: str):
+        super().__init__()
+        self.file_path = file_path
+        self.lock_path = file_path + '.lock'
+
+    def read(self) -> Dict[str, Dict[str, str]]:
+        try:
+            with open(self.file_path, 'r') as token_file:
+                return json.load(token_file)
+        except FileNotFoundError:
+            return {}
+        except ValueError:
+            return {}
+
+    def write(self, content: Dict[str, Dict[str, str]]) -> None:
+        # replace file atomically (temporary file is only readable by owner)
+        directory = os.path.dirname(os.path.abspath(self.file_path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.dracoon-')
+        try:
+            with os.fdopen(fd, 'w') as tmp_file:
+                json.dump(content, tmp_file)
+            os.replace(tmp_path, self.file_path)
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    async def load(self, key: str) -> Optional[DRACOONConnection]:
+        data = self.read().get(key)
+        if data is None:
+            return None
+        return load_connection(data)
+
+    async def save(self, key: str, connection: DRACOONConnection) -> None:
+        content = self.read()
+        content[key] = dump_connection(connection)
+        self.write(content)
+
+    async def delete(self, key: str) -> None:
+        content = self.read()
+        if content.pop(key, None) is not None:
+            self.write(content)
+
+    @asynccontextmanager
+    async def lock(self, key: str) -> AsyncIterator[None]:
+        """ lock store (in process and across processes via lock file) """
+        async with super().lock(key):
+            fd = os.open(self.lock_path, os.O_RDWR | os.O_CREAT, 0o600)
+            try:
+                started_at = time.monotonic()
+                while not self.try_lock(fd):
+                    if time.monotonic() - started_at > LOCK_TIMEOUT:
+                        raise TimeoutError(f'Token store locked: {self.lock_path}')
+                    await asyncio.sleep(LOCK_POLL_WAIT)
+                try:
+                    yield
+                finally:
+                    self.unlock(fd)
+            finally:
+                os.close(fd)
+
+    def try_lock(self, fd: int) -> bool:
+        """ acquire lock (non-blocking) """
+        try:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            else:  # pragma: no cover
+                msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+        except OSError:
+            return False
+        return True
+
+    def unlock(self, fd: int) -> None:
+        """ release lock """
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+        else:  # pragma: no cover
+            msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+
+
+class KeyringTokenStore(TokenStore):
+    """ store connections in the system keyring (requires keyring) - locked in process only """
+
+    def __init__(self, service_name: str = 'dracoon'):
+        super().__init__()
+        try:
+            import keyring
+        except ImportError:
+            raise ImportError('KeyringTokenStore requires keyring: pip install keyring')
+        self.keyring = keyring
+        self.service_name = service_name
+
+    async def load(self, key: str) -> Optional[DRACOONConnection]:
+        data = self.keyring.get_password(self.service_name, key)
+        if data is None:
+            return None
+        return load_connection(json.loads(data))
+
+    async def save(self, key: str, connection: DRACOONConnection) -> None:
+        self.keyring.set_password(self.service_name, key, json.dumps(dump_connection(connection)))
+
+    async def delete(self, key: str) -> None:
+        if self.keyring.get_password(self.service_name, key) is not None:
+            self.keyring.delete_password(self.service_name, key)
@@ -0,0 +1,146 @@
+"""
+Compact list items for large list responses
+
+Instead of a validated pydantic model per item (e.g. Node, UserItem, LogEvent),
+list items are wrapped in a slotted view of the raw JSON item. Fields are
+parsed on first access only (nested models, dates, enums).
+Use to_model() to get the full (validated) model of an item.
+Lists of compact items (CompactList) are serialized via the full list model.
+
+"""
+
+from typing import Any, Dict, Generic, List, Type, TypeVar, Union, get_args, get_origin
+
+from pydantic import BaseModel, TypeAdapter
+
+ListModel = TypeVar('ListModel', bound=BaseModel)
+
+# fields with these types are returned as in the JSON response
+RAW_TYPES = (int, str, bool, float)
+
+
+class CompactItem:
+    """ read-only view of a list item - fields are parsed on access """
+
+    __slots__ = ('data', 'parsed')
+
+    model: Type[BaseModel] = BaseModel
+    adapters: Dict[str, TypeAdapter] = {}
+    raw_fields: Dict[str, bool] = {}
+
+    def __init__(self, data: Dict[str, Any]):
+        self.data = data
+        self.parsed = None
+
+    def __getattr__(self, name: str) -> Any:
+        field = self.model.model_fields.get(name)
+        if field is None:
+            raise AttributeError(f"'{self.model.__name__}' has no field '{name}'")
+
+        if self.parsed is not None and name in self.parsed:
+            return self.parsed[name]
+
+        value = self.data.get(name)
+
+        if value is None:
+            return None if field.is_required() else field.default
+        if type(value) in RAW_TYPES and self.is_raw(name):
+            return value
+
+        adapter = self.adapters.get(name)
+        if adapter is None:
+            adapter = TypeAdapter(field.annotation)
+            self.adapters[name] = adapter
+
+        value = adapter.validate_python(value)
+
+        if self.parsed is None:
+            self.parsed = {}
+        self.parsed[name] = value
+
+        return value
+
+    def __repr__(self) -> str:
+        return f'Compact{self.model.__name__}({self.data})'
+
+    def is_raw(self, name: str) -> bool:
+        """ check if field is returned as in JSON response (no parsing required) """
+        is_raw = self.raw_fields.get(name)
+
+        if is_raw is None:
+            annotation = self.model.model_fields[name].annotation
+            # Optional[int] etc.
+            if get_origin(annotation) is Union:
+                args = [arg for arg in get_args(annotation) if arg is not type(None)]
+                annotation = args[0] if len(args) == 1 else annotation
+            is_raw = annotation in RAW_TYPES
+            self.raw_fields[name] = is_raw
+
+        return is_raw
+
+    def to_model(self) -> BaseModel:
+        """ get full (validated) model """
+        return self.model(**self.data)
+
+    def model_dump(self, **kwargs) -> Dict[str, Any]:
+        """ get item as dict (see pydantic model_dump()) """
+        return self.to_model().model_dump(**kwargs)
+
+    def model_dump_json(self, **kwargs) -> str:
+        """ get item as JSON (see pydantic model_dump_json()) """
+        return self.to_model().model_dump_json(**kwargs)
+
+
+class CompactList(Generic[ListModel]):
+    """ list response with compact items - other fields (e.g. range) as in list model """
+
+    __slots__ = ('list_model', 'data', 'fields', 'items')
+
+    def __init__(self, list_model: Type[ListModel], data: Dict[str, Any], items: List[CompactItem]):
+        self.list_model = list_model
+        self.data = data
+        # list model without items (validates all other fields)
+        self.fields = list_model(**{**data, 'items': []})
+        self.items = items
+
+    def __getattr__(self, name: str) -> Any:
+        if name in CompactList.__slots__:
+            raise AttributeError(name)
+        return getattr(self.fields, name)
+
+    def __repr__(self) -> str:
+        return f'Compact{self.list_model.__name__}(items={len(self.items)})'
+
+    def to_model(self) -> ListModel:
+        """ get full (validated) list model """
+        return self.list_model(**{**self.data, 'items': [item.data for item in self.items]})
+
+    def model_dump(self, **kwargs) -> Dict[str, Any]:
+        """ get list as dict (see pydantic model_dump()) """
+        return self.to_model().model_dump(**kwargs)
+
+    def model_dump_json(self, **kwargs) -> str:
+        """ get list as JSON (see pydantic model_dump_json()) """
+        return self.to_model().model_dump_json(**kwargs)
+
+
+compact_types: Dict[Type[BaseModel], Type[CompactItem]] = {}
+
+
+def get_compact_type(model: Type[BaseModel]) -> Type[CompactItem]:
+    """ get compact item type for a model """
+    compact_type = compact_types.get(model)
+
+    if compact_type is None:
+        compact_type = type(f'Compact{model.__name__}', (CompactItem,), {'__slots__': (), 'model': model, 'adapters': {}, 'raw_fields': {}})
+        compact_types[model] = compact_type
+
+    return compact_type
+
+
+def parse_compact_list(list_model: Type[ListModel], data: Dict[str, Any]) -> CompactList[ListModel]:
+    """ parse a list response (range and items) with compact items """
+    item_model = list_model.model_fields['items'].annotation.__args__[0]
+    compact_type = get_compact_type(item_model)
+
+    return CompactList(list_model, data, [compact_type(item) for item in data.get('items', [])])
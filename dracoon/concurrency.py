@@ -0,0 +1,32 @@
+"""
+Concurrency helpers for bulk operations
+
+Provides bounded concurrent execution of coroutines (semaphore based)
+as an alternative to DRACOON.batch_process(), which waits for the
+slowest request of every batch.
+
+"""
+
+import asyncio
+from typing import Any, Awaitable, Iterable, List
+
+# default amount of concurrent requests for bulk operations
+DEFAULT_CONCURRENCY = 5
+
+
+async def gather_bounded(coro_list: Iterable[Awaitable[Any]], limit: int = DEFAULT_CONCURRENCY,
+                         return_exceptions: bool = False) -> List[Any]:
+    """
+    run coroutines concurrently with at most <limit> running at the same time
+    results are returned in the order of the provided coroutines
+    """
+    if limit < 1:
+        limit = 1
+
+    semaphore = asyncio.Semaphore(limit)
+
+    async def run(coro: Awaitable[Any]) -> Any:
+        async with semaphore:
+            return await coro
+
+    return await asyncio.gather(*[run(coro) for coro in coro_list], return_exceptions=return_exceptions)
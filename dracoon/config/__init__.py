@@ -69,7 +69,7 @@ class DRACOONConfig:
             await self.dracoon.handle_http_error(err=e, raise_on_err=raise_on_err)
         
         self.logger.info("Retrieved system defaults.")
-        return SystemDefaults(**res.json())
+        return SystemDefaults.model_validate_json(res.content)
     
     @retry(**RETRY_CONFIG)
     async def get_general_settings(self, raise_on_err: bool = False) -> GeneralSettingsInfo:
@@ -91,7 +91,7 @@ class DRACOONConfig:
             await self.dracoon.handle_http_error(err=e, raise_on_err=raise_on_err)
         
         self.logger.info("Retrieved general settings.")
-        return GeneralSettingsInfo(**res.json())
+        return GeneralSettingsInfo.model_validate_json(res.content)
     
     @retry(**RETRY_CONFIG)
     async def get_infrastructure_properties(self, raise_on_err: bool = False) -> InfrastructureProperties:
@@ -113,7 +113,7 @@ class DRACOONConfig:
             await self.dracoon.handle_http_error(err=e, raise_on_err=raise_on_err)
         
         self.logger.info("Retrieved infrastructure properties.")
-        return InfrastructureProperties(**res.json())
+        return InfrastructureProperties.model_validate_json(res.content)
     
     @retry(**RETRY_CONFIG)
     async def get_algorithms(self, raise_on_err: bool = False) -> AlgorithmVersionInfoList:
@@ -135,7 +135,7 @@ class DRACOONConfig:
             await self.dracoon.handle_http_error(err=e, raise_on_err=raise_on_err)
         
         self.logger.info("Retrieved infrastructure properties.")
-        return AlgorithmVersionInfoList(**res.json())
+        return AlgorithmVersionInfoList.model_validate_json(res.content)
     
     @retry(**RETRY_CONFIG)
     async def get_classification_policies(self, raise_on_err: bool = False) -> ClassificationPoliciesConfig:
@@ -157,7 +157,7 @@ class DRACOONConfig:
             await self.dracoon.handle_http_error(err=e, raise_on_err=raise_on_err)
         
         self.logger.info("Retrieved infrastructure properties.")
-        return ClassificationPoliciesConfig(**res.json())
+        return ClassificationPoliciesConfig.model_validate_json(res.content)
     
     @retry(**RETRY_CONFIG)
     async def get_password_policies(self, raise_on_err: bool = False) -> PasswordPoliciesConfig:
@@ -179,7 +179,7 @@ class DRACOONConfig:
             await self.dracoon.handle_http_error(err=e, raise_on_err=raise_on_err)
         
         self.logger.info("Retrieved password policies.")
-        return PasswordPoliciesConfig(**res.json())
+        return PasswordPoliciesConfig.model_validate_json(res.content)
     
     @retry(**RETRY_CONFIG)
     async def get_product_packages(self, raise_on_err: bool = False) -> ProductPackageResponseList:
@@ -201,7 +201,7 @@ class DRACOONConfig:
             await self.dracoon.handle_http_error(err=e, raise_on_err=raise_on_err)
         
         self.logger.info("Retrieved product packages.")
-        return ProductPackageResponseList(**res.json())
+        return ProductPackageResponseList.model_validate_json(res.content)
     
     @retry(**RETRY_CONFIG)
     async def get_current_product_package(self, raise_on_err: bool = False) -> ProductPackageResponseList:
@@ -223,7 +223,7 @@ class DRACOONConfig:
             await self.dracoon.handle_http_error(err=e, raise_on_err=raise_on_err)
         
         self.logger.info("Retrieved current product package.")
-        return ProductPackageResponseList(**res.json())
+        return ProductPackageResponseList.model_validate_json(res.content)
     
     @retry(**RETRY_CONFIG)
     async def get_s3_tags(self, raise_on_err: bool = False) -> S3TagList:
@@ -245,4 +245,4 @@ class DRACOONConfig:
             await self.dracoon.handle_http_error(err=e, raise_on_err=raise_on_err)
         
         self.logger.info("Retrieved s3 tags.")
-        return S3TagList(**res.json())
\ No newline at end of file
+        return S3TagList.model_validate_json(res.content)
\ No newline at end of file
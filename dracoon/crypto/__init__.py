@@ -21,6 +21,7 @@ Encryption:
 import os
 import base64
 import logging 
+from functools import lru_cache
 from typing import Tuple
 
 from pydantic import validate_arguments
@@ -36,14 +37,27 @@ from .models import (FileKey, FileKeyVersion, PlainFileKey, PlainFileKeyVersion,
 
 logger = logging.getLogger('dracoon.crypto')
 
+# parsed public keys are reused (private keys are never cached - pass a parsed private key instead)
+KEY_CACHE_SIZE = 32
+
+
+def load_private_key(private_key_pem: str) -> rsa.RSAPrivateKey:
+    """ load a plain private key (PEM) - parsing is expensive: keep the parsed key for many file keys (private_key) """
+    return serialization.load_pem_private_key(data=private_key_pem.encode('ascii'), password=None)
+
+
+@lru_cache(maxsize=KEY_CACHE_SIZE)
+def load_public_key(public_key_pem: str) -> rsa.RSAPublicKey:
+    """ load a public key (PEM) - parsed keys are cached """
+    return serialization.load_pem_public_key(public_key_pem.encode('ascii'))
+
+
 @validate_arguments
 def encrypt_private_key(secret: str, plain_key: PlainUserKeyPairContainer) -> UserKeyPairContainer:
     """ encrypt a private key (requires a plain user keypair container: create_plain_user_keypair()) """
     logger.info("Encrypting private key - version: %s", plain_key.privateKeyContainer.version)
     # load plain private key
-    private_key_pem = plain_key.privateKeyContainer.privateKey
-    private_key: rsa.RSAPrivateKeyWithSerialization = serialization.load_pem_private_key(
-        data=private_key_pem.encode('ascii'), password=None)
+    private_key: rsa.RSAPrivateKeyWithSerialization = load_private_key(plain_key.privateKeyContainer.privateKey)
 
     # serialize key with passphrase (secret)
     encrypted_private_key = private_key.private_bytes(encoding=serialization.Encoding.PEM,
@@ -175,8 +189,7 @@ def encrypt_file_key_public(plain_file_key: PlainFileKey, public_key: PublicKeyC
 
     logger.info("Creating file key with public key: %s", public_key.version)
 
-    public_key_pem = serialization.load_pem_public_key(
-        public_key.publicKey.encode('ascii'))
+    public_key_pem = load_public_key(public_key.publicKey)
         
     # check correct version
     file_key_version = get_file_key_version_public(public_key)
@@ -206,14 +219,13 @@ def encrypt_file_key_public(plain_file_key: PlainFileKey, public_key: PublicKeyC
 # encrypt a plain file key
 
 
-def encrypt_file_key(plain_file_key: PlainFileKey, keypair: PlainUserKeyPairContainer) -> FileKey: 
-    """ encrypt a file key with given plain user keypair """
+def encrypt_file_key(plain_file_key: PlainFileKey, keypair: PlainUserKeyPairContainer, private_key: rsa.RSAPrivateKey = None) -> FileKey: 
+    """ encrypt a file key with given plain user keypair (optional: parsed private key of keypair) """
 
     logger.info("Encrypting file key: %s", keypair.privateKeyContainer.version)
 
-    private_key_pem = keypair.privateKeyContainer.privateKey
-    private_key: rsa.RSAPrivateKeyWithSerialization = serialization.load_pem_private_key(
-        data=private_key_pem.encode('ascii'), password=None)
+    if private_key is None:
+        private_key = load_private_key(keypair.privateKeyContainer.privateKey)
     public_key = private_key.public_key()
 
     # check correct version
@@ -242,15 +254,14 @@ def encrypt_file_key(plain_file_key: PlainFileKey, keypair: PlainUserKeyPairCont
     })
 
 
-def decrypt_file_key(file_key: FileKey, keypair: PlainUserKeyPairContainer) -> PlainFileKey:
-    """ decrypt a file key with given plain user keypair """
+def decrypt_file_key(file_key: FileKey, keypair: PlainUserKeyPairContainer, private_key: rsa.RSAPrivateKey = None) -> PlainFileKey:
+    """ decrypt a file key with given plain user keypair (optional: parsed private key of keypair) """
 
     logger.info("Decrypting file key: %s", keypair.privateKeyContainer.version)
 
     key = base64.b64decode(file_key.key)
-    private_key_pem = keypair.privateKeyContainer.privateKey
-    private_key: rsa.RSAPrivateKeyWithSerialization = serialization.load_pem_private_key(
-        data=private_key_pem.encode('ascii'), password=None)
+    if private_key is None:
+        private_key = load_private_key(keypair.privateKeyContainer.privateKey)
 
     file_key_version = get_file_key_version(keypair)
 
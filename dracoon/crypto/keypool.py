@@ -0,0 +1,177 @@
+"""
+Keypair pool for DRACOON crypto
+
+RSA keypair generation takes seconds (RSA-4096) and blocks the event loop.
+The pool generates keypairs in background processes and keeps a bounded
+number of keypairs ready (e.g. for encrypted shares - every share requires
+a new keypair).
+
+    async with KeyPairPool(version=UserKeyPairVersion.RSA4096, size=8) as pool:
+        keypair = await pool.get()
+
+The keypair factory keeps a pool per keypair version (one process pool for all
+versions) - pools are filled from first use of a version (or on start):
+
+    async with KeyPairFactory(size=8, processes=2) as keypair_factory:
+        await dracoon.user.set_user_keypair(secret=secret, keypair_factory=keypair_factory)
+
+"""
+
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, List, Union
+
+from . import create_plain_userkeypair
+from .models import PlainUserKeyPairContainer, UserKeyPairVersion
+
+# keypairs kept ready
+KEYPAIR_POOL_SIZE = 8
+
+
+def generate_keypair(version: str) -> PlainUserKeyPairContainer:
+    """ create a plain keypair (runs in pool process) """
+    return create_plain_userkeypair(UserKeyPairVersion(version))
+
+
+def create_executor(processes: int) -> ProcessPoolExecutor:
+    # no fork of running event loop
+    return ProcessPoolExecutor(max_workers=processes, mp_context=multiprocessing.get_context('spawn'))
+
+
+async def shutdown_executor(executor: ProcessPoolExecutor) -> None:
+    await asyncio.get_running_loop().run_in_executor(None, lambda: executor.shutdown(wait=True, cancel_futures=True))
+
+
+class KeyPairPool:
+    """ plain keypairs generated in background processes (at most <size> kept ready) """
+
+    def __init__(self, version: UserKeyPairVersion = UserKeyPairVersion.RSA4096, size: int = KEYPAIR_POOL_SIZE, processes: int = 1,
+                 executor: ProcessPoolExecutor = None):
+        """ executor: shared process pool (not closed with pool) """
+        self.logger = logging.getLogger('dracoon.crypto.keypool')
+        self.version = version
+        self.size = max(size, 1)
+        self.processes = max(processes, 1)
+        self.executor = executor
+        self.owns_executor = executor is None
+        self.keypairs: asyncio.Queue = None
+        self.fillers: List[asyncio.Task] = []
+
+    def start(self) -> None:
+        """ start generating keypairs (requires running event loop) """
+        if self.keypairs is not None:
+            return
+
+        if self.executor is None:
+            self.executor = create_executor(self.processes)
+        self.keypairs = asyncio.Queue(maxsize=self.size)
+        self.fillers = [asyncio.create_task(self.fill()) for _ in range(self.processes)]
+        self.logger.info("Started keypair pool (%s, %s processes).", self.version.value, self.processes)
+
+    async def fill(self) -> None:
+        """ generate keypairs until pool is closed (waits while pool is full) """
+        loop = asyncio.get_running_loop()
+
+        while True:
+            try:
+                keypair = await loop.run_in_executor(self.executor, generate_keypair, self.version.value)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.logger.error("Generating keypair failed.")
+                await self.keypairs.put(e)
+                return
+
+            await self.keypairs.put(keypair)
+
+    @property
+    def ready(self) -> int:
+        """ number of keypairs ready """
+        return self.keypairs.qsize() if self.keypairs is not None else 0
+
+    async def get(self) -> PlainUserKeyPairContainer:
+        """ get a new keypair (waits if no keypair is ready) """
+        self.start()
+        keypair: Union[PlainUserKeyPairContainer, Exception] = await self.keypairs.get()
+
+        if isinstance(keypair, Exception):
+            # failure is returned to all waiting callers
+            self.keypairs.put_nowait(keypair)
+            raise keypair
+
+        return keypair
+
+    async def close(self) -> None:
+        """ stop generating keypairs """
+        for task in self.fillers:
+            task.cancel()
+        await asyncio.gather(*self.fillers, return_exceptions=True)
+        self.fillers = []
+        self.keypairs = None
+
+        if self.executor is not None and self.owns_executor:
+            await shutdown_executor(self.executor)
+            self.executor = None
+        self.logger.info("Stopped keypair pool.")
+
+    async def __aenter__(self) -> 'KeyPairPool':
+        self.start()
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        await self.close()
+
+
+class KeyPairFactory:
+    """ async keypair factory - keypairs of each version are generated in advance (pool per version, shared processes) """
+
+    def __init__(self, size: int = KEYPAIR_POOL_SIZE, processes: int = 1, versions: Iterable[UserKeyPairVersion] = None):
+        """ size: keypairs kept ready per version - versions: pools filled on start (others on first use) """
+        self.logger = logging.getLogger('dracoon.crypto.keypool')
+        self.size = size
+        self.processes = max(processes, 1)
+        self.versions = list(versions) if versions is not None else [UserKeyPairVersion.RSA4096]
+        self.executor: ProcessPoolExecutor = None
+        self.pools: Dict[UserKeyPairVersion, KeyPairPool] = {}
+
+    def start(self) -> None:
+        """ start process pool and fill pools of configured versions (requires running event loop) """
+        if self.executor is None:
+            self.executor = create_executor(self.processes)
+
+        for version in self.versions:
+            self.get_pool(version)
+
+    def get_pool(self, version: UserKeyPairVersion = UserKeyPairVersion.RSA4096) -> KeyPairPool:
+        """ get (started) pool of a keypair version """
+        if self.executor is None:
+            self.start()
+
+        if version not in self.pools:
+            pool = KeyPairPool(version=version, size=self.size, processes=self.processes, executor=self.executor)
+            pool.start()
+            self.pools[version] = pool
+
+        return self.pools[version]
+
+    async def create(self, version: UserKeyPairVersion = UserKeyPairVersion.RSA4096) -> PlainUserKeyPairContainer:
+        """ get a new plain keypair (waits if no keypair of version is ready) """
+        return await self.get_pool(version).get()
+
+    async def close(self) -> None:
+        """ stop generating keypairs """
+        await asyncio.gather(*[pool.close() for pool in self.pools.values()])
+        self.pools = {}
+
+        if self.executor is not None:
+            await shutdown_executor(self.executor)
+            self.executor = None
+
+    async def __aenter__(self) -> 'KeyPairFactory':
+        self.start()
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        await self.close()
@@ -157,6 +157,21 @@ class ConnectionError(DRACOONClientError):
 
         super().__init__(message)
 
+class WorkerError(DRACOONClientError):
+    """
+    Exception returned by worker pool
+    Job failed in worker process (original error type and status code)
+    """
+
+    def __init__(self, message: str = "Worker job failed.", error_type: str = None, status_code: int = None):
+
+        super().__init__(message)
+        self.error_type = error_type
+        self.status_code = status_code
+
+    def __reduce__(self):
+        return (self.__class__, (self.message, self.error_type, self.status_code))
+
 
 class InvalidArgumentError(DRACOONValidationError):
     """
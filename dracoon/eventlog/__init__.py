@@ -14,15 +14,22 @@ Please note: maximum 500 items are returned in GET requests
 
 """
 
-from typing import List
+from typing import Any, AsyncIterator, Callable, List, Union
+import asyncio
 import httpx
 import logging
 import urllib.parse
 from tenacity import retry
 
+from dracoon.compact import CompactList, parse_compact_list
+from dracoon.serialization import json_loads
 from dracoon.client import DRACOONClient, OAuth2ConnectionType, RETRY_CONFIG
+from dracoon.concurrency import DEFAULT_CONCURRENCY, gather_bounded
 from dracoon.errors import ClientDisconnectedError, InvalidClientError
-from .responses import AuditNodeInfoResponse, AuditNodeResponse, LogEventList
+from .responses import AuditNodeInfo, AuditNodeInfoResponse, AuditNodeResponse, LogEventList
+
+# maximum items per list request
+EVENTLOG_PAGE_SIZE = 500
 
 
 class DRACOONEvents:
@@ -58,6 +65,15 @@ class DRACOONEvents:
     @retry(**RETRY_CONFIG)
     async def get_permissions(self, offset: int = 0, filter: str = None, limit: int = None, sort: str = None, raise_on_err = False) -> List[AuditNodeResponse]:
         """ get permissions for all nodes (rooms) """
+        permissions = [node_info async for node_info in self.stream_permissions(offset=offset, filter=filter, limit=limit, sort=sort, 
+                                                                                raise_on_err=raise_on_err)]
+        
+        self.logger.info("Retrieved node permission audit.")
+        return permissions
+
+    async def stream_permissions(self, offset: int = 0, filter: str = None, limit: int = None, sort: str = None, 
+                                 raise_on_err = False) -> AsyncIterator[AuditNodeResponse]:
+        """ get permissions for all nodes (rooms) - nodes are parsed while the response is received """
         if not await self.dracoon.test_connection() and self.dracoon.connection:
             await self.dracoon.connect(OAuth2ConnectionType.refresh_token)
 
@@ -71,20 +87,42 @@ class DRACOONEvents:
         if limit != None: api_url += f'&limit={str(limit)}' 
         if sort != None: api_url += f'&sort={sort}' 
 
-        try:
-            res = await self.dracoon.http.get(api_url)
-            res.raise_for_status()
-        except httpx.RequestError as e:
-            await self.dracoon.handle_connection_error(e)
-        except httpx.HTTPStatusError as e:
-            self.logger.error("Getting permissions failed.")
-            await self.dracoon.handle_http_error(err=e, raise_on_err=raise_on_err)
-        
-        self.logger.info("Retrieved node permission audit.")
-        tmp_list = res.json()
-        
-        return [AuditNodeResponse(**node_info) for node_info in tmp_list]
+        # response is a list (no range)
+        async for node_info in self.dracoon.stream_items(url=api_url, items_key=None, raise_on_err=raise_on_err):
+            yield AuditNodeResponse(**node_info)
     
+    async def iter_permissions(self, filter: str = None, sort: str = None, page_size: int = EVENTLOG_PAGE_SIZE, 
+                               concurrency: int = DEFAULT_CONCURRENCY, hooks: List[Callable[[AuditNodeResponse], Any]] = None,
+                               raise_on_err: bool = False) -> AsyncIterator[AuditNodeResponse]:
+        """ 
+        get permissions for all nodes (rooms) page by page - pages are requested concurrently (in order)
+        hooks are called for every room (e.g. aggregations, see dracoon.eventlog.audit)
+        failed pages always raise (independent of raise_on_err) - an incomplete audit would look complete
+        """
+        hooks = hooks or []
+        offset = 0
+        is_last_page = False
+
+        # response contains no range - pages are requested until a page is incomplete
+        while not is_last_page:
+            page_reqs = [self.get_permissions(offset=offset + i * page_size, filter=filter, limit=page_size, sort=sort, raise_on_err=True)
+                         for i in range(max(concurrency, 1))]
+            pages = await gather_bounded(page_reqs, limit=concurrency)
+
+            for page in pages:
+                for node in page:
+                    for hook in hooks:
+                        hook(node)
+                    yield node
+
+                if len(page) < page_size:
+                    is_last_page = True
+                    break
+
+            offset += len(pages) * page_size
+
+        self.logger.info("Retrieved node permission audit (paged).")
+
     @retry(**RETRY_CONFIG)
     async def get_rooms(self, parent_id: int = 0, offset: int = 0, filter: str = None, 
                                    limit: int = None, sort: str = None, raise_on_err = False) -> AuditNodeInfoResponse:
@@ -112,11 +150,68 @@ class DRACOONEvents:
             await self.dracoon.handle_http_error(err=e, raise_on_err=raise_on_err)
         
         self.logger.info("Retrieved node permission audit.")
-        return AuditNodeInfoResponse(**res.json())
+        return AuditNodeInfoResponse.model_validate_json(res.content)
+
+    async def crawl_rooms(self, parent_id: int = 0, concurrency: int = DEFAULT_CONCURRENCY, 
+                          raise_on_err: bool = False) -> AsyncIterator[AuditNodeInfo]:
+        """ get all rooms below parent (breadth-first, pages are requested concurrently) - rooms are returned as discovered """
+        if self.raise_on_err:
+            raise_on_err = True
+
+        # pages to request (parent id, offset) and received pages (rooms, number of new pages)
+        pending = asyncio.Queue()
+        received = asyncio.Queue(maxsize=max(concurrency, 1) * 2)
+        pending.put_nowait((parent_id, 0))
+
+        async def worker() -> None:
+            while True:
+                room_id, offset = await pending.get()
+                try:
+                    rooms = await self.get_rooms(parent_id=room_id, offset=offset, limit=EVENTLOG_PAGE_SIZE, raise_on_err=True)
+                except Exception as e:
+                    await received.put((e, 0))
+                    continue
+
+                new_pages = 0
+                # remaining pages of a level are known with the first page
+                if offset == 0:
+                    for page_offset in range(EVENTLOG_PAGE_SIZE, rooms.range.total, EVENTLOG_PAGE_SIZE):
+                        pending.put_nowait((room_id, page_offset))
+                        new_pages += 1
+                for room in rooms.items:
+                    if room.countChildren != 0:
+                        pending.put_nowait((room.nodeId, 0))
+                        new_pages += 1
+
+                await received.put((rooms.items, new_pages))
+
+        workers = [asyncio.create_task(worker()) for _ in range(max(concurrency, 1))]
+        outstanding = 1
+
+        try:
+            while outstanding:
+                rooms, new_pages = await received.get()
+                outstanding += new_pages - 1
+
+                if isinstance(rooms, Exception):
+                    self.logger.error("Getting rooms failed (rooms skipped).")
+                    if raise_on_err:
+                        raise rooms
+                    continue
+
+                for room in rooms:
+                    yield room
+        finally:
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+
+        self.logger.info("Crawled rooms.")
 
     @retry(**RETRY_CONFIG)
     async def get_events(self, offset: int = 0, filter: str = None, limit: int = None, 
-                        sort: str = None, date_start: str = None, date_end: str = None, operation_id: int = None, user_id: int = None, raise_on_err = False) -> LogEventList:
+                        sort: str = None, date_start: str = None, date_end: str = None, operation_id: int = None, user_id: int = None, raise_on_err = False, 
+                         compact: bool = False) -> Union[LogEventList, CompactList[LogEventList]]:
         """ get events (audit log) """
         if not await self.dracoon.test_connection() and self.dracoon.connection:
             await self.dracoon.connect(OAuth2ConnectionType.refresh_token)
@@ -146,6 +241,8 @@ class DRACOONEvents:
             await self.dracoon.handle_http_error(err=e, raise_on_err=raise_on_err)
 
         self.logger.info("Retrieved events from eventlog.")
-        return LogEventList(**res.json())
+        if compact:
+            return parse_compact_list(LogEventList, json_loads(res.content))
+        return LogEventList.model_validate_json(res.content)
 
 
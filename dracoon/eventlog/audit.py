@@ -0,0 +1,61 @@
+"""
+Aggregation hooks for permission audit (DRACOONEvents.iter_permissions)
+
+Hooks are called for every room of the permission audit - only aggregated
+results are kept in memory (e.g. rooms with exactly one room manager).
+
+"""
+
+from abc import ABC, abstractmethod
+from typing import Dict, List
+
+from .responses import AuditNodeResponse, AuditUserPermission
+
+
+def get_room_managers(node: AuditNodeResponse) -> List[AuditUserPermission]:
+    """ get users with manage permission of a room """
+    return [user for user in node.auditUserPermissionList if user.permissions.manage]
+
+
+class PermissionAggregation(ABC):
+    """ base class of aggregation hooks (called per room) """
+
+    def __call__(self, node: AuditNodeResponse) -> None:
+        self.add(node)
+
+    @abstractmethod
+    def add(self, node: AuditNodeResponse) -> None:
+        """ add permissions of a room """
+
+
+class ManagerCountAggregation(PermissionAggregation):
+    """ rooms with exactly <count> room managers (e.g. 1 for last admin rooms) - optionally only rooms managed by a user """
+
+    def __init__(self, count: int = 1, user_id: int = None):
+        self.count = count
+        self.user_id = user_id
+        self.rooms: List[AuditNodeResponse] = []
+
+    def add(self, node: AuditNodeResponse) -> None:
+        managers = get_room_managers(node)
+
+        if len(managers) != self.count:
+            return
+        if self.user_id is not None and self.user_id not in [user.userId for user in managers]:
+            return
+
+        self.rooms.append(node)
+
+
+class UserRoomCountAggregation(PermissionAggregation):
+    """ number of rooms per user (optionally only rooms with a permission, e.g. manage) """
+
+    def __init__(self, permission: str = None):
+        self.permission = permission
+        self.rooms: Dict[int, int] = {}
+
+    def add(self, node: AuditNodeResponse) -> None:
+        for user in node.auditUserPermissionList:
+            if self.permission and not getattr(user.permissions, self.permission):
+                continue
+            self.rooms[user.userId] = self.rooms.get(user.userId, 0) + 1
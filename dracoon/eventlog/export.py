@@ -0,0 +1,241 @@
+"""
+Time-sliced event export for DRACOON eventlog adapter
+
+Splits a date range into slices (default: one day), requests slices concurrently
+(bounded) and writes events in order to JSONL, CSV or Parquet (requires pyarrow).
+Deep offsets are avoided: slices with many events are split further.
+Completed slices are recorded in a manifest - an interrupted export is resumed
+with the next slice (output is truncated to the last completed slice).
+
+"""
+
+import asyncio
+import csv
+import io
+import json
+import logging
+import os
+import tempfile
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Tuple
+
+from dracoon.concurrency import DEFAULT_CONCURRENCY
+from dracoon.errors import InvalidArgumentError
+from dracoon.serialization import json_dumps
+from .responses import LogEvent
+
+# maximum items per list request
+EXPORT_PAGE_SIZE = 500
+# default slice of date range
+EXPORT_SLICE = timedelta(days=1)
+# slices with more events are split (deep offsets are slow)
+EXPORT_MAX_SLICE_EVENTS = 10 * EXPORT_PAGE_SIZE
+EXPORT_MIN_SLICE = timedelta(minutes=1)
+
+EXPORT_FORMATS = ['jsonl', 'csv', 'parquet']
+EXPORT_FIELDS = list(LogEvent.model_fields)
+
+DATE_FORMAT = '%Y-%m-%dT%H:%M:%S.%fZ'
+
+Slice = Tuple[datetime, datetime]
+
+
+def as_utc(value: datetime) -> datetime:
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+class EventExport:
+    """ export events of a date range (time slices requested concurrently, written in order, resumable) """
+
+    def __init__(self, eventlog_adapter, date_start: datetime, date_end: datetime, file_path: str, format: str = 'jsonl',
+                 slice_size: timedelta = EXPORT_SLICE, filter: str = None, operation_id: int = None, user_id: int = None,
+                 concurrency: int = DEFAULT_CONCURRENCY, manifest_path: str = None):
+        """ file_path: output file (parquet: directory with a file per slice) - manifest_path default: <file_path>.manifest.json """
+        if format not in EXPORT_FORMATS:
+            raise InvalidArgumentError(message=f'Unsupported format: {format}')
+        if as_utc(date_end) <= as_utc(date_start):
+            raise InvalidArgumentError(message='Date end must be after date start.')
+        if slice_size <= timedelta(0):
+            raise InvalidArgumentError(message='Slice size must be positive.')
+
+        self.logger = logging.getLogger('dracoon.eventlog.export')
+        self.eventlog_adapter = eventlog_adapter
+        self.date_start = as_utc(date_start)
+        self.date_end = as_utc(date_end)
+        self.file_path = file_path
+        self.format = format
+        self.slice_size = slice_size
+        self.filter = filter
+        self.operation_id = operation_id
+        self.user_id = user_id
+        self.concurrency = max(concurrency, 1)
+        self.manifest_path = manifest_path or file_path + '.manifest.json'
+
+        self.pyarrow = None
+        if format == 'parquet':
+            try:
+                import pyarrow
+                import pyarrow.parquet
+            except ImportError:
+                raise ImportError('Parquet export requires pyarrow: pip install pyarrow')
+            self.pyarrow = pyarrow
+
+        # completed slices (in order), bytes written and exported events
+        self.completed = 0
+        self.size = 0
+        self.count = 0
+
+    def get_slices(self) -> List[Slice]:
+        """ split date range into slices (end exclusive) """
+        slices = []
+        start = self.date_start
+        while start < self.date_end:
+            end = min(start + self.slice_size, self.date_end)
+            slices.append((start, end))
+            start = end
+        return slices
+
+    def get_manifest_params(self) -> Dict[str, Any]:
+        return {
+            'date_start': self.date_start.isoformat(),
+            'date_end': self.date_end.isoformat(),
+            'slice_size': self.slice_size.total_seconds(),
+            'format': self.format,
+            'filter': self.filter,
+            'operation_id': self.operation_id,
+            'user_id': self.user_id
+        }
+
+    def load_manifest(self) -> None:
+        """ load completed slices of a previous export (same parameters required) """
+        try:
+            with open(self.manifest_path, 'r') as manifest_file:
+                manifest = json.load(manifest_file)
+        except FileNotFoundError:
+            return
+
+        if manifest.get('params') != self.get_manifest_params():
+            raise InvalidArgumentError(message=f'Manifest does not match export: {self.manifest_path}')
+
+        self.completed = manifest['completed']
+        self.size = manifest['size']
+        self.count = manifest['count']
+
+    def save_manifest(self, slices: List[Slice]) -> None:
+        """ persist completed slices """
+        manifest = {
+            'params': self.get_manifest_params(),
+            'completed': self.completed,
+            'size': self.size,
+            'count': self.count,
+            'slices': [[start.isoformat(), end.isoformat()] for start, end in slices[:self.completed]]
+        }
+
+        # replace file atomically
+        directory = os.path.dirname(os.path.abspath(self.manifest_path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.dracoon-')
+        try:
+            with os.fdopen(fd, 'w') as tmp_file:
+                json.dump(manifest, tmp_file)
+            os.replace(tmp_path, self.manifest_path)
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    async def fetch_slice(self, start: datetime, end: datetime) -> List[LogEvent]:
+        """ get all events of a slice (sorted by time) - slices with many events are split """
+        date_start = start.strftime(DATE_FORMAT)
+        date_end = end.strftime(DATE_FORMAT)
+        events = []
+        offset = 0
+
+        while True:
+            page = await self.eventlog_adapter.get_events(offset=offset, limit=EXPORT_PAGE_SIZE, sort='time:asc', filter=self.filter,
+                                                          date_start=date_start, date_end=date_end, operation_id=self.operation_id,
+                                                          user_id=self.user_id, raise_on_err=True)
+
+            if offset == 0 and page.range.total > EXPORT_MAX_SLICE_EVENTS and end - start > EXPORT_MIN_SLICE:
+                middle = start + (end - start) / 2
+                return await self.fetch_slice(start, middle) + await self.fetch_slice(middle, end)
+
+            events.extend(page.items)
+            offset += len(page.items)
+            if not page.items or offset >= page.range.total:
+                break
+
+        # slice end is exclusive (events at slice borders are returned once)
+        unique = {event.id: event for event in events if start <= as_utc(event.time) < end}
+        return sorted(unique.values(), key=lambda event: (event.time, event.id))
+
+    def make_row(self, event: LogEvent) -> Dict[str, Any]:
+        return event.model_dump(mode='json')
+
+    def write_slice(self, output, index: int, events: List[LogEvent]) -> None:
+        """ write events of a slice (output: binary file or parquet directory) """
+        if self.format == 'parquet':
+            if events:
+                table = self.pyarrow.Table.from_pylist([self.make_row(event) for event in events])
+                self.pyarrow.parquet.write_table(table, os.path.join(self.file_path, f'part-{index:05d}.parquet'))
+            return
+
+        if self.format == 'jsonl':
+            for event in events:
+                output.write(json_dumps(self.make_row(event)) + b'\n')
+        else:
+            buffer = io.StringIO()
+            writer = csv.DictWriter(buffer, fieldnames=EXPORT_FIELDS)
+            if self.size == 0:
+                writer.writeheader()
+            writer.writerows(self.make_row(event) for event in events)
+            output.write(buffer.getvalue().encode('utf-8'))
+
+        output.flush()
+        self.size = output.tell()
+
+    def open_output(self):
+        """ open output (truncated to last completed slice) """
+        if self.format == 'parquet':
+            os.makedirs(self.file_path, exist_ok=True)
+            return None
+
+        output = open(self.file_path, 'r+b' if self.size and os.path.exists(self.file_path) else 'wb')
+        output.truncate(self.size)
+        output.seek(self.size)
+        return output
+
+    async def run(self) -> int:
+        """ export events (resumed from manifest) - returns number of exported events """
+        self.load_manifest()
+        slices = self.get_slices()
+
+        if self.completed:
+            self.logger.info("Resuming event export at slice %s of %s.", self.completed + 1, len(slices))
+
+        output = self.open_output()
+        # at most <concurrency> slices are requested (and kept in memory) at the same time
+        pending = deque()
+        next_index = self.completed
+
+        try:
+            while pending or next_index < len(slices):
+                while next_index < len(slices) and len(pending) < self.concurrency:
+                    pending.append(asyncio.create_task(self.fetch_slice(*slices[next_index])))
+                    next_index += 1
+
+                events = await pending.popleft()
+                self.write_slice(output, self.completed, events)
+                self.completed += 1
+                self.count += len(events)
+                self.save_manifest(slices)
+                self.logger.debug("Exported slice %s of %s (%s event(s)).", self.completed, len(slices), len(events))
+        finally:
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+            if output:
+                output.close()
+
+        self.logger.info("Exported %s event(s).", self.count)
+        return self.count
@@ -0,0 +1,157 @@
+"""
+Event log tailer for DRACOON eventlog adapter
+
+Follows new events (eventlog or room events) incrementally: only events since
+the last checkpoint (time of last event) are requested. Requests overlap the
+checkpoint to catch late events - events are de-duplicated by id.
+Events are delivered page by page and the checkpoint is persisted after the
+events of each page are processed (at-least-once delivery after a restart).
+
+"""
+
+import asyncio
+import json
+import logging
+import os
+import tempfile
+from datetime import datetime, timedelta, timezone
+from typing import AsyncIterator, Dict, List, Optional
+
+from .export import as_utc
+from .responses import LogEvent
+
+# maximum items per list request
+TAIL_PAGE_SIZE = 500
+# wait between polls (in seconds) - doubled while no events are found
+TAIL_MIN_INTERVAL = 5
+TAIL_MAX_INTERVAL = 300
+# events are requested with overlap to the checkpoint (late events)
+TAIL_OVERLAP = timedelta(minutes=5)
+
+DATE_FORMAT = '%Y-%m-%dT%H:%M:%S.%fZ'
+
+
+class EventTailer:
+    """ follow new events with persisted checkpoint (eventlog adapter or nodes adapter with room id) """
+
+    def __init__(self, adapter, room_id: int = None, filter: str = None, checkpoint_path: str = None, start_time: datetime = None,
+                 min_interval: float = TAIL_MIN_INTERVAL, max_interval: float = TAIL_MAX_INTERVAL, overlap: timedelta = TAIL_OVERLAP):
+        """ start_time: time of first event (without checkpoint, naive times are UTC) - default: now """
+        self.logger = logging.getLogger('dracoon.eventlog.tailer')
+        self.adapter = adapter
+        self.room_id = room_id
+        self.filter = filter
+        self.checkpoint_path = checkpoint_path
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.interval = min_interval
+        self.overlap = overlap
+
+        self.checkpoint: datetime = as_utc(start_time or datetime.now(timezone.utc))
+        # ids of events within overlap (de-duplication)
+        self.seen: Dict[int, datetime] = {}
+
+        if self.checkpoint_path:
+            self.load()
+
+    def load(self) -> None:
+        """ load persisted checkpoint """
+        try:
+            with open(self.checkpoint_path, 'r') as checkpoint_file:
+                content = json.load(checkpoint_file)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError):
+            self.logger.warning("Event checkpoint could not be read: %s", self.checkpoint_path)
+            return
+
+        self.checkpoint = as_utc(datetime.fromisoformat(content['checkpoint']))
+        self.seen = {int(event_id): as_utc(datetime.fromisoformat(time)) for event_id, time in content.get('seen', {}).items()}
+
+    def save(self) -> None:
+        """ persist checkpoint """
+        content = {
+            'checkpoint': self.checkpoint.isoformat(),
+            'seen': {str(event_id): time.isoformat() for event_id, time in self.seen.items()}
+        }
+
+        # replace file atomically
+        directory = os.path.dirname(os.path.abspath(self.checkpoint_path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.dracoon-')
+        try:
+            with os.fdopen(fd, 'w') as tmp_file:
+                json.dump(content, tmp_file)
+            os.replace(tmp_path, self.checkpoint_path)
+        except OSError:
+            self.logger.warning("Event checkpoint could not be written: %s", self.checkpoint_path)
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def get_events(self, offset: int, date_start: str):
+        if self.room_id is not None:
+            return self.adapter.get_room_events(room_id=self.room_id, offset=offset, filter=self.filter, limit=TAIL_PAGE_SIZE,
+                                                sort='time:asc', date_start=date_start, raise_on_err=True)
+        return self.adapter.get_events(offset=offset, filter=self.filter, limit=TAIL_PAGE_SIZE, sort='time:asc', date_start=date_start,
+                                       raise_on_err=True)
+
+    async def fetch(self) -> AsyncIterator[List[LogEvent]]:
+        """ get new events since checkpoint page by page (not yet seen) """
+        date_start = (self.checkpoint - self.overlap).astimezone(timezone.utc).strftime(DATE_FORMAT)
+        offset = 0
+
+        while True:
+            page = await self.get_events(offset=offset, date_start=date_start)
+            events = [event for event in page.items if event.id not in self.seen]
+            if events:
+                yield sorted(events, key=lambda event: (event.time, event.id))
+            offset += len(page.items)
+            if not page.items or offset >= page.range.total:
+                break
+
+    def commit(self, events: List[LogEvent]) -> None:
+        """ update (and persist) checkpoint after processing events """
+        for event in events:
+            event_time = as_utc(event.time)
+            self.seen[event.id] = event_time
+            self.checkpoint = max(self.checkpoint, event_time)
+
+        # ids before overlap are no longer requested
+        threshold = self.checkpoint - self.overlap
+        self.seen = {event_id: time for event_id, time in self.seen.items() if time >= threshold}
+
+        if self.checkpoint_path:
+            self.save()
+
+    def next_interval(self, found: int) -> float:
+        """ adapt poll interval (reset if events are found, doubled otherwise) """
+        if found:
+            self.interval = self.min_interval
+        else:
+            self.interval = min(self.interval * 2, self.max_interval)
+        return self.interval
+
+    async def poll(self) -> AsyncIterator[List[LogEvent]]:
+        """ yield new events page by page - checkpoint is committed after a page is processed """
+        async for events in self.fetch():
+            yield events
+            self.commit(events)
+
+    async def tail(self, stop: Optional[asyncio.Event] = None) -> AsyncIterator[LogEvent]:
+        """ yield new events continuously (until stop is set) - checkpoint is committed after events of a page are processed """
+        while stop is None or not stop.is_set():
+            found = 0
+            async for events in self.poll():
+                for event in events:
+                    yield event
+                found += len(events)
+
+            self.logger.debug("Tailed %s event(s).", found)
+
+            interval = self.next_interval(found)
+            if stop is None:
+                await asyncio.sleep(interval)
+                continue
+            try:
+                await asyncio.wait_for(stop.wait(), timeout=interval)
+            except asyncio.TimeoutError:
+                pass
@@ -15,7 +15,7 @@ Please note: maximum 500 items are returned in GET requests
 """
 
 import logging
-from typing import List
+from typing import Dict, Iterable, List, Union
 import urllib.parse
 
 import httpx
@@ -23,9 +23,15 @@ from tenacity import retry
 
 from dracoon.user.responses import RoleList
 from dracoon.client import DRACOONClient, OAuth2ConnectionType, RETRY_CONFIG
-from dracoon.errors import ClientDisconnectedError, InvalidClientError
+from dracoon.concurrency import DEFAULT_CONCURRENCY, gather_bounded
+from dracoon.errors import ClientDisconnectedError, DRACOONHttpError, InvalidClientError
 from .models import CreateGroup, Expiration, UpdateGroup
-from .responses import Group, GroupList, GroupUserList, LastAdminGroupRoomList
+from .responses import Group, GroupList, GroupMemberSync, GroupUserList, LastAdminGroupRoomList
+
+# maximum items per list request
+GROUP_USERS_PAGE_SIZE = 500
+# maximum user ids per add / delete request
+GROUP_USERS_BATCH_SIZE = 500
 
 
 class DRACOONGroups:
@@ -77,7 +83,7 @@ class DRACOONGroups:
             await self.dracoon.handle_http_error(err=e, raise_on_err=raise_on_err)
         
         self.logger.info("Group created.")
-        return Group(**res.json())
+        return Group.model_validate_json(res.content)
 
     def make_group(self, name: str, expiration: Expiration = None) -> CreateGroup:
         """ makes a group required for create_group() """
@@ -116,7 +122,7 @@ class DRACOONGroups:
             await self.dracoon.handle_http_error(err=e, raise_on_err=raise_on_err)
         
         self.logger.info("Retrieved groups.")
-        return GroupList(**res.json())
+        return GroupList.model_validate_json(res.content)
 
 
     @retry(**RETRY_CONFIG)
@@ -140,7 +146,7 @@ class DRACOONGroups:
             await self.dracoon.handle_http_error(err=e, raise_on_err=raise_on_err)
         
         self.logger.info("Retrieved group.")
-        return Group(**res.json())
+        return Group.model_validate_json(res.content)
 
 
     @retry(**RETRY_CONFIG)
@@ -166,7 +172,7 @@ class DRACOONGroups:
             await self.dracoon.handle_http_error(err=e, raise_on_err=raise_on_err)
         
         self.logger.info("Updated group.")
-        return Group(**res.json())
+        return Group.model_validate_json(res.content)
 
     def make_group_update(self, name: str = None, expiration: Expiration = None) -> UpdateGroup:
         """ make a group update payload required for update_group() """
@@ -226,7 +232,7 @@ class DRACOONGroups:
             await self.dracoon.handle_http_error(err=e, raise_on_err=raise_on_err)
         
         self.logger.info("Retrieved group users.")
-        return GroupUserList(**res.json())
+        return GroupUserList.model_validate_json(res.content)
 
     @retry(**RETRY_CONFIG)
     async def get_group_last_admin_rooms(self, group_id: int, raise_on_err: bool = False) -> LastAdminGroupRoomList:
@@ -249,7 +255,7 @@ class DRACOONGroups:
             await self.dracoon.handle_http_error(err=e, raise_on_err=raise_on_err)
         
         self.logger.info("Retrieved last admin group list.")
-        return LastAdminGroupRoomList(**res.json())
+        return LastAdminGroupRoomList.model_validate_json(res.content)
 
     @retry(**RETRY_CONFIG)
     async def get_group_roles(self, group_id: int, raise_on_err: bool = False) -> RoleList:
@@ -273,7 +279,7 @@ class DRACOONGroups:
             await self.dracoon.handle_http_error(err=e, raise_on_err=raise_on_err)
         
         self.logger.info("Retrieved group roles list.")
-        return RoleList(**res.json())
+        return RoleList.model_validate_json(res.content)
 
     @retry(**RETRY_CONFIG)
     async def add_group_users(self, group_id: int, user_list: List[int], raise_on_err: bool = False) -> Group:
@@ -301,7 +307,7 @@ class DRACOONGroups:
             await self.dracoon.handle_http_error(err=e, raise_on_err=raise_on_err)
         
         self.logger.info("Added group user(s).")
-        return Group(**res.json())
+        return Group.model_validate_json(res.content)
 
     @retry(**RETRY_CONFIG)
     async def delete_group_users(self, group_id: int, user_list: List[int], raise_on_err: bool = False) -> Group:
@@ -328,4 +334,73 @@ class DRACOONGroups:
             await self.dracoon.handle_http_error(err=e, raise_on_err=raise_on_err)
         
         self.logger.info("Deleted group users(s).")
-        return Group(**res.json())
\ No newline at end of file
+        return Group.model_validate_json(res.content)
+
+    async def get_group_member_ids(self, group_id: int, concurrency: int = DEFAULT_CONCURRENCY, raise_on_err: bool = False) -> List[int]:
+        """ get ids of all group members (paged, pages are requested concurrently) """
+        first_page = await self.get_group_users(group_id=group_id, filter='isMember:eq:true', limit=GROUP_USERS_PAGE_SIZE, raise_on_err=raise_on_err)
+        user_ids = [user.userInfo.id for user in first_page.items]
+        total = first_page.range.total
+
+        if total > GROUP_USERS_PAGE_SIZE:
+            page_reqs = [self.get_group_users(group_id=group_id, filter='isMember:eq:true', limit=GROUP_USERS_PAGE_SIZE, offset=offset,
+                                              raise_on_err=raise_on_err)
+                         for offset in range(GROUP_USERS_PAGE_SIZE, total, GROUP_USERS_PAGE_SIZE)]
+            for page in await gather_bounded(page_reqs, limit=concurrency):
+                user_ids.extend(user.userInfo.id for user in page.items)
+
+        return user_ids
+
+    async def sync_group_members(self, group_id: int, desired_user_ids: Iterable[int], dry_run: bool = False, concurrency: int = DEFAULT_CONCURRENCY,
+                                 batch_size: int = GROUP_USERS_BATCH_SIZE, raise_on_err: bool = False) -> GroupMemberSync:
+        """ 
+        add and remove group members to match desired user ids (batched requests)
+        users of failed batches are returned as addFailed / removeFailed (or raised with raise_on_err)
+        """
+        if self.raise_on_err:
+            raise_on_err = True
+
+        current = set(await self.get_group_member_ids(group_id=group_id, concurrency=concurrency, raise_on_err=raise_on_err))
+        desired = set(desired_user_ids)
+
+        added = sorted(desired - current)
+        removed = sorted(current - desired)
+        add_failed: List[int] = []
+        remove_failed: List[int] = []
+
+        async def run_batches(request_fn, user_ids: List[int], failed: List[int]) -> None:
+            for i in range(0, len(user_ids), batch_size):
+                batch = user_ids[i:i + batch_size]
+                try:
+                    await request_fn(group_id=group_id, user_list=batch, raise_on_err=True)
+                except (DRACOONHttpError, ConnectionError):
+                    if raise_on_err:
+                        raise
+                    failed.extend(batch)
+
+        if not dry_run:
+            await run_batches(self.add_group_users, added, add_failed)
+            await run_batches(self.delete_group_users, removed, remove_failed)
+
+        added = [user_id for user_id in added if user_id not in add_failed]
+        removed = [user_id for user_id in removed if user_id not in remove_failed]
+
+        if add_failed or remove_failed:
+            self.logger.error("Syncing group members failed for %s user(s).", len(add_failed) + len(remove_failed))
+        self.logger.info("Synced group members: %s added, %s removed.", len(added), len(removed))
+        return GroupMemberSync(groupId=group_id, added=added, removed=removed, addFailed=add_failed, removeFailed=remove_failed)
+
+    async def sync_groups_members(self, desired_members: Dict[int, Iterable[int]], dry_run: bool = False, concurrency: int = DEFAULT_CONCURRENCY,
+                                  batch_size: int = GROUP_USERS_BATCH_SIZE) -> List[Union[GroupMemberSync, Exception]]:
+        """ sync members of multiple groups concurrently (group id -> user ids) - failed groups are returned as exception """
+        sync_reqs = [self.sync_group_members(group_id=group_id, desired_user_ids=user_ids, dry_run=dry_run, concurrency=1,
+                                             batch_size=batch_size, raise_on_err=True)
+                     for group_id, user_ids in desired_members.items()]
+
+        results = await gather_bounded(sync_reqs, limit=concurrency, return_exceptions=True)
+
+        failed = len([result for result in results if isinstance(result, Exception)])
+        if failed:
+            self.logger.error("Syncing group members failed for %s group(s).", failed)
+
+        return results
@@ -55,4 +55,9 @@ class LastAdminGroupRoom(BaseModel):
 class LastAdminGroupRoomList(BaseModel):
     items: List[LastAdminGroupRoom]
 
-
+class GroupMemberSync(BaseModel):
+    groupId: int
+    added: List[int]
+    removed: List[int]
+    addFailed: List[int] = []
+    removeFailed: List[int] = []
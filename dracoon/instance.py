@@ -0,0 +1,117 @@
+"""
+Cache for DRACOON instance information
+
+Instance information (e.g. system info, system defaults, general settings)
+rarely changes and is cached for a limited time (TTL). It can optionally
+be persisted to a file to be reused by subsequent runs (e.g. cron jobs).
+
+Please note: user specific information (account) is never persisted.
+
+"""
+
+import json
+import logging
+import os
+import tempfile
+import time
+from typing import Any, Dict, Optional, Type
+
+from pydantic import BaseModel
+
+# default time to live of instance information (in seconds)
+INSTANCE_INFO_TTL = 3600
+
+
+class InstanceInfoCache:
+    """ cache of instance information (in memory, optionally persisted to file) """
+
+    def __init__(self, base_url: str, ttl: float = INSTANCE_INFO_TTL, file_path: str = None):
+        self.logger = logging.getLogger('dracoon.instance')
+        self.base_url = base_url
+        self.ttl = ttl
+        self.file_path = file_path
+        self.entries: Dict[str, Dict[str, Any]] = {}
+
+        if self.file_path:
+            self.load()
+
+    def get(self, name: str, model: Type[BaseModel]) -> Optional[BaseModel]:
+        """ get cached information (None if not cached or expired) """
+        entry = self.entries.get(name)
+
+        if entry is None:
+            return None
+
+        if entry['fetched_at'] + self.ttl < time.time():
+            del self.entries[name]
+            return None
+
+        value = entry.get('value')
+        if value is None:
+            if entry.get('data') is None:
+                del self.entries[name]
+                return None
+            value = model(**entry['data'])
+            entry['value'] = value
+
+        return value
+
+    def set(self, name: str, value: BaseModel, persist: bool = True) -> None:
+        """ cache information (persisted if file is configured) - missing information (None) is not cached """
+        if value is None:
+            self.entries.pop(name, None)
+            return
+
+        self.entries[name] = {'fetched_at': time.time(), 'value': value, 'persist': persist}
+
+        if persist and self.file_path:
+            self.save()
+
+    def clear(self) -> None:
+        """ remove all cached information """
+        self.entries.clear()
+
+        if self.file_path:
+            self.save()
+
+    def load(self) -> None:
+        """ load persisted information of instance """
+        try:
+            with open(self.file_path, 'r') as cache_file:
+                content = json.load(cache_file)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError):
+            self.logger.warning("Instance information cache could not be read: %s", self.file_path)
+            return
+
+        for name, entry in content.get(self.base_url, {}).items():
+            if entry.get('data') is None:
+                continue
+            self.entries[name] = {'fetched_at': entry['fetched_at'], 'data': entry['data'], 'persist': True}
+
+    def save(self) -> None:
+        """ persist information of instance (other instances in file are kept) """
+        try:
+            with open(self.file_path, 'r') as cache_file:
+                content = json.load(cache_file)
+        except (OSError, ValueError):
+            content = {}
+
+        content[self.base_url] = {
+            name: {'fetched_at': entry['fetched_at'],
+                   'data': entry['value'].model_dump(mode='json') if entry.get('value') is not None else entry['data']}
+            for name, entry in self.entries.items() if entry['persist'] and (entry.get('value') is not None or entry.get('data') is not None)
+        }
+
+        # replace file atomically (concurrent runs)
+        directory = os.path.dirname(os.path.abspath(self.file_path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.dracoon-')
+        try:
+            with os.fdopen(fd, 'w') as tmp_file:
+                json.dump(content, tmp_file)
+            os.replace(tmp_path, self.file_path)
+        except OSError:
+            self.logger.warning("Instance information cache could not be written: %s", self.file_path)
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
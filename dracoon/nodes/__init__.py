@@ -18,7 +18,7 @@ import datetime
 import math
 from pathlib import Path
 from datetime import datetime
-from typing import List, Union
+from typing import Dict, List, Union
 import logging
 import asyncio
 import urllib.parse
@@ -29,9 +29,13 @@ from tenacity import retry
 from dracoon.crypto import FileEncryptionCipher, decrypt_file_key, encrypt_bytes, encrypt_file_key, create_file_key, encrypt_file_key_public
 from dracoon.crypto.models import FileKey, PlainUserKeyPairContainer, UserKeyPairContainer
 from dracoon.groups.models import Expiration
+from dracoon.compact import CompactList, parse_compact_list
+from dracoon.serialization import json_loads
 from dracoon.client import DRACOONClient, OAuth2ConnectionType, RETRY_CONFIG
-from dracoon.errors import (InvalidClientError, ClientDisconnectedError, InvalidFileError, InvalidArgumentError)
+from dracoon.polling import CompletionWatcher
+from dracoon.errors import (InvalidClientError, ClientDisconnectedError, InvalidFileError, InvalidArgumentError, DRACOONHttpError)
 from dracoon.uploads.models import UploadChannelResponse
+from .cache import NodePathCache
 from .models import (Callback, CompleteS3Upload, CompleteUpload, ConfigRoom, CreateFolder, CreateRoom, CreateUploadChannel, EncryptRoom, FileVersionList, 
                      GetS3Urls, LogEventList, MissingKeysResponse, Node, NodeItem, Permissions, ProcessRoomPendingUsers, S3Part, 
                      SetFileKeys, SetFileKeysItem, TransferNode, CommentNode, RestoreNode, UpdateFile, UpdateFiles, 
@@ -72,6 +76,21 @@ class DRACOONNodes:
                 self.raise_on_err = True
             else:
                 self.raise_on_err = False
+            
+            # S3 upload status is polled by one watcher shared by all adapters of the client
+            # (errors resolve waiting callers - raise_on_err of caller is applied in wait_for_s3_upload())
+            # check is bound to the client - adapters are recreated on connect
+            if 's3_uploads' not in self.dracoon.watchers:
+                client = self.dracoon
+                self.dracoon.watchers['s3_uploads'] = CompletionWatcher(check_fn=lambda upload_id: DRACOONNodes(client).check_s3_upload(upload_id=upload_id, raise_on_err=True),
+                                                                        is_complete=lambda upload_status: upload_status.status in [S3Status.done.value, S3Status.error.value],
+                                                                        min_wait=POLL_WAIT)
+            self.upload_watcher: CompletionWatcher = self.dracoon.watchers['s3_uploads']
+            
+            # nodes resolved from path are cached for all adapters of the client
+            if 'node_paths' not in self.dracoon.caches:
+                self.dracoon.caches['node_paths'] = NodePathCache()
+            self.path_cache: NodePathCache = self.dracoon.caches['node_paths']
 
         else:
             self.logger.error("DRACOON client error: no connection. ")
@@ -126,7 +145,7 @@ class DRACOONNodes:
             await self.dracoon.handle_http_error(err=e, raise_on_err=raise_on_err)
         
         self.logger.info("Upload channel created.")
-        return CreateFileUploadResponse(**res.json())
+        return CreateFileUploadResponse.model_validate_json(res.content)
     
     def make_upload_channel(self, parent_id: int, name: str, classification: int = None, size: int = None, expiration: Expiration = None, notes: str = None, 
                             direct_s3_upload: bool = None, modification_date: str = None, creation_date: str = None) -> CreateUploadChannel:
@@ -171,8 +190,8 @@ class DRACOONNodes:
         return None
     
     @retry(**RETRY_CONFIG)
-    async def get_node_from_path(self, path: str, filter: str = None, raise_on_err: bool = False) -> Node:
-        """ get node id from path """
+    async def get_node_from_path(self, path: str, filter: str = None, raise_on_err: bool = False, use_cache: bool = True) -> Node:
+        """ get node id from path (cached - see path_cache) """
         
         # folder / room 
         if path[-1] == '/':
@@ -184,6 +203,21 @@ class DRACOONNodes:
             last_node = path.split('/')[-1]
             parent_path = '/'.join(path.split('/')[:-1])
             depth = len(path.split('/')[:-1])
+        
+        # a filter might exclude the cached node
+        if filter: use_cache = False
+        
+        if use_cache:
+            node = self.path_cache.get(path)
+            if node is not None:
+                self.logger.debug("Retrieved node from path cache.")
+                return node
+            # longest cached part of parent path (e.g. room of a folder)
+            ancestor = self.path_cache.get_ancestor(parent_path) if parent_path.strip('/') else None
+        else:
+            ancestor = None
+
+        node_name = last_node
 
         filter_str = f'parentPath:eq:{parent_path}/'
 
@@ -198,7 +232,13 @@ class DRACOONNodes:
         if self.raise_on_err:
             raise_on_err = True
 
-        api_url = self.api_url + f'/search?search_string={last_node}&filter={filter_str}&depth_level={str(depth)}'
+        # ancestor is cached: search below ancestor only
+        if ancestor is not None:
+            ancestor_path, parent = ancestor
+            ancestor_depth = len(parent_path.strip('/').split('/')) - len(ancestor_path.strip('/').split('/'))
+            api_url = self.api_url + f'/search?search_string={last_node}&parent_id={str(parent.id)}&depth_level={str(ancestor_depth)}'
+        else:
+            api_url = self.api_url + f'/search?search_string={last_node}&filter={filter_str}&depth_level={str(depth)}'
 
         try:
             res = await self.dracoon.http.get(url=api_url)
@@ -206,13 +246,24 @@ class DRACOONNodes:
         except httpx.RequestError as e:
             await self.dracoon.handle_connection_error(e)
         except httpx.HTTPStatusError as e:
-            self.logger.error("Copying nodes failed.")
+            self.logger.error("Getting node from path failed.")
             await self.dracoon.handle_http_error(err=e, raise_on_err=raise_on_err)
 
+        items = json_loads(res.content)["items"] if res.status_code == 200 else []
+        
+        # search is not restricted to exact name (names are case-insensitive)
+        items = [item for item in items if item["name"].lower() == node_name.lower()]
 
-        if res.status_code == 200 and len(res.json()["items"]) > 0:
+        # search below ancestor is not restricted to parent path
+        if ancestor is not None and ancestor_depth > 0:
+            items = [item for item in items if NodePathCache.key(item.get("parentPath") or '') == NodePathCache.key(parent_path)]
+
+        if len(items) > 0:
             self.logger.info("Retrieved node from path.")
-            return Node(**res.json()["items"][0])
+            node = Node(**items[0])
+            if use_cache:
+                self.path_cache.put(node=node, path=path)
+            return node
         else:
             self.logger.error("Node from path not found.")
             return None
@@ -244,7 +295,7 @@ class DRACOONNodes:
         
         # handle resolutionStrategy fail and raise_on_err True with conflict
         if res.status_code == 409:
-            return res.json()
+            return json_loads(res.content)
         
         return None
 
@@ -296,7 +347,7 @@ class DRACOONNodes:
             await self.dracoon.handle_http_error(err=e, raise_on_err=raise_on_err)
         
         self.logger.info("Retrieved S3 presigned upload URLs.")
-        return PresignedUrlList(**res.json())
+        return PresignedUrlList.model_validate_json(res.content)
     
     @retry(**RETRY_CONFIG)
     async def upload_unencrypted(self, file_path: str, upload_channel: CreateFileUploadResponse, keep_shares: bool = False, 
@@ -479,32 +530,39 @@ class DRACOONNodes:
         
         node = await self.complete_upload(upload_channel=upload_channel, payload=complete_upload, raise_on_err=raise_on_err)
 
-        missing_keys = await self.get_missing_file_keys(file_id=node.id, limit=FILE_KEY_LIMIT)
+        await self.distribute_missing_file_keys(file_id=node.id, plain_keypair=plain_keypair)
 
-        if missing_keys.range.total > 0:
-            keys = self.make_set_file_keys(file_key_list=[])
+        return node
 
-            for key in missing_keys.items:
-                # get file key
-                for file_item in missing_keys.files:
-                    if key.fileId == file_item.id:
-                        file_key = file_item.fileKeyContainer
-                        plain_file_key = decrypt_file_key(file_key=file_key, keypair=plain_keypair)
+    async def distribute_missing_file_keys(self, file_id: int, plain_keypair: PlainUserKeyPairContainer, raise_on_err: bool = False) -> None:
+        """ set missing file keys of a (freshly uploaded) file for all users with access """
+        missing_keys = await self.get_missing_file_keys(file_id=file_id, limit=FILE_KEY_LIMIT, raise_on_err=raise_on_err)
 
-                # add requests per user 
-                for user in missing_keys.users:
-                    if key.userId == user.id:
-                        public_key = user.publicKeyContainer
+        if missing_keys.range.total == 0:
+            return None
 
-                user_file_key = encrypt_file_key_public(plain_file_key=plain_file_key, public_key=public_key)
+        keys = self.make_set_file_keys(file_key_list=[])
 
-                file_key_item = self.make_set_file_key_item(file_id=key.fileId, user_id=key.userId, file_key=user_file_key)
+        for key in missing_keys.items:
+            # get file key
+            for file_item in missing_keys.files:
+                if key.fileId == file_item.id:
+                    file_key = file_item.fileKeyContainer
+                    plain_file_key = decrypt_file_key(file_key=file_key, keypair=plain_keypair)
 
-                keys.items.append(file_key_item)
-                    
-            await self.set_file_keys(file_keys=keys)
-             
-        return node
+            # add requests per user
+            for user in missing_keys.users:
+                if key.userId == user.id:
+                    public_key = user.publicKeyContainer
+
+            user_file_key = encrypt_file_key_public(plain_file_key=plain_file_key, public_key=public_key)
+
+            file_key_item = self.make_set_file_key_item(file_id=key.fileId, user_id=key.userId, file_key=user_file_key)
+
+            keys.items.append(file_key_item)
+
+        await self.set_file_keys(file_keys=keys, raise_on_err=raise_on_err)
+        return None
     
     def make_upload_complete(self, resolution_strategy: str = 'autorename', keep_shares: bool = False,
                              file_name: str = None, file_key: FileKey = None) -> CompleteUpload:
@@ -538,14 +596,18 @@ class DRACOONNodes:
             self.logger.error("Uploading file failed.")
             await self.dracoon.http.delete(upload_channel.uploadUrl)
             await self.dracoon.handle_http_error(err=e, raise_on_err=raise_on_err)
+        
+        # file might replace a cached file (resolution strategy overwrite)
+        node = Node.model_validate_json(res.content)
+        self.path_cache.put(node)
           
-        return Node(**res.json())
+        return node
     
     @retry(**RETRY_CONFIG)
     async def upload_s3_unencrypted(self, file_path: str, upload_channel: CreateFileUploadResponse, keep_shares: bool = False,
                                     file_name: str = None,
                                     resolution_strategy: str = 'autorename', chunksize: int = CHUNK_SIZE, 
-                                    raise_on_err: bool = False, callback_fn: Callback  = None) -> S3FileUploadStatus:
+                                    raise_on_err: bool = False, callback_fn: Callback  = None, poll_status: bool = True) -> S3FileUploadStatus:
         if self.raise_on_err:
             raise_on_err = True
 
@@ -661,18 +723,11 @@ class DRACOONNodes:
         if upload is not None:         
             return 
         
-        time  = POLL_WAIT
+        # status is polled by caller (e.g. for many uploads at once via wait_for_s3_uploads())
+        if not poll_status:
+            return S3FileUploadStatus(status=S3Status.finishing)
         
-        while True:
-            upload_status = await self.check_s3_upload(upload_id=upload_channel.uploadId, raise_on_err=raise_on_err)
-            if upload_status.status == S3Status.done.value:
-                break
-            if upload_status.status == S3Status.error.value:
-                break
-            # wait until next request
-            await asyncio.sleep(time)
-            # increase wait 
-            time *= 2
+        upload_status = await self.wait_for_s3_upload(upload_id=upload_channel.uploadId, raise_on_err=raise_on_err)
             
         return upload_status
     
@@ -681,7 +736,7 @@ class DRACOONNodes:
                                   file_name: str = None,
                                   keep_shares: bool = False, resolution_strategy: str = 'autorename', 
                                   chunksize: int = CHUNK_SIZE, raise_on_err: bool = False,
-                                  callback_fn: Callback  = None
+                                  callback_fn: Callback  = None, poll_status: bool = True
                                   ) -> S3FileUploadStatus:
         
         """ Upload a file into an encrypted container via S3 direct upload """
@@ -825,45 +880,14 @@ class DRACOONNodes:
         if upload is not None:         
             return 
         
-        time  = POLL_WAIT 
+        # status is polled and missing file keys are set by caller (see DRACOON.upload_files())
+        if not poll_status:
+            return S3FileUploadStatus(status=S3Status.finishing)
         
-        while True:
-            upload_status = await self.check_s3_upload(upload_id=upload_channel.uploadId, raise_on_err=raise_on_err)
-            if upload_status.status == S3Status.done.value:
-                missing_keys = await self.get_missing_file_keys(file_id=upload_status.node.id, limit=FILE_KEY_LIMIT)
-
-                if missing_keys.range.total == 0:
-                    break
-
-                keys = self.make_set_file_keys(file_key_list=[])
-
-                for key in missing_keys.items:
-                    # get file key
-                    for file_item in missing_keys.files:
-                        if key.fileId == file_item.id:
-                            file_key = file_item.fileKeyContainer
-                            plain_file_key = decrypt_file_key(file_key=file_key, keypair=plain_keypair)
-
-                    # add requests per user 
-                    for user in missing_keys.users:
-                        if key.userId == user.id:
-                            public_key = user.publicKeyContainer
-
-                    user_file_key = encrypt_file_key_public(plain_file_key=plain_file_key, public_key=public_key)
-
-                    file_key_item = self.make_set_file_key_item(file_id=key.fileId, user_id=key.userId, file_key=user_file_key)
-
-                    keys.items.append(file_key_item)
-                
-                await self.set_file_keys(file_keys=keys)
-
-                break
-            if upload_status.status == S3Status.error.value:
-                break
-            # wait until next request
-            await asyncio.sleep(time)
-            # increase wait 
-            time *= 2
+        upload_status = await self.wait_for_s3_upload(upload_id=upload_channel.uploadId, raise_on_err=raise_on_err)
+        
+        if upload_status.status == S3Status.done.value:
+            await self.distribute_missing_file_keys(file_id=upload_status.node.id, plain_keypair=plain_keypair)
             
         return upload_status
     
@@ -885,12 +909,34 @@ class DRACOONNodes:
             await self.dracoon.handle_http_error(err=e, raise_on_err=raise_on_err)
             
         self.logger.info("Retrieved S3 upload status.")
-        return S3FileUploadStatus(**res.json())
-        
+        return S3FileUploadStatus.model_validate_json(res.content)
+
+    async def wait_for_s3_upload(self, upload_id: str, raise_on_err: bool = False) -> S3FileUploadStatus:
+        """ wait until S3 upload is done (or failed) - status is polled by shared watcher """
+        if self.raise_on_err:
+            raise_on_err = True
+
+        try:
+            return await self.upload_watcher.wait(upload_id)
+        except (DRACOONHttpError, ConnectionError, httpx.RequestError):
+            # watcher always raises to resolve waiting callers
+            if raise_on_err:
+                raise
+            self.logger.error("Checking S3 upload failed.")
+            return S3FileUploadStatus(status=S3Status.error)
+
+    async def wait_for_s3_uploads(self, upload_ids: List[str], raise_on_err: bool = False) -> Dict[str, S3FileUploadStatus]:
+        """ wait until multiple S3 uploads are done (or failed) - status is polled by shared watcher """
+        upload_ids = list(dict.fromkeys(upload_ids))
+        self.logger.debug("Waiting for S3 uploads: %s", len(upload_ids))
+
+        statuses = await asyncio.gather(*[self.wait_for_s3_upload(upload_id=upload_id, raise_on_err=raise_on_err) for upload_id in upload_ids])
+        return dict(zip(upload_ids, statuses))
+
 
     @retry(**RETRY_CONFIG)
     async def get_nodes(self, room_manager: bool = False, parent_id: int = 0, offset: int = 0, filter: str = None, limit: int = None, sort: str = None, 
-                        raise_on_err: bool = False) -> NodeList:
+                        raise_on_err: bool = False, compact: bool = False) -> Union[NodeList, CompactList[NodeList]]:
         """ list (all) visible nodes """
         if not await self.dracoon.test_connection() and self.dracoon.connection:
             await self.dracoon.connect(OAuth2ConnectionType.refresh_token)
@@ -919,7 +965,9 @@ class DRACOONNodes:
             await self.dracoon.handle_http_error(err=e, raise_on_err=raise_on_err)
         
         self.logger.info("Retrieved nodes.")
-        return NodeList(**res.json())
+        if compact:
+            return parse_compact_list(NodeList, json_loads(res.content))
+        return NodeList.model_validate_json(res.content)
     
 
     @retry(**RETRY_CONFIG) 
@@ -945,6 +993,9 @@ class DRACOONNodes:
             self.logger.error("Deleting nodes failed.")
             await self.dracoon.handle_http_error(err=e, raise_on_err=raise_on_err)
 
+        for node_id in node_list:
+            self.path_cache.invalidate_node(node_id)
+
         self.logger.info("Deleted node(s).")
         return None
 
@@ -969,7 +1020,7 @@ class DRACOONNodes:
             await self.dracoon.handle_http_error(err=e, raise_on_err=raise_on_err)
         
         self.logger.info("Retrieved node.")
-        return Node(**res.json())
+        return Node.model_validate_json(res.content)
 
 
     @retry(**RETRY_CONFIG)
@@ -993,6 +1044,8 @@ class DRACOONNodes:
             self.logger.error("Deleting node failed.")
             await self.dracoon.handle_http_error(err=e, raise_on_err=raise_on_err)
         
+        self.path_cache.invalidate_node(node_id)
+        
         self.logger.info("Deleted node.")
         return None
 
@@ -1019,7 +1072,7 @@ class DRACOONNodes:
             await self.dracoon.handle_http_error(err=e, raise_on_err=raise_on_err)
         
         self.logger.info("Retrieved node comments.")
-        return CommentList(**res.json())
+        return CommentList.model_validate_json(res.content)
 
     @retry(**RETRY_CONFIG)
     async def add_node_comment(self, node_id: int, comment: CommentNode, raise_on_err: bool = False) -> Comment:
@@ -1044,7 +1097,7 @@ class DRACOONNodes:
             await self.dracoon.handle_http_error(err=e, raise_on_err=raise_on_err)
         
         self.logger.info("Added node comment.")
-        return Comment(**res.json())
+        return Comment.model_validate_json(res.content)
 
     def make_comment(self, text: str) -> CommentNode:
         """ make a comment payload for add_comment() """
@@ -1076,8 +1129,14 @@ class DRACOONNodes:
             self.logger.error("Copying nodes failed.")
             await self.dracoon.handle_http_error(err=e, raise_on_err=raise_on_err)
         
+        target = Node.model_validate_json(res.content)
+
+        # nodes below target might be replaced
+        if copy_node.resolutionStrategy == 'overwrite':
+            self.path_cache.invalidate_below(target)
+
         self.logger.info("Copied nodes.")
-        return Node(**res.json())
+        return target
     
 
     def make_node_transfer(self, items: List[NodeItem], resolution_strategy: str = None, keep_share_links: bool = None, parent_id: int = None) -> TransferNode:
@@ -1136,7 +1195,7 @@ class DRACOONNodes:
             await self.dracoon.handle_http_error(err=e, raise_on_err=raise_on_err)
         
         self.logger.info("Retrieved deleted nodes.")
-        return DeletedNodeSummaryList(**res.json())
+        return DeletedNodeSummaryList.model_validate_json(res.content)
 
 
     @retry(**RETRY_CONFIG)
@@ -1164,7 +1223,7 @@ class DRACOONNodes:
         return None
 
     @retry(**RETRY_CONFIG)
-    async def get_node_versions(self, parent_id: int, name: str, type: str, offset: int = 0, raise_on_err: bool = False) -> DeletedNodeVersionsList:
+    async def get_node_versions(self, parent_id: int, name: str, type: str, offset: int = 0, limit: int = None, raise_on_err: bool = False) -> DeletedNodeVersionsList:
         """ get (all) versions of a node (by id) """
         if not await self.dracoon.test_connection() and self.dracoon.connection:
             await self.dracoon.connect(OAuth2ConnectionType.refresh_token)
@@ -1172,12 +1231,16 @@ class DRACOONNodes:
         if self.raise_on_err:
             raise_on_err = True
         
-        name = urllib.parse.quote(name)
-        
-        api_url = self.api_url + f'/{str(parent_id)}/deleted_nodes/versions?name={name}&type={type}&offset={offset}'
+        # names may contain reserved characters (e.g. '&', '#') - encoded by httpx
+        params = {'name': name, 'type': type, 'offset': offset}
+
+        if limit != None:
+            params['limit'] = limit
+
+        api_url = self.api_url + f'/{str(parent_id)}/deleted_nodes/versions'
 
         try:
-            res = await self.dracoon.http.get(api_url)
+            res = await self.dracoon.http.get(api_url, params=params)
         
             res.raise_for_status()
         except httpx.RequestError as e:
@@ -1187,7 +1250,7 @@ class DRACOONNodes:
             await self.dracoon.handle_http_error(err=e, raise_on_err=raise_on_err)
         
         self.logger.info("Retrieved node versions.")
-        return DeletedNodeVersionsList(**res.json())
+        return DeletedNodeVersionsList.model_validate_json(res.content)
 
 
     @retry(**RETRY_CONFIG)
@@ -1211,7 +1274,7 @@ class DRACOONNodes:
             await self.dracoon.handle_http_error(err=e, raise_on_err=raise_on_err)
         
         self.logger.info("Added node to favorites.")
-        return Node(**res.json())
+        return Node.model_validate_json(res.content)
 
     @retry(**RETRY_CONFIG)
     async def delete_favorite(self, node_id: int, raise_on_err: bool = False) -> None:
@@ -1258,7 +1321,16 @@ class DRACOONNodes:
             self.logger.error("Moving nodes failed.")
             await self.dracoon.handle_http_error(err=e, raise_on_err=raise_on_err)
             self.logger.info("Moved node(s).")
-        return Node(**res.json())
+        for item in move_node.items:
+            self.path_cache.invalidate_node(item.id)
+
+        target = Node.model_validate_json(res.content)
+
+        # nodes below target might be replaced
+        if move_node.resolutionStrategy == 'overwrite':
+            self.path_cache.invalidate_below(target)
+        
+        return target
 
 
     @retry(**RETRY_CONFIG)
@@ -1282,7 +1354,7 @@ class DRACOONNodes:
             await self.dracoon.handle_http_error(err=e, raise_on_err=raise_on_err)
         
         self.logger.info("Retrieved node parents.")
-        return NodeParentList(**res.json())
+        return NodeParentList.model_validate_json(res.content)
 
     @retry(**RETRY_CONFIG)
     async def empty_recyclebin(self, node_list: List[int], raise_on_err: bool = False) -> None:
@@ -1334,7 +1406,7 @@ class DRACOONNodes:
             await self.dracoon.handle_http_error(err=e, raise_on_err=raise_on_err)
         
         self.logger.info("Retrieved deleted node.")
-        return DeletedNode(**res.json())
+        return DeletedNode.model_validate_json(res.content)
 
 
     @retry(**RETRY_CONFIG)
@@ -1398,8 +1470,13 @@ class DRACOONNodes:
             self.logger.error("Updating file failed.")
             await self.dracoon.handle_http_error(err=e, raise_on_err=raise_on_err)
         
+        node = Node.model_validate_json(res.content)
+
+        # name (path) or properties of node changed
+        self.path_cache.invalidate_node(file_id, node=node)
+        
         self.logger.info("Updated file.")
-        return Node(**res.json())
+        return node
 
     @retry(**RETRY_CONFIG)
     async def update_files(self, files_update: UpdateFiles, raise_on_err: bool = False) -> None:
@@ -1476,7 +1553,7 @@ class DRACOONNodes:
             self.logger.error("Getting download URL failed.")
             await self.dracoon.handle_http_error(err=e, raise_on_err=raise_on_err)
         self.logger.info("Retrieved download URL.")
-        return DownloadTokenGenerateResponse(**res.json())
+        return DownloadTokenGenerateResponse.model_validate_json(res.content)
 
     @retry(**RETRY_CONFIG)
     async def get_user_file_key(self, file_id: int, version: str = None, raise_on_err: bool = False) -> FileKey:
@@ -1501,7 +1578,7 @@ class DRACOONNodes:
             await self.dracoon.handle_http_error(err=e, raise_on_err=raise_on_err)
 
         self.logger.info("Retrieved user file key.")
-        return FileKey(**res.json())
+        return FileKey.model_validate_json(res.content)
 
     @retry(**RETRY_CONFIG)
     async def set_file_keys(self, file_keys: SetFileKeys, raise_on_err: bool = False) -> None:
@@ -1566,7 +1643,7 @@ class DRACOONNodes:
             await self.dracoon.handle_http_error(err=e, raise_on_err=raise_on_err)
         
         self.logger.info("Retrieved node.")
-        return FileVersionList(**res.json())
+        return FileVersionList.model_validate_json(res.content)
 
     @retry(**RETRY_CONFIG)
     async def create_folder(self, folder: CreateFolder, raise_on_err: bool = False) -> Node:
@@ -1591,8 +1668,11 @@ class DRACOONNodes:
             self.logger.error("Creating folder failed.")
             await self.dracoon.handle_http_error(err=e, raise_on_err=raise_on_err)
         
+        node = Node.model_validate_json(res.content)
+        self.path_cache.put(node)
+        
         self.logger.info("Created folder.")
-        return Node(**res.json())
+        return node
 
     def make_folder(self, name: str, parent_id: int, notes: str = None, creation_date: str = None, modified_date: str = None) -> CreateFolder:
         """ make a folder payload required for create_folder() """
@@ -1640,8 +1720,13 @@ class DRACOONNodes:
             self.logger.error("Updating folder failed.")
             await self.dracoon.handle_http_error(err=e, raise_on_err=raise_on_err)
         
+        node = Node.model_validate_json(res.content)
+
+        # name (path) or properties of node changed
+        self.path_cache.invalidate_node(node_id, node=node)
+        
         self.logger.info("Updated folder.")
-        return Node(**res.json())
+        return node
 
     @retry(**RETRY_CONFIG)
     async def get_missing_file_keys(self, file_id: int = None, room_id: int = None, user_id: int = None, use_key: str = None, 
@@ -1677,7 +1762,7 @@ class DRACOONNodes:
             await self.dracoon.handle_http_error(err=e, raise_on_err=raise_on_err)
         
         self.logger.info("Retrieved missing file keys.")
-        return MissingKeysResponse(**res.json())
+        return MissingKeysResponse.model_validate_json(res.content)
 
     @retry(**RETRY_CONFIG)
     async def create_room(self, room: CreateRoom, raise_on_err: bool = False) -> Node:
@@ -1701,8 +1786,11 @@ class DRACOONNodes:
             self.logger.error("Creating room failed.")
             await self.dracoon.handle_http_error(err=e, raise_on_err=raise_on_err)
 
+        node = Node.model_validate_json(res.content)
+        self.path_cache.put(node)
+        
         self.logger.info("Created room.")
-        return Node(**res.json())
+        return node
     
 
     @retry(**RETRY_CONFIG)
@@ -1727,8 +1815,13 @@ class DRACOONNodes:
             self.logger.error("Updating room failed.")
             await self.dracoon.handle_http_error(err=e, raise_on_err=raise_on_err)
 
+        node = Node.model_validate_json(res.content)
+
+        # name (path) or properties of node changed
+        self.path_cache.invalidate_node(node_id, node=node)
+        
         self.logger.info("Updated room.")
-        return Node(**res.json())
+        return node
 
     def make_room(self, name: str, parent_id: int = None, notes: str = None, creation_date: str = None, modified_date: str = None,
                   quota: int = None, recycle_bin_period: int = None, inherit_perms: bool = None, classification: int = None, 
@@ -1791,8 +1884,13 @@ class DRACOONNodes:
             self.logger.error("Configuring room failed.")
             await self.dracoon.handle_http_error(err=e, raise_on_err=raise_on_err)
         
+        node = Node.model_validate_json(res.content)
+
+        # name (path) or properties of node changed
+        self.path_cache.invalidate_node(node_id, node=node)
+        
         self.logger.info("Configured room.")
-        return Node(**res.json())
+        return node
 
     def make_room_config(self, name: str = None, notes: str = None, created: datetime = None, updated: datetime = None, 
                         quota: int = None, recycle_bin_period: int = None, inherit_perms: bool = None, classification: int = None, 
@@ -1877,8 +1975,13 @@ class DRACOONNodes:
             self.logger.error("Encrypting room failed.")
             await self.dracoon.handle_http_error(err=e, raise_on_err=raise_on_err)
         
+        node = Node.model_validate_json(res.content)
+
+        # name (path) or properties of node changed
+        self.path_cache.invalidate_node(room_id, node=node)
+        
         self.logger.info("Encrypted room.")
-        return Node(**res.json())
+        return node
 
     @retry(**RETRY_CONFIG)
     async def get_room_groups(self, room_id: int, offset: int = 0, filter: str = None, limit: str = None, sort: str = None, raise_on_err: bool = False) -> RoomGroupList:
@@ -1911,7 +2014,7 @@ class DRACOONNodes:
             await self.dracoon.handle_http_error(err=e, raise_on_err=raise_on_err)
         
         self.logger.info("Retrieved room groups.")
-        return RoomGroupList(**res.json())
+        return RoomGroupList.model_validate_json(res.content)
 
 
     @retry(**RETRY_CONFIG)
@@ -1998,7 +2101,7 @@ class DRACOONNodes:
             await self.dracoon.handle_http_error(err=e, raise_on_err=raise_on_err)
 
         self.logger.info("Retrieved room users.")
-        return RoomUserList(**res.json())
+        return RoomUserList.model_validate_json(res.content)
 
     @retry(**RETRY_CONFIG)
     async def update_room_users(self, room_id: int, users_update: UpdateRoomUsers, raise_on_err: bool = False) -> None:
@@ -2017,9 +2120,6 @@ class DRACOONNodes:
             res = await self.dracoon.http.put(url=api_url, json=payload)
 
             res.raise_for_status()
-        except httpx.RequestError as e:
-            raise httpx.RequestError(
-                f'Connection to DRACOON failed: {e.request.url}')
         except httpx.RequestError as e:
             await self.dracoon.handle_connection_error(e)
         except httpx.HTTPStatusError as e:
@@ -2088,7 +2188,7 @@ class DRACOONNodes:
             await self.dracoon.handle_http_error(err=e, raise_on_err=raise_on_err)
 
         self.logger.info("Retrieved room webhooks.")
-        return RoomWebhookList(**res.json())
+        return RoomWebhookList.model_validate_json(res.content)
 
     @retry(**RETRY_CONFIG)
     async def update_room_webhooks(self, node_id: int, hook_update: UpdateRoomHooks, raise_on_err: bool = False) -> RoomWebhookList:
@@ -2114,11 +2214,12 @@ class DRACOONNodes:
             await self.dracoon.handle_http_error(err=e, raise_on_err=raise_on_err)
 
         self.logger.info("Updated room webhooks.")
-        return RoomWebhookList(**res.json())
+        return RoomWebhookList.model_validate_json(res.content)
     
     @retry(**RETRY_CONFIG)
     async def get_room_events(self, room_id: int, offset: int = 0, filter: str = None, limit: int = None, 
-                        sort: str = None, date_start: str = None, date_end: str = None, operation_id: int = None, user_id: int = None, raise_on_err = False) -> LogEventList:
+                        sort: str = None, date_start: str = None, date_end: str = None, operation_id: int = None, user_id: int = None, raise_on_err = False, 
+                              compact: bool = False) -> Union[LogEventList, CompactList[LogEventList]]:
         """ get pending room assignments (new group members not accepted) """
         if not await self.dracoon.test_connection() and self.dracoon.connection:
             await self.dracoon.connect(OAuth2ConnectionType.refresh_token)
@@ -2149,7 +2250,9 @@ class DRACOONNodes:
             await self.dracoon.handle_http_error(err=e, raise_on_err=raise_on_err)
         
         self.logger.info("Retrieved room events.")
-        return LogEventList(**res.json())
+        if compact:
+            return parse_compact_list(LogEventList, json_loads(res.content))
+        return LogEventList.model_validate_json(res.content)
 
     
     @retry(**RETRY_CONFIG)
@@ -2183,7 +2286,7 @@ class DRACOONNodes:
             await self.dracoon.handle_http_error(err=e, raise_on_err=raise_on_err)
         
         self.logger.info("Retrieved pending assignments.")
-        return PendingAssignmentList(**res.json())
+        return PendingAssignmentList.model_validate_json(res.content)
 
 
     @retry(**RETRY_CONFIG)
@@ -2214,7 +2317,7 @@ class DRACOONNodes:
 
     @retry(**RETRY_CONFIG)
     async def search_nodes(self, search: str, parent_id: int = 0, depth_level: int = 0, offset: int = 0, 
-                           filter: str = None, limit: str = None, sort: str = None, raise_on_err: bool = False) -> NodeList:
+                           filter: str = None, limit: str = None, sort: str = None, raise_on_err: bool = False, compact: bool = False) -> Union[NodeList, CompactList[NodeList]]:
         """ search for specific nodes """
         if not await self.dracoon.test_connection() and self.dracoon.connection:
             await self.dracoon.connect(OAuth2ConnectionType.refresh_token)
@@ -2245,4 +2348,6 @@ class DRACOONNodes:
             await self.dracoon.handle_http_error(err=e, raise_on_err=raise_on_err)
 
         self.logger.info("Retrieved node(s) from search.")
-        return NodeList(**res.json())
\ No newline at end of file
+        if compact:
+            return parse_compact_list(NodeList, json_loads(res.content))
+        return NodeList.model_validate_json(res.content)
\ No newline at end of file
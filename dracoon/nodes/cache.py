@@ -0,0 +1,135 @@
+"""
+Path to node cache for DRACOON nodes adapter
+
+Caches nodes resolved from a path (see DRACOONNodes.get_node_from_path())
+for a limited time (TTL). Entries are invalidated by the adapter methods
+creating, copying, moving, renaming or deleting nodes (by path prefix - all
+entries if the path of a changed room / folder is unknown). Paths are case-insensitive
+(as node names in DRACOON).
+
+"""
+
+import time
+from typing import Dict, Optional, Tuple
+
+from .models import Node, NodeType
+
+# default time to live of cached nodes (in seconds)
+NODE_CACHE_TTL = 60
+
+
+class NodePathCache:
+    """ cache of nodes by path (with TTL) """
+
+    def __init__(self, ttl: float = NODE_CACHE_TTL):
+        self.ttl = ttl
+        self.nodes: Dict[str, Tuple[float, Node]] = {}
+        self.paths: Dict[int, str] = {}
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    @staticmethod
+    def normalize(path: str) -> str:
+        """ normalize path (leading slash, no trailing slash) """
+        path = path.strip('/')
+        return f'/{path}'
+
+    @staticmethod
+    def key(path: str) -> str:
+        """ cache key of a path (normalized, lower case) """
+        return NodePathCache.normalize(path).lower()
+
+    @staticmethod
+    def get_path(node: Node) -> Optional[str]:
+        """ get full path of a node """
+        if node.parentPath is None:
+            return None
+        return NodePathCache.normalize(f"{node.parentPath.rstrip('/')}/{node.name}")
+
+    def get(self, path: str) -> Optional[Node]:
+        """ get cached node from path (None if not cached or expired) """
+        path = self.key(path)
+        entry = self.nodes.get(path)
+
+        if entry is None:
+            return None
+
+        expires, node = entry
+
+        if expires < time.monotonic():
+            self.remove(path)
+            return None
+
+        return node
+
+    def put(self, node: Node, path: str = None) -> None:
+        """ cache a node (path from node if not provided) """
+        if path is None:
+            path = self.get_path(node)
+        if path is None or self.ttl <= 0:
+            return
+
+        path = self.key(path)
+
+        # node might be cached with old path (e.g. after rename)
+        self.invalidate_node(node.id)
+        self.remove(path)
+
+        self.nodes[path] = (time.monotonic() + self.ttl, node)
+        self.paths[node.id] = path
+
+    def remove(self, path: str) -> None:
+        """ remove a single path """
+        entry = self.nodes.pop(path, None)
+        if entry is not None and self.paths.get(entry[1].id) == path:
+            del self.paths[entry[1].id]
+
+    def get_ancestor(self, path: str) -> Optional[Tuple[str, Node]]:
+        """ get longest cached path of path or its parents (with node) """
+        parts = self.key(path).strip('/').split('/')
+
+        for depth in range(len(parts), 0, -1):
+            ancestor_path = '/' + '/'.join(parts[:depth])
+            node = self.get(ancestor_path)
+            if node is not None:
+                return ancestor_path, node
+
+        return None
+
+    def invalidate_path(self, path: str) -> None:
+        """ remove path and all cached paths below """
+        path = self.key(path)
+        prefix = path.rstrip('/') + '/'
+
+        for cached_path in [cached_path for cached_path in self.nodes if cached_path == path or cached_path.startswith(prefix)]:
+            self.remove(cached_path)
+
+    def invalidate_node(self, node_id: int, node: Node = None) -> None:
+        """ 
+        remove node (and all cached nodes below) by id - node (e.g. from response) invalidates its current path
+        uncached rooms / folders might be ancestors of cached nodes: all nodes are removed
+        """
+        path = self.paths.get(node_id)
+        if path is not None:
+            self.invalidate_path(path)
+
+        node_path = self.get_path(node) if node is not None else None
+        if node_path is not None:
+            self.invalidate_path(node_path)
+
+        if path is None and (node_path is None or node.type != NodeType.file):
+            self.clear()
+
+    def invalidate_below(self, node: Node) -> None:
+        """ remove all cached nodes below a node (e.g. target of copy / move) - all nodes if path is unknown """
+        path = self.get_path(node)
+        if path is not None:
+            self.invalidate_path(path)
+        else:
+            self.clear()
+
+    def clear(self) -> None:
+        """ remove all cached nodes """
+        self.nodes.clear()
+        self.paths.clear()
@@ -0,0 +1,263 @@
+"""
+Local node index for DRACOON nodes adapter
+
+In-memory index of a node tree (all nodes below a parent) with lookups
+by id, parent id and path and subtree iteration.
+The index is loaded once and refreshed incrementally (nodes updated since
+the last refresh) - it can optionally be persisted to a SQLite database.
+Paths are case-insensitive (as node names in DRACOON).
+
+Please note: deleted nodes are only detected by a full refresh (all nodes are
+listed again) - done by refresh() once per full_refresh_interval.
+
+"""
+
+import json
+import logging
+import sqlite3
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterator, List, Optional, Set
+
+from dracoon.concurrency import DEFAULT_CONCURRENCY, gather_bounded
+from .cache import NodePathCache
+from .models import Node
+
+# maximum items per search request
+INDEX_PAGE_SIZE = 500
+# refresh overlap to cover clock drift and requests during refresh
+INDEX_REFRESH_OVERLAP = timedelta(days=1)
+# interval of full refresh (removes deleted nodes)
+INDEX_FULL_REFRESH_INTERVAL = timedelta(days=1)
+
+
+class NodeIndex:
+    """ local index of all nodes below a parent (room / folder, 0 for all rooms) """
+
+    def __init__(self, nodes_adapter, parent_id: int = 0, concurrency: int = DEFAULT_CONCURRENCY,
+                 full_refresh_interval: timedelta = INDEX_FULL_REFRESH_INTERVAL):
+        self.logger = logging.getLogger('dracoon.nodes.index')
+        self.nodes_adapter = nodes_adapter
+        self.parent_id = parent_id
+        self.concurrency = concurrency
+        self.full_refresh_interval = full_refresh_interval
+
+        self.nodes: Dict[int, Node] = {}
+        self.children: Dict[int, Set[int]] = {}
+        self.paths: Dict[str, int] = {}
+        self.node_paths: Dict[int, str] = {}
+        self.refreshed_at: datetime = None
+        # last full listing (deleted nodes removed)
+        self.loaded_at: datetime = None
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    def __contains__(self, node_id: int) -> bool:
+        return node_id in self.nodes
+
+    def add(self, node: Node) -> None:
+        """ add or update a node (e.g. moved or renamed) """
+        old_path = self.node_paths.get(node.id)
+
+        if node.id in self.nodes:
+            self.unlink(node.id)
+
+        self.nodes[node.id] = node
+        self.children.setdefault(node.parentId, set()).add(node.id)
+
+        path = NodePathCache.get_path(node)
+        if path is not None:
+            self.set_path(node.id, path)
+
+        # nodes below a moved or renamed node are not updated (no change of updatedAt)
+        # children updated before (already with new path) are kept
+        if old_path is not None and path is not None and old_path != path:
+            for child in list(self.iter_subtree(node.id, include_self=False)):
+                child_path = self.node_paths.get(child.id)
+                if child_path is None or not child_path.startswith(old_path + '/'):
+                    continue
+                self.set_path(child.id, path + child_path[len(old_path):])
+
+    def set_path(self, node_id: int, path: str) -> None:
+        """ set path of a node (replaces previous path) """
+        old_path = self.node_paths.get(node_id)
+        if old_path is not None and self.paths.get(NodePathCache.key(old_path)) == node_id:
+            del self.paths[NodePathCache.key(old_path)]
+
+        self.paths[NodePathCache.key(path)] = node_id
+        self.node_paths[node_id] = path
+
+    def unlink(self, node_id: int) -> None:
+        """ remove node from parent and path lookup (node remains indexed) """
+        node = self.nodes[node_id]
+        siblings = self.children.get(node.parentId)
+        if siblings is not None:
+            siblings.discard(node_id)
+
+        path = self.node_paths.pop(node_id, None)
+        if path is not None and self.paths.get(NodePathCache.key(path)) == node_id:
+            del self.paths[NodePathCache.key(path)]
+
+    def remove(self, node_id: int) -> None:
+        """ remove node and all nodes below """
+        if node_id not in self.nodes:
+            return
+
+        for node in list(self.iter_subtree(node_id)):
+            self.unlink(node.id)
+            self.children.pop(node.id, None)
+            del self.nodes[node.id]
+
+    def clear(self) -> None:
+        """ remove all nodes """
+        self.nodes.clear()
+        self.children.clear()
+        self.paths.clear()
+        self.node_paths.clear()
+        self.refreshed_at = None
+        self.loaded_at = None
+
+    def get(self, node_id: int) -> Optional[Node]:
+        """ get node by id """
+        return self.nodes.get(node_id)
+
+    def get_path(self, node_id: int) -> Optional[str]:
+        """ get path of a node """
+        return self.node_paths.get(node_id)
+
+    def get_by_path(self, path: str) -> Optional[Node]:
+        """ get node by path (e.g. /room/folder/file) - case-insensitive """
+        node_id = self.paths.get(NodePathCache.key(path))
+        if node_id is None:
+            return None
+        return self.nodes.get(node_id)
+
+    def get_children(self, node_id: int) -> List[Node]:
+        """ get direct children of a node """
+        return [self.nodes[child_id] for child_id in self.children.get(node_id, set())]
+
+    def iter_subtree(self, node_id: int, include_self: bool = True) -> Iterator[Node]:
+        """ iterate all nodes below a node (depth first) """
+        stack = [node_id] if include_self else list(self.children.get(node_id, set()))
+
+        while stack:
+            current_id = stack.pop()
+            node = self.nodes.get(current_id)
+            if node is None:
+                continue
+            yield node
+            stack.extend(self.children.get(current_id, set()))
+
+    async def fetch(self, filter: str = None) -> List[Node]:
+        """ get all nodes below parent (paged, pages are requested concurrently) """
+        first_page = await self.nodes_adapter.search_nodes(search='*', parent_id=self.parent_id, depth_level=-1, filter=filter,
+                                                           limit=INDEX_PAGE_SIZE)
+        items = list(first_page.items)
+        total = first_page.range.total
+
+        if total > INDEX_PAGE_SIZE:
+            page_reqs = [self.nodes_adapter.search_nodes(search='*', parent_id=self.parent_id, depth_level=-1, filter=filter,
+                                                         limit=INDEX_PAGE_SIZE, offset=offset)
+                         for offset in range(INDEX_PAGE_SIZE, total, INDEX_PAGE_SIZE)]
+            for page in await gather_bounded(page_reqs, limit=self.concurrency):
+                items.extend(page.items)
+
+        return items
+
+    async def load(self) -> None:
+        """ load all nodes below parent (full listing) """
+        started_at = datetime.now(timezone.utc)
+
+        items = await self.fetch()
+
+        self.clear()
+        if self.parent_id:
+            self.add(await self.nodes_adapter.get_node(node_id=self.parent_id))
+        for node in items:
+            self.add(node)
+
+        self.refreshed_at = started_at
+        self.loaded_at = started_at
+        self.logger.info("Indexed %s node(s).", len(self.nodes))
+
+    async def refresh(self, full: bool = False) -> int:
+        """ 
+        update nodes changed since last load / refresh - returns number of updated nodes
+        full refresh (all nodes, removes deleted nodes) if requested or due (full_refresh_interval)
+        """
+        if self.refreshed_at is None:
+            await self.load()
+            return len(self.nodes)
+
+        started_at = datetime.now(timezone.utc)
+
+        if self.loaded_at is None or started_at - self.loaded_at >= self.full_refresh_interval:
+            full = True
+
+        if full:
+            items = await self.fetch()
+            node_ids = {node.id for node in items}
+            if self.parent_id:
+                node_ids.add(self.parent_id)
+            # deleted nodes (and nodes moved out of parent)
+            removed = [node_id for node_id in self.nodes if node_id not in node_ids]
+            for node_id in removed:
+                self.remove(node_id)
+            if removed:
+                self.logger.info("Removed %s deleted node(s).", len(removed))
+        else:
+            since = (self.refreshed_at - INDEX_REFRESH_OVERLAP).strftime('%Y-%m-%d')
+            items = await self.fetch(filter=f'updatedAt:ge:{since}')
+
+        for node in items:
+            self.add(node)
+
+        self.refreshed_at = started_at
+        if full:
+            self.loaded_at = started_at
+        self.logger.info("Refreshed %s node(s).", len(items))
+
+        return len(items)
+
+    def save(self, db_path: str) -> None:
+        """ persist index to SQLite database """
+        db = sqlite3.connect(db_path)
+        with db:
+            db.execute('CREATE TABLE IF NOT EXISTS nodes (id INTEGER PRIMARY KEY, parent_id INTEGER, path TEXT, node TEXT)')
+            db.execute('CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)')
+            db.execute('DELETE FROM nodes')
+            db.executemany('INSERT INTO nodes (id, parent_id, path, node) VALUES (?, ?, ?, ?)',
+                           ((node.id, node.parentId, self.node_paths.get(node.id), node.model_dump_json(exclude_unset=True)) 
+                            for node in self.nodes.values()))
+            refreshed_at = self.refreshed_at.isoformat() if self.refreshed_at else ''
+            loaded_at = self.loaded_at.isoformat() if self.loaded_at else ''
+            db.executemany('INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)', 
+                           [('parent_id', str(self.parent_id)), ('refreshed_at', refreshed_at), ('loaded_at', loaded_at)])
+        db.close()
+
+        self.logger.info("Saved %s node(s) to index database.", len(self.nodes))
+
+    def restore(self, db_path: str) -> None:
+        """ load index from SQLite database (use refresh() to get changes since) """
+        db = sqlite3.connect(db_path)
+        with db:
+            meta = dict(db.execute('SELECT key, value FROM meta').fetchall())
+            rows = db.execute('SELECT path, node FROM nodes').fetchall()
+        db.close()
+
+        self.clear()
+        self.parent_id = int(meta.get('parent_id', self.parent_id))
+
+        for path, node_json in rows:
+            node = Node(**json.loads(node_json))
+            self.add(node)
+            # stored path is current (parentPath of nodes below moved nodes is not)
+            if path is not None and self.node_paths.get(node.id) != path:
+                self.set_path(node.id, path)
+
+        if meta.get('refreshed_at'):
+            self.refreshed_at = datetime.fromisoformat(meta['refreshed_at'])
+        if meta.get('loaded_at'):
+            self.loaded_at = datetime.fromisoformat(meta['loaded_at'])
+
+        self.logger.info("Restored %s node(s) from index database.", len(self.nodes))
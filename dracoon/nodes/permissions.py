@@ -0,0 +1,152 @@
+"""
+Room permission engine for DRACOON nodes adapter
+
+Reconciles room permissions with a desired state (room -> users / groups -> permissions):
+the current permissions of all rooms are fetched concurrently, a minimal diff is
+computed per room and only required update and delete requests are sent
+(all changes of a room in as few requests as possible).
+
+Desired state:
+
+    {room_id: {'users': {user_id: Permissions, ...}, 'groups': {group_id: Permissions or None (remove), ...}}}
+
+"""
+
+import logging
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from dracoon.concurrency import DEFAULT_CONCURRENCY, gather_bounded
+from .models import Permissions, UpdateRoomGroupItem, UpdateRoomGroups, UpdateRoomUserItem, UpdateRoomUsers
+
+# maximum items per list request
+PERMISSIONS_PAGE_SIZE = 500
+# maximum items per update / delete request
+PERMISSIONS_BATCH_SIZE = 500
+
+RoomPermissions = Dict[str, Dict[int, Optional[Permissions]]]
+
+
+@dataclass
+class RoomPermissionDiff:
+    """ required changes of room permissions """
+    room_id: int
+    update_users: List[UpdateRoomUserItem] = field(default_factory=list)
+    delete_users: List[int] = field(default_factory=list)
+    update_groups: List[UpdateRoomGroupItem] = field(default_factory=list)
+    delete_groups: List[int] = field(default_factory=list)
+    error: Optional[Exception] = None
+
+    @property
+    def is_empty(self) -> bool:
+        return not (self.update_users or self.delete_users or self.update_groups or self.delete_groups)
+
+
+class RoomPermissionEngine:
+    """ apply desired room permissions (diff against current permissions) """
+
+    def __init__(self, nodes_adapter, concurrency: int = DEFAULT_CONCURRENCY, prune: bool = False,
+                 batch_size: int = PERMISSIONS_BATCH_SIZE):
+        """ prune: remove users and groups not contained in desired state of a room """
+        self.logger = logging.getLogger('dracoon.nodes.permissions')
+        self.nodes_adapter = nodes_adapter
+        self.concurrency = concurrency
+        self.prune = prune
+        self.batch_size = batch_size
+
+    async def get_all(self, get_fn, room_id: int) -> list:
+        """ get all granted users / groups of a room (paged, pages are requested concurrently) """
+        first_page = await get_fn(room_id=room_id, filter='isGranted:eq:true', limit=PERMISSIONS_PAGE_SIZE)
+        items = list(first_page.items)
+        total = first_page.range.total
+
+        if total > PERMISSIONS_PAGE_SIZE:
+            page_reqs = [get_fn(room_id=room_id, filter='isGranted:eq:true', limit=PERMISSIONS_PAGE_SIZE, offset=offset)
+                         for offset in range(PERMISSIONS_PAGE_SIZE, total, PERMISSIONS_PAGE_SIZE)]
+            for page in await gather_bounded(page_reqs, limit=self.concurrency):
+                items.extend(page.items)
+
+        return items
+
+    async def get_room_permissions(self, room_id: int) -> RoomPermissions:
+        """ get current permissions of a room (users and groups) """
+        users = await self.get_all(self.nodes_adapter.get_room_users, room_id)
+        groups = await self.get_all(self.nodes_adapter.get_room_groups, room_id)
+
+        return {
+            'users': {user.userInfo.id: user.permissions for user in users},
+            'groups': {group.id: group.permissions for group in groups}
+        }
+
+    async def fetch(self, room_ids: List[int]) -> Dict[int, RoomPermissions]:
+        """ get current permissions of rooms (concurrently) """
+        permissions = await gather_bounded([self.get_room_permissions(room_id) for room_id in room_ids], limit=self.concurrency)
+        return dict(zip(room_ids, permissions))
+
+    def diff(self, room_id: int, current: RoomPermissions, desired: RoomPermissions) -> RoomPermissionDiff:
+        """ compute required changes of a room """
+        room_diff = RoomPermissionDiff(room_id=room_id)
+
+        for principals, update_items, delete_ids, item_type in (('users', room_diff.update_users, room_diff.delete_users, UpdateRoomUserItem),
+                                                                ('groups', room_diff.update_groups, room_diff.delete_groups, UpdateRoomGroupItem)):
+            current_permissions = current.get(principals, {})
+            desired_permissions = desired.get(principals, {})
+
+            for principal_id, permissions in desired_permissions.items():
+                if permissions is None:
+                    if principal_id in current_permissions:
+                        delete_ids.append(principal_id)
+                elif current_permissions.get(principal_id) != permissions:
+                    update_items.append(item_type(id=principal_id, permissions=permissions))
+
+            if self.prune:
+                delete_ids.extend(principal_id for principal_id in current_permissions if principal_id not in desired_permissions)
+
+        return room_diff
+
+    async def plan(self, desired: Dict[int, RoomPermissions]) -> List[RoomPermissionDiff]:
+        """ get required changes of all rooms (rooms without changes are omitted) """
+        room_ids = list(desired)
+        current = await self.fetch(room_ids)
+
+        room_diffs = [self.diff(room_id, current[room_id], desired[room_id]) for room_id in room_ids]
+        room_diffs = [room_diff for room_diff in room_diffs if not room_diff.is_empty]
+
+        self.logger.info("Rooms with permission changes: %s of %s", len(room_diffs), len(room_ids))
+        return room_diffs
+
+    def batches(self, items: list) -> List[list]:
+        return [items[i:i + self.batch_size] for i in range(0, len(items), self.batch_size)]
+
+    async def apply_diff(self, room_diff: RoomPermissionDiff) -> RoomPermissionDiff:
+        """ apply changes of a room (updates first - room keeps a room admin) """
+        room_id = room_diff.room_id
+
+        try:
+            for batch in self.batches(room_diff.update_users):
+                await self.nodes_adapter.update_room_users(room_id=room_id, users_update=UpdateRoomUsers(items=batch), raise_on_err=True)
+            for batch in self.batches(room_diff.update_groups):
+                await self.nodes_adapter.update_room_groups(room_id=room_id, groups_update=UpdateRoomGroups(items=batch), raise_on_err=True)
+            for batch in self.batches(room_diff.delete_users):
+                await self.nodes_adapter.delete_room_users(room_id=room_id, user_list=batch, raise_on_err=True)
+            for batch in self.batches(room_diff.delete_groups):
+                await self.nodes_adapter.delete_room_groups(room_id=room_id, group_list=batch, raise_on_err=True)
+        except Exception as e:
+            self.logger.error("Applying permissions failed for room %s.", room_id)
+            room_diff.error = e
+
+        return room_diff
+
+    async def apply(self, desired: Dict[int, RoomPermissions], dry_run: bool = False) -> List[RoomPermissionDiff]:
+        """ apply desired permissions - returns changes per room (failed rooms with error) """
+        room_diffs = await self.plan(desired)
+
+        if dry_run:
+            return room_diffs
+
+        room_diffs = await gather_bounded([self.apply_diff(room_diff) for room_diff in room_diffs], limit=self.concurrency)
+
+        failed = len([room_diff for room_diff in room_diffs if room_diff.error is not None])
+        self.logger.info("Applied permission changes: %s room(s), %s failed.", len(room_diffs) - failed, failed)
+
+        return room_diffs
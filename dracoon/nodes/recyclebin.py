@@ -0,0 +1,219 @@
+"""
+Recycle bin scanner for DRACOON nodes adapter
+
+Scans the recycle bins of many rooms concurrently: deleted node summaries of all
+rooms are requested first, then the deleted versions of all summaries (one flat
+list of requests - at most <concurrency> requests at the same time).
+Deleted versions can be aggregated by age (and size) and selected with predicates
+to be purged or restored in batches (as few requests as possible).
+
+Predicates are called with a deleted version (DeletedNode):
+
+    recycle_bin = RecycleBin(dracoon.nodes)
+    scan = await recycle_bin.scan(room_ids=[1, 2, 3])
+    buckets = scan.aggregate()
+    results = await recycle_bin.purge(scan.select([is_deleted_before(timedelta(days=90))]))
+
+"""
+
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from dracoon.concurrency import DEFAULT_CONCURRENCY, gather_bounded
+from .responses import DeletedNode, DeletedNodeSummary
+
+# maximum items per list request
+RECYCLEBIN_PAGE_SIZE = 500
+# maximum deleted node ids per purge / restore request
+RECYCLEBIN_BATCH_SIZE = 500
+# age ranges of aggregation (deleted at least <age> ago)
+RECYCLEBIN_AGES = [timedelta(0), timedelta(days=7), timedelta(days=30), timedelta(days=90), timedelta(days=365)]
+
+DeletedNodePredicate = Callable[[DeletedNode], bool]
+
+
+def as_utc(value: datetime) -> datetime:
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+def is_deleted_before(age: timedelta, now: datetime = None) -> DeletedNodePredicate:
+    """ version deleted at least <age> ago """
+    threshold = as_utc(now or datetime.now(timezone.utc)) - age
+    return lambda node: node.deletedAt is not None and as_utc(node.deletedAt) <= threshold
+
+
+def is_larger_than(size: int) -> DeletedNodePredicate:
+    """ version larger than <size> bytes """
+    return lambda node: (node.size or 0) > size
+
+
+def is_deleted_by(user_ids: Iterable[int]) -> DeletedNodePredicate:
+    """ version deleted by one of the users """
+    user_ids = set(user_ids)
+    return lambda node: node.deletedBy is not None and node.deletedBy.id in user_ids
+
+
+@dataclass
+class RecycleBinBucket:
+    """ deleted versions of an age range (deleted at least min_age, less than max_age ago) """
+    min_age: timedelta
+    max_age: Optional[timedelta] = None
+    count: int = 0
+    size: int = 0
+
+
+@dataclass
+class RecycleBinScan:
+    """ deleted versions per room (rooms failed to scan with error) """
+    versions: Dict[int, List[DeletedNode]] = field(default_factory=dict)
+    errors: Dict[int, Exception] = field(default_factory=dict)
+
+    @property
+    def count(self) -> int:
+        return sum(len(versions) for versions in self.versions.values())
+
+    @property
+    def size(self) -> int:
+        return sum(node.size or 0 for versions in self.versions.values() for node in versions)
+
+    def aggregate(self, ages: List[timedelta] = None, now: datetime = None) -> List[RecycleBinBucket]:
+        """ count and size of deleted versions per age range """
+        ages = sorted(ages if ages is not None else RECYCLEBIN_AGES)
+        if not ages or ages[0] > timedelta(0):
+            ages.insert(0, timedelta(0))
+        now = as_utc(now or datetime.now(timezone.utc))
+
+        buckets = [RecycleBinBucket(min_age=min_age, max_age=max_age) for min_age, max_age in zip(ages, ages[1:] + [None])]
+
+        for versions in self.versions.values():
+            for node in versions:
+                age = now - as_utc(node.deletedAt) if node.deletedAt is not None else timedelta(0)
+                bucket = next((bucket for bucket in reversed(buckets) if age >= bucket.min_age), buckets[0])
+                bucket.count += 1
+                bucket.size += node.size or 0
+
+        return buckets
+
+    def select(self, predicates: List[DeletedNodePredicate]) -> List[DeletedNode]:
+        """ get all versions matching all predicates """
+        return [node for versions in self.versions.values() for node in versions if all(predicate(node) for predicate in predicates)]
+
+
+@dataclass
+class RecycleBinBatchResult:
+    """ result of a purge / restore request (deleted node ids of batch, error if failed) """
+    ids: List[int]
+    error: Optional[Exception] = None
+
+
+class RecycleBin:
+    """ scan recycle bins of rooms concurrently and purge or restore deleted versions in batches """
+
+    def __init__(self, nodes_adapter, concurrency: int = DEFAULT_CONCURRENCY, batch_size: int = RECYCLEBIN_BATCH_SIZE):
+        self.logger = logging.getLogger('dracoon.nodes.recyclebin')
+        self.nodes_adapter = nodes_adapter
+        self.concurrency = concurrency
+        self.batch_size = batch_size
+
+    async def get_all(self, get_fn, **kwargs) -> list:
+        """ get all items of a list request (paged, pages are requested concurrently) """
+        first_page = await get_fn(limit=RECYCLEBIN_PAGE_SIZE, raise_on_err=True, **kwargs)
+        items = list(first_page.items)
+        total = first_page.range.total
+
+        if total > RECYCLEBIN_PAGE_SIZE:
+            page_reqs = [get_fn(offset=offset, limit=RECYCLEBIN_PAGE_SIZE, raise_on_err=True, **kwargs)
+                         for offset in range(RECYCLEBIN_PAGE_SIZE, total, RECYCLEBIN_PAGE_SIZE)]
+            for page in await gather_bounded(page_reqs, limit=self.concurrency):
+                items.extend(page.items)
+
+        return items
+
+    async def get_summaries(self, room_id: int) -> List[DeletedNodeSummary]:
+        """ get all deleted node summaries of a room (one per name and type) """
+        return await self.get_all(self.nodes_adapter.get_deleted_nodes, parent_id=room_id)
+
+    async def get_versions(self, summary: DeletedNodeSummary) -> List[DeletedNode]:
+        """ get all deleted versions of a summary """
+        return await self.get_all(self.nodes_adapter.get_node_versions, parent_id=summary.parentId, name=summary.name,
+                                  type=summary.type)
+
+    async def scan(self, room_ids: Iterable[int]) -> RecycleBinScan:
+        """ get deleted versions of all rooms (failed rooms are returned with error) """
+        room_ids = list(dict.fromkeys(room_ids))
+        scan = RecycleBinScan()
+
+        summaries = await gather_bounded([self.get_summaries(room_id) for room_id in room_ids], limit=self.concurrency,
+                                         return_exceptions=True)
+
+        # versions of all rooms in one list of requests
+        version_reqs: List[Tuple[int, DeletedNodeSummary]] = []
+        for room_id, room_summaries in zip(room_ids, summaries):
+            if isinstance(room_summaries, Exception):
+                self.logger.error("Scanning recycle bin of room %s failed.", room_id)
+                scan.errors[room_id] = room_summaries
+                continue
+            scan.versions[room_id] = []
+            version_reqs.extend((room_id, summary) for summary in room_summaries)
+
+        versions = await gather_bounded([self.get_versions(summary) for _, summary in version_reqs], limit=self.concurrency,
+                                        return_exceptions=True)
+
+        for (room_id, _), summary_versions in zip(version_reqs, versions):
+            if room_id in scan.errors:
+                continue
+            if isinstance(summary_versions, Exception):
+                self.logger.error("Scanning recycle bin of room %s failed.", room_id)
+                scan.errors[room_id] = summary_versions
+                del scan.versions[room_id]
+                continue
+            scan.versions[room_id].extend(summary_versions)
+
+        self.logger.info("Scanned %s recycle bin(s): %s deleted version(s), %s bytes.", len(scan.versions), scan.count, scan.size)
+        return scan
+
+    def batches(self, ids: List[int]) -> List[List[int]]:
+        return [ids[i:i + self.batch_size] for i in range(0, len(ids), self.batch_size)]
+
+    async def run_batches(self, request_fn, ids: Iterable[int]) -> List[RecycleBinBatchResult]:
+        """ send a request per batch of ids (concurrently) - failed batches are returned with error """
+        ids = list(dict.fromkeys(ids))
+
+        async def run_batch(batch: List[int]) -> RecycleBinBatchResult:
+            try:
+                await request_fn(batch)
+            except Exception as e:
+                self.logger.error("Recycle bin request failed for %s deleted node(s).", len(batch))
+                return RecycleBinBatchResult(ids=batch, error=e)
+            return RecycleBinBatchResult(ids=batch)
+
+        results = await gather_bounded([run_batch(batch) for batch in self.batches(ids)], limit=self.concurrency)
+
+        failed = sum(len(result.ids) for result in results if result.error is not None)
+        self.logger.info("Processed %s deleted node(s), %s failed.", len(ids) - failed, failed)
+        return results
+
+    async def purge(self, deleted_nodes: Iterable[DeletedNode]) -> List[RecycleBinBatchResult]:
+        """ delete versions from recycle bin in batches """
+        return await self.run_batches(lambda batch: self.nodes_adapter.empty_recyclebin(node_list=batch, raise_on_err=True),
+                                      [node.id for node in deleted_nodes if node.id is not None])
+
+    async def restore(self, deleted_nodes: Iterable[DeletedNode], resolution_strategy: str = None, keep_share_links: bool = None,
+                      parent_id: int = None) -> List[RecycleBinBatchResult]:
+        """ restore versions in batches (see make_node_restore()) """
+        return await self.run_batches(lambda batch: self.nodes_adapter.restore_nodes(restore=self.nodes_adapter.make_node_restore(
+            deleted_node_list=batch, resolution_strategy=resolution_strategy, keep_share_links=keep_share_links, parent_id=parent_id),
+            raise_on_err=True), [node.id for node in deleted_nodes if node.id is not None])
+
+    async def empty_rooms(self, room_ids: Iterable[int]) -> Dict[int, Optional[Exception]]:
+        """ empty complete recycle bins of rooms concurrently (no scan required) - returns error per room """
+        room_ids = list(dict.fromkeys(room_ids))
+        results = await gather_bounded([self.nodes_adapter.empty_node_recyclebin(parent_id=room_id, raise_on_err=True)
+                                        for room_id in room_ids], limit=self.concurrency, return_exceptions=True)
+
+        errors = {room_id: result if isinstance(result, Exception) else None for room_id, result in zip(room_ids, results)}
+        self.logger.info("Emptied %s recycle bin(s), %s failed.", len([e for e in errors.values() if e is None]),
+                         len([e for e in errors.values() if e is not None]))
+        return errors
@@ -0,0 +1,247 @@
+"""
+File key rekey engine for DRACOON nodes adapter
+
+Sets missing file keys in bulk (e.g. migration of a user from RSA-2048 to RSA-4096:
+file keys are encrypted with the previous user key). Missing file keys are
+requested page by page (get_missing_file_keys with use_key), decrypted and
+encrypted with the public key of the user in worker processes and uploaded
+in batches (set_file_keys, concurrently).
+
+Progress is stored in a checkpoint: failed file keys are skipped after a restart
+(set file keys are no longer returned as missing - keys still returned are skipped).
+
+Worker processes are spawned: the calling script requires a main guard
+(if __name__ == '__main__') - use processes=0 otherwise.
+
+    rekey = FileKeyRekey(dracoon.nodes, plain_keypair=previous_keypair, use_key='previous_user_key', user_id=user_id,
+                         checkpoint_path='rekey.json')
+    summary = await rekey.run()
+
+"""
+
+import asyncio
+import json
+import logging
+import multiprocessing
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Set, Tuple
+
+from dracoon.concurrency import DEFAULT_CONCURRENCY, gather_bounded
+from dracoon.crypto import decrypt_file_key, encrypt_file_key_public, load_private_key
+from dracoon.crypto.models import FileKey, PlainUserKeyPairContainer, PublicKeyContainer
+from dracoon.errors import InvalidArgumentError
+from .models import MissingKeysResponse, SetFileKeys, SetFileKeysItem
+
+# missing file keys per request
+REKEY_PAGE_SIZE = 500
+# file keys per set_file_keys request
+REKEY_BATCH_SIZE = 100
+
+USE_KEYS = ['room_rescue_key', 'system_rescue_key', 'previous_user_key', 'previous_room_rescue_key', 'previous_system_rescue_key']
+
+# (file id, user id, encrypted file key, public key of user)
+RekeyItem = Tuple[int, int, FileKey, PublicKeyContainer]
+# (file id, user id, new file key, error)
+RekeyResult = Tuple[int, int, Optional[FileKey], Optional[str]]
+
+# keypair of worker process (set by init_rekey_worker)
+rekey_state: Dict[str, PlainUserKeyPairContainer] = {}
+
+
+def init_rekey_worker(plain_keypair: PlainUserKeyPairContainer) -> None:
+    """ keypair is sent once per worker process """
+    rekey_state['keypair'] = plain_keypair
+
+
+def rekey_items(items: List[RekeyItem], plain_keypair: PlainUserKeyPairContainer = None) -> List[RekeyResult]:
+    """ decrypt file keys and encrypt them with public key of user (runs in worker process) """
+    plain_keypair = plain_keypair or rekey_state['keypair']
+    # private key is parsed once per chunk
+    private_key = load_private_key(plain_keypair.privateKeyContainer.privateKey)
+    results = []
+
+    for file_id, user_id, file_key, public_key in items:
+        try:
+            plain_file_key = decrypt_file_key(file_key=file_key, keypair=plain_keypair, private_key=private_key)
+            results.append((file_id, user_id, encrypt_file_key_public(plain_file_key=plain_file_key, public_key=public_key), None))
+        except Exception as e:
+            results.append((file_id, user_id, None, str(e) or type(e).__name__))
+
+    return results
+
+
+class FileKeyRekey:
+    """ set missing file keys in bulk (crypto in worker processes, batched uploads, checkpoint) """
+
+    def __init__(self, nodes_adapter, plain_keypair: PlainUserKeyPairContainer, use_key: str = 'previous_user_key', user_id: int = None,
+                 room_id: int = None, processes: int = None, batch_size: int = REKEY_BATCH_SIZE, concurrency: int = DEFAULT_CONCURRENCY,
+                 checkpoint_path: str = None):
+        """ plain_keypair: keypair of use_key (e.g. previous user keypair) - processes: 0 runs crypto in a thread """
+        if use_key is not None and use_key not in USE_KEYS:
+            raise InvalidArgumentError(message=f'Unsupported key: {use_key}')
+
+        self.logger = logging.getLogger('dracoon.nodes.rekey')
+        self.nodes_adapter = nodes_adapter
+        self.plain_keypair = plain_keypair
+        self.use_key = use_key
+        self.user_id = user_id
+        self.room_id = room_id
+        self.processes = processes if processes is not None else (os.cpu_count() or 1)
+        self.batch_size = batch_size
+        self.concurrency = concurrency
+        self.checkpoint_path = checkpoint_path
+        self.executor: ProcessPoolExecutor = None
+
+        self.rekeyed = 0
+        # file keys not set - (file id, user id) -> error
+        self.failed: Dict[Tuple[int, int], str] = {}
+        # file keys set in this run - (file id, user id)
+        self.done: Set[Tuple[int, int]] = set()
+
+    def load_checkpoint(self) -> None:
+        """ load progress of a previous run """
+        if not self.checkpoint_path:
+            return
+        try:
+            with open(self.checkpoint_path, 'r') as checkpoint_file:
+                checkpoint = json.load(checkpoint_file)
+        except FileNotFoundError:
+            return
+
+        self.rekeyed = checkpoint['rekeyed']
+        self.failed = {(file_id, user_id): error for file_id, user_id, error in checkpoint['failed']}
+
+    def save_checkpoint(self) -> None:
+        """ persist progress """
+        if not self.checkpoint_path:
+            return
+
+        checkpoint = {
+            'rekeyed': self.rekeyed,
+            'failed': [[file_id, user_id, error] for (file_id, user_id), error in self.failed.items()]
+        }
+
+        # replace file atomically
+        directory = os.path.dirname(os.path.abspath(self.checkpoint_path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.dracoon-')
+        try:
+            with os.fdopen(fd, 'w') as tmp_file:
+                json.dump(checkpoint, tmp_file)
+            os.replace(tmp_path, self.checkpoint_path)
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def get_items(self, missing_keys: MissingKeysResponse) -> List[RekeyItem]:
+        """ get file key and public key of all missing file keys (failed and already set keys skipped) """
+        file_keys = {file.id: file.fileKeyContainer for file in missing_keys.files}
+        public_keys = {user.id: user.publicKeyContainer for user in missing_keys.users}
+        items = []
+
+        for item in missing_keys.items:
+            if (item.fileId, item.userId) in self.failed or (item.fileId, item.userId) in self.done:
+                continue
+            if item.fileId not in file_keys or item.userId not in public_keys:
+                self.failed[(item.fileId, item.userId)] = 'Missing file key or public key.'
+                continue
+            items.append((item.fileId, item.userId, file_keys[item.fileId], public_keys[item.userId]))
+
+        return items
+
+    async def rekey(self, items: List[RekeyItem]) -> List[RekeyResult]:
+        """ encrypt file keys for users (split across worker processes) """
+        if not items:
+            return []
+
+        if not self.processes:
+            return await asyncio.to_thread(rekey_items, items, self.plain_keypair)
+
+        if self.executor is None:
+            # no fork of running event loop
+            self.executor = ProcessPoolExecutor(max_workers=self.processes, mp_context=multiprocessing.get_context('spawn'),
+                                                initializer=init_rekey_worker, initargs=(self.plain_keypair,))
+
+        loop = asyncio.get_running_loop()
+        chunk_size = -(-len(items) // self.processes)
+        chunks = [items[i:i + chunk_size] for i in range(0, len(items), chunk_size)]
+        chunk_results = await asyncio.gather(*[loop.run_in_executor(self.executor, rekey_items, chunk) for chunk in chunks])
+
+        return [result for chunk_result in chunk_results for result in chunk_result]
+
+    async def upload(self, batch: List[SetFileKeysItem]) -> Optional[Exception]:
+        """ set file keys of a batch - returns error if failed """
+        try:
+            await self.nodes_adapter.set_file_keys(file_keys=SetFileKeys(items=batch), raise_on_err=True)
+        except Exception as e:
+            self.logger.error("Setting file keys failed for %s file key(s).", len(batch))
+            return e
+        return None
+
+    async def process_page(self, missing_keys: MissingKeysResponse) -> int:
+        """ set missing file keys of a page - returns number of keys still missing (failed or already set) """
+        # keys set before are still returned as missing (not rekeyed again)
+        stale = len([item for item in missing_keys.items if (item.fileId, item.userId) in self.done])
+        if stale:
+            self.logger.warning("%s file key(s) still missing after setting them.", stale)
+
+        items = self.get_items(missing_keys)
+        results = await self.rekey(items)
+
+        keys = []
+        for file_id, user_id, file_key, error in results:
+            if error is not None:
+                self.failed[(file_id, user_id)] = error
+            else:
+                keys.append(SetFileKeysItem(fileId=file_id, userId=user_id, fileKey=file_key))
+
+        batches = [keys[i:i + self.batch_size] for i in range(0, len(keys), self.batch_size)]
+        errors = await gather_bounded([self.upload(batch) for batch in batches], limit=self.concurrency)
+
+        for batch, error in zip(batches, errors):
+            if error is None:
+                self.rekeyed += len(batch)
+                self.done.update((key.fileId, key.userId) for key in batch)
+                continue
+            for key in batch:
+                self.failed[(key.fileId, key.userId)] = getattr(error, 'message', None) or str(error)
+
+        return stale + len([item for item in missing_keys.items if (item.fileId, item.userId) in self.failed])
+
+    async def run(self, retry_failed: bool = False) -> Dict[str, int]:
+        """ set all missing file keys - returns number of rekeyed and failed file keys """
+        self.load_checkpoint()
+        if retry_failed:
+            self.failed = {}
+
+        # set file keys are no longer missing - only failed (or still returned) keys are skipped with offset
+        offset = 0
+        self.done = set()
+        previous_keys: List[Tuple[int, int]] = []
+
+        try:
+            while True:
+                missing_keys = await self.nodes_adapter.get_missing_file_keys(user_id=self.user_id, room_id=self.room_id, use_key=self.use_key,
+                                                                              offset=offset, limit=REKEY_PAGE_SIZE, raise_on_err=True)
+                if not missing_keys.items:
+                    break
+
+                # no progress: same page again without any new key
+                keys = [(item.fileId, item.userId) for item in missing_keys.items]
+                if keys == previous_keys and all(key in self.done or key in self.failed for key in keys):
+                    self.logger.warning("Missing file keys unchanged at offset %s - stopped.", offset)
+                    break
+                previous_keys = keys
+
+                offset += await self.process_page(missing_keys)
+                self.save_checkpoint()
+                self.logger.info("Rekeyed %s file key(s), %s failed.", self.rekeyed, len(self.failed))
+        finally:
+            if self.executor is not None:
+                executor = self.executor
+                self.executor = None
+                await asyncio.get_running_loop().run_in_executor(None, executor.shutdown)
+
+        return {'rekeyed': self.rekeyed, 'failed': len(self.failed)}
@@ -0,0 +1,165 @@
+"""
+Completion watcher for asynchronous DRACOON operations
+
+Tracks many pending operations (e.g. S3 uploads) in one shared poller.
+Every pending key is polled on its own capped, jittered schedule and
+waiting callers are resolved as soon as the status is final.
+
+"""
+
+import asyncio
+import logging
+import random
+from typing import Any, Awaitable, Callable, Dict, Iterable, List
+
+from dracoon.concurrency import DEFAULT_CONCURRENCY, gather_bounded
+
+# initial wait before polling a new key (in seconds)
+MIN_POLL_WAIT = 0.1
+# maximum wait between two status requests of the same key (in seconds)
+MAX_POLL_WAIT = 5
+# random deviation of each wait (fraction of wait)
+POLL_JITTER = 0.2
+
+
+class CompletionWatcher:
+    """ poll status of pending operations until complete and resolve waiting callers """
+
+    def __init__(self, check_fn: Callable[[str], Awaitable[Any]], is_complete: Callable[[Any], bool],
+                 min_wait: float = MIN_POLL_WAIT, max_wait: float = MAX_POLL_WAIT, jitter: float = POLL_JITTER,
+                 concurrency: int = DEFAULT_CONCURRENCY):
+
+        self.logger = logging.getLogger('dracoon.polling')
+        self.check_fn = check_fn
+        self.is_complete = is_complete
+        self.min_wait = min_wait
+        self.max_wait = max_wait
+        self.jitter = jitter
+        self.concurrency = concurrency
+
+        self.waiters: Dict[str, asyncio.Future] = {}
+        self.schedule: Dict[str, float] = {}
+        self.waits: Dict[str, float] = {}
+        self.poller: asyncio.Task = None
+        self.wakeup: asyncio.Event = None
+
+    @property
+    def pending(self) -> int:
+        """ number of pending keys """
+        return len(self.waiters)
+
+    def next_wait(self, wait: float) -> float:
+        """ get wait (capped and jittered) """
+        wait = min(wait, self.max_wait)
+        return wait * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+    def watch(self, key: str) -> asyncio.Future:
+        """ register key to watch - returns future resolved with final status """
+        loop = asyncio.get_running_loop()
+
+        # pending keys of a previous (closed) event loop cannot be resolved
+        if self.poller is not None and self.poller.get_loop() is not loop:
+            self.waiters.clear()
+            self.schedule.clear()
+            self.waits.clear()
+            self.poller = None
+
+        if key in self.waiters:
+            return self.waiters[key]
+
+        future = loop.create_future()
+        self.waiters[key] = future
+        self.waits[key] = self.min_wait
+        self.schedule[key] = loop.time() + self.next_wait(self.min_wait)
+
+        if self.poller is None or self.poller.done():
+            self.wakeup = asyncio.Event()
+            self.poller = loop.create_task(self.poll())
+        else:
+            self.wakeup.set()
+
+        return future
+
+    async def wait(self, key: str) -> Any:
+        """ wait for final status of a key """
+        return await asyncio.shield(self.watch(key))
+
+    async def wait_all(self, keys: Iterable[str]) -> Dict[str, Any]:
+        """ wait for final status of multiple keys """
+        keys = list(dict.fromkeys(keys))
+        results = await asyncio.gather(*[self.wait(key) for key in keys])
+        return dict(zip(keys, results))
+
+    def resolve(self, key: str, result: Any = None, err: Exception = None) -> None:
+        """ resolve waiting callers of a key """
+        future = self.waiters.pop(key)
+        self.schedule.pop(key, None)
+        self.waits.pop(key, None)
+
+        if future.done():
+            return
+        if err is not None:
+            future.set_exception(err)
+        else:
+            future.set_result(result)
+
+    def resolve_all(self, err: Exception = None) -> None:
+        """ resolve all waiting callers with an error (cancelled without error) """
+        for key in list(self.waiters):
+            future = self.waiters[key]
+            if err is None:
+                future.cancel()
+            self.resolve(key=key, err=err)
+
+    async def poll(self) -> None:
+        """ poll all due keys until no key is pending (waiting callers never hang on poller failure) """
+        try:
+            await self.poll_due()
+        except asyncio.CancelledError:
+            self.resolve_all()
+            raise
+        except Exception as e:
+            self.logger.error("Polling failed.")
+            self.resolve_all(err=e)
+
+    async def poll_due(self) -> None:
+        """ poll all due keys until no key is pending """
+        loop = asyncio.get_running_loop()
+
+        while self.waiters:
+            now = loop.time()
+            due: List[str] = [key for key, next_check in self.schedule.items() if next_check <= now]
+
+            if due:
+                results = await gather_bounded([self.check_fn(key) for key in due], limit=self.concurrency, return_exceptions=True)
+
+                for key, result in zip(due, results):
+                    if key not in self.waiters:
+                        continue
+                    if isinstance(result, Exception):
+                        self.resolve(key=key, err=result)
+                        continue
+                    try:
+                        is_complete = self.is_complete(result)
+                    except Exception as e:
+                        self.resolve(key=key, err=e)
+                        continue
+                    if is_complete:
+                        self.resolve(key=key, result=result)
+                    else:
+                        self.waits[key] = min(self.waits[key] * 2, self.max_wait)
+                        self.schedule[key] = loop.time() + self.next_wait(self.waits[key])
+
+                self.logger.debug("Pending: %s", len(self.waiters))
+
+            if not self.waiters:
+                break
+
+            self.wakeup.clear()
+            timeout = max(min(self.schedule.values()) - loop.time(), 0)
+
+            # new keys wake up the poller to reschedule
+            try:
+                await asyncio.wait_for(self.wakeup.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                pass
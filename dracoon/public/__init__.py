@@ -67,7 +67,7 @@ class DRACOONPublic:
             await self.dracoon.handle_http_error(err=e, raise_on_err=raise_on_err)
         
         self.logger.info("Retrieved system info.")
-        return SystemInfo(**res.json())
+        return SystemInfo.model_validate_json(res.content)
     
     @retry(**RETRY_CONFIG)
     async def get_auth_ad_info(self, raise_on_err: bool = False) -> AuthADInfoList:
@@ -87,7 +87,7 @@ class DRACOONPublic:
             self.logger.error("Getting AD auth info failed.")
             await self.dracoon.handle_http_error(err=e, raise_on_err=raise_on_err)
         self.logger.info("Retrieved AD auth info.")
-        return AuthADInfoList(**res.json())
+        return AuthADInfoList.model_validate_json(res.content)
     
     @retry(**RETRY_CONFIG)
     async def get_auth_openid_info(self, raise_on_err: bool = False) -> AuthOIDCInfoList:
@@ -108,4 +108,4 @@ class DRACOONPublic:
             await self.dracoon.handle_http_error(err=e, raise_on_err=raise_on_err)
         
         self.logger.info("Retrieved OIDC auth info.")
-        return AuthOIDCInfoList(**res.json())
\ No newline at end of file
+        return AuthOIDCInfoList.model_validate_json(res.content)
\ No newline at end of file
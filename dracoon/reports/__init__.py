@@ -12,17 +12,31 @@ Please note: maximum 500 items are returned in GET requests
 """
 
 
-from typing import List
+from typing import Dict, Iterable, List, Optional, Set
+import asyncio
 import httpx
 import logging
+import urllib.parse
 
 from datetime import datetime
 from tenacity import retry
 
 from dracoon.client import DRACOONClient, OAuth2ConnectionType, RETRY_CONFIG
-from dracoon.errors import ClientDisconnectedError, InvalidClientError
+from dracoon.concurrency import DEFAULT_CONCURRENCY, gather_bounded
+from dracoon.errors import ClientDisconnectedError, InvalidArgumentError, InvalidClientError
+from dracoon.polling import CompletionWatcher
 from .models import CreateReport, ReportFilter, ReportFormat, ReportSubType, ReportType
-from .responses import ReportList
+from .responses import Report, ReportList, ReportState
+
+# maximum items per list request
+REPORTS_PAGE_SIZE = 500
+# wait between two status requests of a report (in seconds)
+REPORT_POLL_WAIT = 2
+REPORT_MAX_POLL_WAIT = 30
+# report states are requested once for all reports checked within (in seconds)
+REPORT_STATES_TTL = 1
+# states of reports not generated yet (requested with state filter)
+REPORT_PENDING_STATES = [ReportState.waiting, ReportState.processing]
 
 
 class DRACOONReports:
@@ -49,6 +63,23 @@ class DRACOONReports:
             else:
                 self.raise_on_err = False
 
+            # report state is polled by one watcher shared by all adapters of the client
+            # (checks due at the same time share one list request)
+            if "reports" not in self.dracoon.watchers:
+                self.dracoon.watchers["reports"] = CompletionWatcher(
+                    check_fn=lambda report_id: self.check_report(report_id=report_id),
+                    is_complete=self.is_report_complete,
+                    min_wait=REPORT_POLL_WAIT,
+                    max_wait=REPORT_MAX_POLL_WAIT,
+                    concurrency=REPORTS_PAGE_SIZE,
+                )
+            self.report_watcher: CompletionWatcher = self.dracoon.watchers["reports"]
+            self.report_states: Optional[asyncio.Future] = None
+            self.report_states_ids: Set[int] = set()
+            self.report_ids: Set[int] = set()
+            self.report_states_at: float = 0
+            self.report_states_ttl = REPORT_STATES_TTL
+
         else:
             self.logger.error("DRACOON client error: no connection. ")
             raise ClientDisconnectedError(
@@ -58,7 +89,7 @@ class DRACOONReports:
     @retry(**RETRY_CONFIG)
     async def create_report(
         self, report: CreateReport, raise_on_err: bool = False
-    ) -> None:
+    ) -> Optional[Report]:
         """create a new report"""
         payload = report.model_dump(exclude_unset=True)
 
@@ -79,7 +110,9 @@ class DRACOONReports:
             await self.dracoon.handle_http_error(err=e, raise_on_err=raise_on_err)
 
         self.logger.info("Created report.")
-        return None
+        if not res.content:
+            return None
+        return Report.model_validate_json(res.content)
 
     def make_report(
         self,
@@ -155,7 +188,7 @@ class DRACOONReports:
 
         api_url = self.api_url + f"?offset={offset}"
         if name:
-            api_url += f"&name={name}"
+            api_url += f"&name={urllib.parse.quote(name)}"
         if limit != None:
             api_url += f"&limit={str(limit)}"
         if sort != None:
@@ -165,14 +198,14 @@ class DRACOONReports:
         if sub_type != None:
             api_url += f"&subType={sub_type}"
         if enabled != None:
-            api_url += f"&type={str(enabled).lower()}"
+            api_url += f"&enabled={str(enabled).lower()}"
         if has_error != None:
             api_url += f"&hasError={str(has_error).lower()}"
         if state != None:
             api_url += f"&state={state}"
 
         try:
-            res = await self.dracoon.http.get(self.api_url)
+            res = await self.dracoon.http.get(api_url)
 
             res.raise_for_status()
         except httpx.RequestError as e:
@@ -182,7 +215,100 @@ class DRACOONReports:
             await self.dracoon.handle_http_error(err=e, raise_on_err=raise_on_err)
 
         self.logger.info("Retrieved reports.")
-        return ReportList(**res.json())
+        return ReportList.model_validate_json(res.content)
+
+    async def get_all_reports(
+        self, concurrency: int = DEFAULT_CONCURRENCY, **kwargs
+    ) -> List[Report]:
+        """get all reports (paged, pages are requested concurrently) - accepts filters of get_reports()"""
+        first_page = await self.get_reports(limit=REPORTS_PAGE_SIZE, raise_on_err=True, **kwargs)
+        reports = list(first_page.items)
+        total = first_page.pagination.total
+
+        if total > REPORTS_PAGE_SIZE:
+            page_reqs = [
+                self.get_reports(offset=offset, limit=REPORTS_PAGE_SIZE, raise_on_err=True, **kwargs)
+                for offset in range(REPORTS_PAGE_SIZE, total, REPORTS_PAGE_SIZE)
+            ]
+            for page in await gather_bounded(page_reqs, limit=concurrency):
+                reports.extend(page.items)
+
+        return reports
+
+    async def get_report_states(
+        self, report_ids: Iterable[int] = None, concurrency: int = DEFAULT_CONCURRENCY
+    ) -> Dict[int, Report]:
+        """
+        get reports by id (all reports if no ids are passed)
+        pending reports are requested by state, generated reports are searched newest first
+        (stops as soon as all reports are found)
+        """
+        if report_ids is None:
+            return {report.id: report for report in await self.get_all_reports(concurrency=concurrency)}
+
+        report_ids = set(report_ids)
+        pending = await gather_bounded(
+            [self.get_all_reports(state=state.value, concurrency=concurrency) for state in REPORT_PENDING_STATES],
+            limit=concurrency,
+        )
+        reports = {report.id: report for items in pending for report in items if report.id in report_ids}
+
+        offset = 0
+        while not report_ids.issubset(reports):
+            page = await self.get_reports(offset=offset, limit=REPORTS_PAGE_SIZE, sort="created:desc", raise_on_err=True)
+            for report in page.items:
+                if report.id in report_ids and report.id not in reports:
+                    reports[report.id] = report
+            offset += len(page.items)
+            if not page.items or offset >= page.pagination.total:
+                break
+
+        return reports
+
+    async def check_report(self, report_id: int) -> Report:
+        """get state of a report (checks within REPORT_STATES_TTL share one list request)"""
+        now = asyncio.get_running_loop().time()
+        states = self.report_states
+        self.report_ids.add(report_id)
+
+        if (
+            states is None
+            or report_id not in self.report_states_ids
+            or (states.done() and states.exception() is not None)
+            or (states.done() and now - self.report_states_at > self.report_states_ttl)
+        ):
+            self.report_states_ids = set(self.report_ids)
+            states = asyncio.ensure_future(self.get_report_states(report_ids=self.report_states_ids))
+            self.report_states = states
+            self.report_states_at = now
+
+        reports = await asyncio.shield(states)
+
+        if report_id not in reports:
+            self.report_ids.discard(report_id)
+            raise InvalidArgumentError(message=f"Report not found: {report_id}")
+
+        # generated reports are no longer requested
+        if self.is_report_complete(reports[report_id]):
+            self.report_ids.discard(report_id)
+
+        return reports[report_id]
+
+    def is_report_complete(self, report: Report) -> bool:
+        """report is generated (or failed)"""
+        return report.error is not None or report.state in [
+            ReportState.finished,
+            ReportState.canceled,
+        ]
+
+    async def wait_for_report(self, report_id: int) -> Report:
+        """wait until a report is generated (or failed) - state is polled by shared watcher"""
+        return await self.report_watcher.wait(report_id)
+
+    async def wait_for_reports(self, report_ids: List[int]) -> Dict[int, Report]:
+        """wait until multiple reports are generated (or failed) - state is polled by shared watcher"""
+        self.logger.debug("Waiting for reports: %s", len(report_ids))
+        return await self.report_watcher.wait_all(report_ids)
 
     @retry(**RETRY_CONFIG)
     async def delete_reports(
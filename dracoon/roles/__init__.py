@@ -61,7 +61,7 @@ class DRACOONRoles:
             self.logger.error("Getting roles failed.")
             await self.dracoon.handle_http_error(err=e, raise_on_err=raise_on_err)
         
-        return RoleList(**res.json())
+        return RoleList.model_validate_json(res.content)
 
     @retry(**RETRY_CONFIG)
     async def get_groups_with_role(self, role_id: int, raise_on_err: bool = False) -> RoleGroupList:
@@ -82,7 +82,7 @@ class DRACOONRoles:
             self.logger.error("Getting roles failed.")
             await self.dracoon.handle_http_error(err=e, raise_on_err=raise_on_err)
         
-        return RoleGroupList(**res.json())
+        return RoleGroupList.model_validate_json(res.content)
 
     @retry(**RETRY_CONFIG)
     async def assign_groups_to_role(self, role_id: int, groups: GroupIds, raise_on_err: bool = False) -> RoleGroupList:
@@ -105,7 +105,7 @@ class DRACOONRoles:
             self.logger.error("Assigning role failed.")
             await self.dracoon.handle_http_error(err=e, raise_on_err=raise_on_err)
         
-        return RoleGroupList(**res.json())
+        return RoleGroupList.model_validate_json(res.content)
         
 
     @retry(**RETRY_CONFIG)
@@ -129,7 +129,7 @@ class DRACOONRoles:
             self.logger.error("Assigning role failed.")
             await self.dracoon.handle_http_error(err=e, raise_on_err=raise_on_err)
         
-        return RoleGroupList(**res.json())
+        return RoleGroupList.model_validate_json(res.content)
             
     @retry(**RETRY_CONFIG)
     async def get_users_with_role(self, role_id: int, raise_on_err: bool = False) -> RoleUserList:
@@ -150,7 +150,7 @@ class DRACOONRoles:
             self.logger.error("Getting roles failed.")
             await self.dracoon.handle_http_error(err=e, raise_on_err=raise_on_err)
         
-        return RoleUserList(**res.json())
+        return RoleUserList.model_validate_json(res.content)
 
     @retry(**RETRY_CONFIG)
     async def assign_users_to_role(self, role_id: int, users: UserIds, raise_on_err: bool = False) -> RoleUserList:
@@ -173,7 +173,7 @@ class DRACOONRoles:
             self.logger.error("Assigning role failed.")
             await self.dracoon.handle_http_error(err=e, raise_on_err=raise_on_err)
         
-        return RoleUserList(**res.json())
+        return RoleUserList.model_validate_json(res.content)
 
     @retry(**RETRY_CONFIG)
     async def remove_users_from_role(self, role_id: int, users: UserIds, raise_on_err: bool = False) -> RoleUserList:
@@ -196,7 +196,7 @@ class DRACOONRoles:
             self.logger.error("Assigning role failed.")
             await self.dracoon.handle_http_error(err=e, raise_on_err=raise_on_err)
         
-        return RoleUserList(**res.json())
+        return RoleUserList.model_validate_json(res.content)
     
     def make_user_group_ids(self, ids: List[int], is_user: bool = True):
         
@@ -0,0 +1,83 @@
+"""
+JSON serialization for request and response bodies
+
+Uses orjson if installed (optional), otherwise the standard library json module.
+Responses parsed into models are validated directly from the raw bytes
+(pydantic model_validate_json) - no intermediate dict is created.
+
+"""
+
+import json
+import logging
+from datetime import date, datetime, time
+from enum import Enum
+from typing import Any, Callable, Dict
+from uuid import UUID
+
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+logger = logging.getLogger('dracoon.serialization')
+
+JSON_CONTENT_TYPE = 'application/json'
+
+
+def json_default(obj: Any) -> Any:
+    """ encode values not supported by the JSON backend (same output for all backends) """
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(mode='json')
+    if isinstance(obj, (datetime, date, time)):
+        return obj.isoformat()
+    if isinstance(obj, Enum):
+        return obj.value
+    if isinstance(obj, UUID):
+        return str(obj)
+    raise TypeError(f'Object of type {type(obj).__name__} is not JSON serializable')
+
+
+def stdlib_dumps(obj: Any) -> bytes:
+    return json.dumps(obj, default=json_default, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def orjson_dumps(obj: Any) -> bytes:
+    return orjson.dumps(obj, default=json_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+JSON_BACKENDS: Dict[str, Dict[str, Callable]] = {
+    'json': {'loads': json.loads, 'dumps': stdlib_dumps}
+}
+
+if orjson is not None:
+    JSON_BACKENDS['orjson'] = {'loads': orjson.loads, 'dumps': orjson_dumps}
+
+json_backend = 'orjson' if orjson is not None else 'json'
+
+
+def set_json_backend(name: str) -> None:
+    """ set JSON backend ('orjson' or 'json') """
+    global json_backend
+
+    if name not in JSON_BACKENDS:
+        raise ValueError(f'JSON backend not available: {name} (available: {", ".join(JSON_BACKENDS)})')
+
+    json_backend = name
+    logger.debug("JSON backend: %s", name)
+
+
+def get_json_backend() -> str:
+    """ get name of JSON backend in use """
+    return json_backend
+
+
+def json_loads(data: bytes) -> Any:
+    """ decode JSON (bytes or str) """
+    return JSON_BACKENDS[json_backend]['loads'](data)
+
+
+def json_dumps(obj: Any) -> bytes:
+    """ encode JSON (bytes) """
+    return JSON_BACKENDS[json_backend]['dumps'](obj)
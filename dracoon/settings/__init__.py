@@ -70,7 +70,7 @@ class DRACOONSettings:
             await self.dracoon.handle_http_error(err=e, raise_on_err=raise_on_err)
         
         self.logger.info("Retrieved customer settings.")
-        return CustomerSettingsResponse(**res.json())
+        return CustomerSettingsResponse.model_validate_json(res.content)
 
     @retry(**RETRY_CONFIG)
     async def update_settings(self, settings_update: UpdateSettings, raise_on_err: bool = False) -> CustomerSettingsResponse:
@@ -94,7 +94,7 @@ class DRACOONSettings:
             await self.dracoon.handle_http_error(err=e, raise_on_err=raise_on_err)
         
         self.logger.info("Updated customer settings.")
-        return CustomerSettingsResponse(**res.json())
+        return CustomerSettingsResponse.model_validate_json(res.content)
     
     def make_settings_update(self, home_rooms_active: bool = None, home_room_quota: int = None, home_room_parent_name: str = None, raise_on_err: bool = False) -> UpdateSettings:
         """ make a settings update payload required for update_settings() """
@@ -135,7 +135,7 @@ class DRACOONSettings:
             await self.dracoon.handle_http_error(err=e, raise_on_err=raise_on_err)
         
         self.logger.info("Retrieved webhooks.")
-        return WebhookList(**res.json())
+        return WebhookList.model_validate_json(res.content)
 
 
     @retry(**RETRY_CONFIG)
@@ -161,7 +161,7 @@ class DRACOONSettings:
             await self.dracoon.handle_http_error(err=e, raise_on_err=raise_on_err)
         
         self.logger.info("Created webhook.")
-        return Webhook(**res.json())
+        return Webhook.model_validate_json(res.content)
 
     def make_webhook(self, name: str, event_types: List[str], url: str, secret: str = None, 
                      is_enabled: bool = None, trigger_example: bool = None) -> CreateWebhook:
@@ -215,7 +215,7 @@ class DRACOONSettings:
             await self.dracoon.handle_http_error(err=e, raise_on_err=raise_on_err)
         
         self.logger.info("Retrieved webhook.")
-        return Webhook(**res.json())
+        return Webhook.model_validate_json(res.content)
 
     @retry(**RETRY_CONFIG)
     async def update_webhook(self, hook_id: int, hook_update: UpdateWebhook, raise_on_err: bool = False) -> Webhook:
@@ -241,7 +241,7 @@ class DRACOONSettings:
             await self.dracoon.handle_http_error(err=e, raise_on_err=raise_on_err)
         
         self.logger.info("Updated webhook.")
-        return Webhook(**res.json())
+        return Webhook.model_validate_json(res.content)
 
 
     @retry(**RETRY_CONFIG)
@@ -287,4 +287,4 @@ class DRACOONSettings:
             await self.dracoon.handle_http_error(err=e, raise_on_err=raise_on_err)
         
         self.logger.info("Retrieved webhook event types.")
-        return EventTypeList(**res.json())
\ No newline at end of file
+        return EventTypeList.model_validate_json(res.content)
\ No newline at end of file
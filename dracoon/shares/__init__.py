@@ -76,7 +76,7 @@ class DRACOONShares:
             await self.dracoon.handle_http_error(err=e, raise_on_err=raise_on_err)
         
         self.logger.info("Retrieved shares.")
-        return DownloadShareList(**res.json())
+        return DownloadShareList.model_validate_json(res.content)
 
     @retry(**RETRY_CONFIG)
     async def create_share(self, share: CreateShare, raise_on_err: bool = False) -> DownloadShare:
@@ -102,7 +102,7 @@ class DRACOONShares:
             await self.dracoon.handle_http_error(err=e, raise_on_err=raise_on_err)
 
         self.logger.info("Created share.")
-        return DownloadShare(**res.json())
+        return DownloadShare.model_validate_json(res.content)
 
     def make_share(self, node_id: int, name: str = None, password: str = None, expiration: Expiration = None, notes: str = None, internal_notes: str = None, 
                    show_creator: bool = None, show_creator_login: bool = None, max_downloads: int = None, keypair: UserKeyPairContainer = None, file_key: FileKey = None, 
@@ -176,7 +176,7 @@ class DRACOONShares:
             await self.dracoon.handle_http_error(err=e, raise_on_err=raise_on_err)
         
         self.logger.info("Retrieved share.")
-        return DownloadShare(**res.json())
+        return DownloadShare.model_validate_json(res.content)
 
     @retry(**RETRY_CONFIG)
     async def update_shares(self, shares_update: UpdateShares, raise_on_err: bool = False) -> None:
@@ -203,14 +203,14 @@ class DRACOONShares:
         self.logger.info("Updated shares.")
         return None
     
-    def make_shares_update(self, shares_list = List[int], expiration: Expiration = None, 
+    def make_shares_update(self, shares_list: List[int], expiration: Expiration = None, 
                           show_creator_name: bool = None, show_creator_login: bool = None, 
                           max_downloads: int = None, reset_max_downloads: bool = True) -> UpdateShares:
 
         """ make a shares update payload required for update_shares() """
         shares_update = {
 
-            "objetIds": shares_list
+            "objectIds": shares_list
 
             }
 
@@ -274,7 +274,7 @@ class DRACOONShares:
             await self.dracoon.handle_http_error(err=e, raise_on_err=raise_on_err)
 
         self.logger.info("Updated share.")
-        return DownloadShare(**res.json())
+        return DownloadShare.model_validate_json(res.content)
 
     @retry(**RETRY_CONFIG)
     async def delete_share(self, share_id: int, raise_on_err: bool = False) -> None:
@@ -354,7 +354,7 @@ class DRACOONShares:
             await self.dracoon.handle_http_error(err=e, raise_on_err=raise_on_err)
         
         self.logger.info("Retrieved file requests.")
-        return UploadShareList(**res.json())
+        return UploadShareList.model_validate_json(res.content)
 
     @retry(**RETRY_CONFIG)
     async def create_file_request(self, file_request: CreateFileRequest, raise_on_err: bool = False) -> UploadShare:
@@ -380,7 +380,7 @@ class DRACOONShares:
             await self.dracoon.handle_http_error(err=e, raise_on_err=raise_on_err)
         
         self.logger.info("Created file request.")
-        return UploadShare(**res.json())
+        return UploadShare.model_validate_json(res.content)
 
     def make_file_request(self, target_id: int, name: str = None, password: str = None, expiration: str = None, file_expiration: int = None, notes: str = None, internal_notes: str = None, 
                    show_creator: bool = None, show_creator_login: bool = None, max_slots: int = None, max_size: int = None, show_uploaded_files: bool = None,
@@ -455,7 +455,7 @@ class DRACOONShares:
             await self.dracoon.handle_http_error(err=e, raise_on_err=raise_on_err)
         
         self.logger.info("Retrieved file request.")
-        return UploadShare(**res.json())
+        return UploadShare.model_validate_json(res.content)
 
     @retry(**RETRY_CONFIG)
     async def update_file_requests(self, file_requests_update: UpdateFileRequests, raise_on_err: bool = False) -> None:
@@ -483,7 +483,7 @@ class DRACOONShares:
         self.logger.info("Updated file request.")
         return None
 
-    def make_file_requests_update(self, file_requests_list = List[int], expiration: Expiration = None, file_expiration: int = None,
+    def make_file_requests_update(self, file_requests_list: List[int], expiration: Expiration = None, file_expiration: int = None,
                           show_creator_name: bool = None, show_creator_login: bool = None, 
                           max_slots: int = None, max_size: int = None, show_uploaded_files: bool = None, reset_max_size: bool = True, 
                           reset_max_slots: bool = None, reset_file_expiration: bool = None, raise_on_err: bool = False) -> UpdateFileRequests:
@@ -491,7 +491,7 @@ class DRACOONShares:
         """ make a file_requests update payload required for update_file_requests() """
         file_requests_update = {
 
-            "objetIds": file_requests_list
+            "objectIds": file_requests_list
 
             }
 
@@ -502,8 +502,8 @@ class DRACOONShares:
         if show_creator_name is not None: file_requests_update["showCreatorName"] = show_creator_name
         if max_slots: file_requests_update["maxSlots"] = max_slots
         if max_size: file_requests_update["maxSize"] = max_size
-        if reset_max_slots is not None: file_requests_update["resetSlots"] = reset_max_slots
-        if reset_max_size is not None: file_requests_update["resetSize"] = reset_max_size
+        if reset_max_slots is not None: file_requests_update["resetMaxSlots"] = reset_max_slots
+        if reset_max_size is not None: file_requests_update["resetMaxSize"] = reset_max_size
         if show_uploaded_files is not None: file_requests_update["showUploadedFiles"] = show_uploaded_files
 
         return UpdateFileRequests(**file_requests_update)
@@ -558,7 +558,7 @@ class DRACOONShares:
             await self.dracoon.handle_http_error(err=e, raise_on_err=raise_on_err)
         
         self.logger.info("Updated file request.")
-        return UploadShare(**res.json())
+        return UploadShare.model_validate_json(res.content)
 
     @retry(**RETRY_CONFIG)
     async def delete_file_request(self, file_request_id: int, raise_on_err: bool = False) -> None:
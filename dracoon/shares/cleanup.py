@@ -0,0 +1,171 @@
+"""
+Bulk share and file request operations for DRACOON shares adapter
+
+Finds shares (or file requests) matching predicates across all pages
+(pages are requested concurrently in windows, only matches are kept) and
+updates or deletes them in batches (as few requests as possible).
+
+Predicates are called with a share (DownloadShare) or file request (UploadShare):
+
+    cleanup = ShareCleanup(dracoon.shares)
+    shares = await cleanup.find_shares(predicates=[is_expired(), is_never_used()])
+    await cleanup.delete_shares([share.id for share in shares])
+
+"""
+
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import AsyncIterator, Callable, Iterable, List, Optional, Set, Union
+
+from dracoon.concurrency import DEFAULT_CONCURRENCY, gather_bounded
+from dracoon.user.models import UserType
+from .responses import DownloadShare, DownloadShareList, UploadShare, UploadShareList
+
+# maximum items per list request
+SHARES_PAGE_SIZE = 500
+# maximum ids per bulk update / delete request
+SHARES_BATCH_SIZE = 500
+
+Share = Union[DownloadShare, UploadShare]
+SharePredicate = Callable[[Share], bool]
+
+
+def as_utc(value: datetime) -> datetime:
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+def is_expired(now: datetime = None) -> SharePredicate:
+    """ share expired (expiration before now) """
+    now = as_utc(now or datetime.now(timezone.utc))
+    return lambda share: share.expireAt is not None and as_utc(share.expireAt) <= now
+
+
+def is_older_than(age: timedelta, now: datetime = None) -> SharePredicate:
+    """ share created before <age> """
+    threshold = as_utc(now or datetime.now(timezone.utc)) - age
+    return lambda share: as_utc(share.createdAt) <= threshold
+
+
+def is_never_used() -> SharePredicate:
+    """ share never downloaded (file request: no uploads) """
+    def never_used(share: Share) -> bool:
+        if isinstance(share, DownloadShare):
+            return share.cntDownloads == 0
+        return not share.cntUploads
+    return never_used
+
+
+def is_created_by(user_ids: Iterable[int]) -> SharePredicate:
+    """ share created by one of the users (e.g. locked users, see ShareCleanup.get_locked_user_ids()) """
+    user_ids = set(user_ids)
+    return lambda share: share.createdBy.id in user_ids
+
+
+def is_created_by_deleted_user() -> SharePredicate:
+    """ share created by a deleted user """
+    return lambda share: share.createdBy.userType == UserType.deleted
+
+
+@dataclass
+class ShareBatchResult:
+    """ result of a bulk request (ids of batch, error if failed) """
+    ids: List[int]
+    error: Optional[Exception] = None
+
+
+class ShareCleanup:
+    """ find shares / file requests matching predicates and update or delete them in batches """
+
+    def __init__(self, shares_adapter, concurrency: int = DEFAULT_CONCURRENCY, batch_size: int = SHARES_BATCH_SIZE):
+        self.logger = logging.getLogger('dracoon.shares.cleanup')
+        self.shares_adapter = shares_adapter
+        self.concurrency = concurrency
+        self.batch_size = batch_size
+
+    async def iter_pages(self, get_fn, filter: str = None) -> AsyncIterator[Union[DownloadShareList, UploadShareList]]:
+        """ get all pages in order (at most <concurrency> pages are requested at the same time) """
+        first_page = await get_fn(filter=filter, limit=SHARES_PAGE_SIZE, raise_on_err=True)
+        yield first_page
+
+        offsets = list(range(SHARES_PAGE_SIZE, first_page.range.total, SHARES_PAGE_SIZE))
+        for i in range(0, len(offsets), self.concurrency):
+            pages = await gather_bounded([get_fn(offset=offset, filter=filter, limit=SHARES_PAGE_SIZE, raise_on_err=True)
+                                          for offset in offsets[i:i + self.concurrency]], limit=self.concurrency)
+            for page in pages:
+                yield page
+
+    async def find(self, get_fn, predicates: List[SharePredicate], filter: str = None) -> List[Share]:
+        """ get all items matching all predicates """
+        matches = []
+        total = 0
+
+        async for page in self.iter_pages(get_fn, filter=filter):
+            total += len(page.items)
+            matches.extend(item for item in page.items if all(predicate(item) for predicate in predicates))
+
+        self.logger.info("Found %s matching item(s) of %s.", len(matches), total)
+        return matches
+
+    async def find_shares(self, predicates: List[SharePredicate], filter: str = None) -> List[DownloadShare]:
+        """ get all shares matching all predicates (optional API filter to reduce pages) """
+        return await self.find(self.shares_adapter.get_shares, predicates=predicates, filter=filter)
+
+    async def find_file_requests(self, predicates: List[SharePredicate], filter: str = None) -> List[UploadShare]:
+        """ get all file requests matching all predicates (optional API filter to reduce pages) """
+        return await self.find(self.shares_adapter.get_file_requests, predicates=predicates, filter=filter)
+
+    async def get_locked_user_ids(self, users_adapter) -> Set[int]:
+        """ get ids of all locked (deactivated) users """
+        first_page = await users_adapter.get_users(filter='isLocked:eq:true', limit=SHARES_PAGE_SIZE, raise_on_err=True)
+        pages = [first_page]
+
+        if first_page.range.total > SHARES_PAGE_SIZE:
+            page_reqs = [users_adapter.get_users(offset=offset, filter='isLocked:eq:true', limit=SHARES_PAGE_SIZE, raise_on_err=True)
+                         for offset in range(SHARES_PAGE_SIZE, first_page.range.total, SHARES_PAGE_SIZE)]
+            pages.extend(await gather_bounded(page_reqs, limit=self.concurrency))
+
+        return {user.id for page in pages for user in page.items}
+
+    def batches(self, ids: List[int]) -> List[List[int]]:
+        return [ids[i:i + self.batch_size] for i in range(0, len(ids), self.batch_size)]
+
+    async def run_batches(self, request_fn, ids: Iterable[int]) -> List[ShareBatchResult]:
+        """ send a request per batch of ids (concurrently) - failed batches are returned with error """
+        ids = list(dict.fromkeys(ids))
+
+        async def run_batch(batch: List[int]) -> ShareBatchResult:
+            try:
+                await request_fn(batch)
+            except Exception as e:
+                self.logger.error("Bulk request failed for %s item(s).", len(batch))
+                return ShareBatchResult(ids=batch, error=e)
+            return ShareBatchResult(ids=batch)
+
+        results = await gather_bounded([run_batch(batch) for batch in self.batches(ids)], limit=self.concurrency)
+
+        failed = sum(len(result.ids) for result in results if result.error is not None)
+        self.logger.info("Processed %s item(s), %s failed.", len(ids) - failed, failed)
+        return results
+
+    async def delete_shares(self, share_ids: Iterable[int]) -> List[ShareBatchResult]:
+        """ delete shares in batches """
+        return await self.run_batches(lambda batch: self.shares_adapter.delete_shares(share_list=batch, raise_on_err=True), share_ids)
+
+    async def update_shares(self, share_ids: Iterable[int], **update) -> List[ShareBatchResult]:
+        """ update shares in batches (update: arguments of make_shares_update(), e.g. expiration - limits only reset if requested) """
+        update.setdefault('reset_max_downloads', None)
+        return await self.run_batches(lambda batch: self.shares_adapter.update_shares(
+            shares_update=self.shares_adapter.make_shares_update(shares_list=batch, **update), raise_on_err=True), share_ids)
+
+    async def delete_file_requests(self, file_request_ids: Iterable[int]) -> List[ShareBatchResult]:
+        """ delete file requests in batches """
+        return await self.run_batches(lambda batch: self.shares_adapter.delete_file_requests(file_request_list=batch, raise_on_err=True),
+                                      file_request_ids)
+
+    async def update_file_requests(self, file_request_ids: Iterable[int], **update) -> List[ShareBatchResult]:
+        """ update file requests in batches (update: arguments of make_file_requests_update(), e.g. expiration - limits only reset if requested) """
+        update.setdefault('reset_max_size', None)
+        return await self.run_batches(lambda batch: self.shares_adapter.update_file_requests(
+            file_requests_update=self.shares_adapter.make_file_requests_update(file_requests_list=batch, **update), raise_on_err=True),
+            file_request_ids)
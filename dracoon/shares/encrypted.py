@@ -0,0 +1,104 @@
+"""
+Encrypted share creation for DRACOON shares adapter
+
+Every share of an encrypted file requires a new keypair (private key encrypted
+with the share password) and the file key encrypted with its public key.
+Keypairs are taken from a keypair pool (generated in background processes),
+file keys are requested concurrently and the private key of the user is parsed
+once for all file keys (kept by the instance only, dropped on close).
+
+    async with KeyPairPool(size=16) as pool:
+        async with EncryptedShares(dracoon.shares, dracoon.nodes, dracoon.plain_keypair, keypair_pool=pool) as shares:
+            results = await shares.create_shares(node_ids=[1, 2, 3], password='VerySecret123!')
+
+"""
+
+import asyncio
+import logging
+from typing import Iterable, List, Union
+
+from dracoon.concurrency import DEFAULT_CONCURRENCY, gather_bounded
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+from dracoon.crypto import create_plain_userkeypair, decrypt_file_key, encrypt_file_key_public, encrypt_private_key, load_private_key
+from dracoon.crypto.keypool import KeyPairPool
+from dracoon.crypto.models import PlainUserKeyPairContainer, UserKeyPairVersion
+from dracoon.errors import CryptoMissingKeypairError, InvalidArgumentError
+from .models import CreateShare
+from .responses import DownloadShare
+
+
+class EncryptedShares:
+    """ create shares of encrypted files (keypairs from pool, file keys requested concurrently) """
+
+    def __init__(self, shares_adapter, nodes_adapter, plain_keypair: PlainUserKeyPairContainer, keypair_pool: KeyPairPool = None,
+                 version: UserKeyPairVersion = UserKeyPairVersion.RSA4096, concurrency: int = DEFAULT_CONCURRENCY):
+        """ without keypair pool keypairs are generated in a thread (slow) """
+        if plain_keypair is None:
+            raise CryptoMissingKeypairError(message='Encrypted shares require an unlocked keypair.')
+
+        self.logger = logging.getLogger('dracoon.shares.encrypted')
+        self.shares_adapter = shares_adapter
+        self.nodes_adapter = nodes_adapter
+        self.plain_keypair = plain_keypair
+        self.keypair_pool = keypair_pool
+        self.version = keypair_pool.version if keypair_pool else version
+        self.concurrency = concurrency
+        # parsed private key of user (parsed on first use)
+        self.private_key: rsa.RSAPrivateKey = None
+
+    def get_private_key(self) -> rsa.RSAPrivateKey:
+        """ get parsed private key of user """
+        if self.plain_keypair is None:
+            raise CryptoMissingKeypairError(message='Encrypted shares are closed.')
+        if self.private_key is None:
+            self.private_key = load_private_key(self.plain_keypair.privateKeyContainer.privateKey)
+        return self.private_key
+
+    def close(self) -> None:
+        """ drop keypair and parsed private key of user """
+        self.private_key = None
+        self.plain_keypair = None
+
+    async def __aenter__(self) -> 'EncryptedShares':
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        self.close()
+
+    async def get_share_keypair(self) -> PlainUserKeyPairContainer:
+        """ get a new keypair for a share """
+        if self.keypair_pool is not None:
+            return await self.keypair_pool.get()
+        return await asyncio.to_thread(create_plain_userkeypair, self.version)
+
+    async def make_encrypted_share(self, node_id: int, password: str, **share) -> CreateShare:
+        """ make share payload of an encrypted file (share: arguments of make_share(), e.g. expiration) """
+        if not password:
+            raise InvalidArgumentError(message='Encrypted shares require a password.')
+
+        # file key is requested while keypair is taken from pool
+        file_key, share_keypair = await asyncio.gather(self.nodes_adapter.get_user_file_key(node_id, raise_on_err=True),
+                                                       self.get_share_keypair())
+
+        plain_file_key = decrypt_file_key(file_key=file_key, keypair=self.plain_keypair, private_key=self.get_private_key())
+        share_file_key = encrypt_file_key_public(plain_file_key=plain_file_key, public_key=share_keypair.publicKeyContainer)
+        keypair = encrypt_private_key(secret=password, plain_key=share_keypair)
+
+        return self.shares_adapter.make_share(node_id=node_id, keypair=keypair, file_key=share_file_key, **share)
+
+    async def create_share(self, node_id: int, password: str, **share) -> DownloadShare:
+        """ create share of an encrypted file """
+        payload = await self.make_encrypted_share(node_id=node_id, password=password, **share)
+        return await self.shares_adapter.create_share(share=payload, raise_on_err=True)
+
+    async def create_shares(self, node_ids: Iterable[int], password: str, **share) -> List[Union[DownloadShare, Exception]]:
+        """ create shares of encrypted files concurrently (same password and settings) - failed shares are returned as exception """
+        node_ids = list(node_ids)
+        results = await gather_bounded([self.create_share(node_id=node_id, password=password, **share) for node_id in node_ids],
+                                       limit=self.concurrency, return_exceptions=True)
+
+        failed = len([result for result in results if isinstance(result, Exception)])
+        self.logger.info("Created %s encrypted share(s), %s failed.", len(node_ids) - failed, failed)
+
+        return results
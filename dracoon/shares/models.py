@@ -72,7 +72,7 @@ class CreateFileRequest(BaseModel):
 
 # required payload for PUT /shares/uploads
 class UpdateFileRequests(BaseModel):
-    expiration: Optional[Expiration]
+    expiration: Optional[Expiration] = None
     showCreatorName: Optional[bool] = None
     showCreatorUsername: Optional[bool] = None
     showUploadedFiles: Optional[bool] = None
@@ -80,6 +80,8 @@ class UpdateFileRequests(BaseModel):
     maxSize: Optional[int] = None
     filesExpiryPeriod: Optional[int] = None
     resetFilesExpiryPeriod: Optional[bool] = None
+    resetMaxSlots: Optional[bool] = None
+    resetMaxSize: Optional[bool] = None
     objectIds: List[int]
 
 # required payload for PUT /shares/uploads/{share_id}
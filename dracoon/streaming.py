@@ -0,0 +1,128 @@
+"""
+Incremental JSON parser for (large) list responses
+
+Parses items of a JSON array while the response body is received.
+Supports top-level arrays (e.g. GET /eventlog/audits/nodes) and the items
+array of list responses (range and items, e.g. GET /nodes).
+Only the current item is kept in memory.
+
+"""
+
+import re
+from typing import Any, List, Optional
+
+from dracoon.serialization import json_loads
+
+# structural characters (and string delimiters / escapes) of JSON
+TOKEN_PATTERN = re.compile(rb'["\\\[\]{},:]')
+STRING_PATTERN = re.compile(rb'["\\]')
+
+
+class JSONItemParser:
+    """ parse items of a JSON array incrementally (feed bytes, get items) """
+
+    def __init__(self, items_key: Optional[str] = 'items'):
+        # items key of top-level object - None for top-level array
+        self.items_key = items_key.encode('utf-8') if items_key is not None else None
+        self.buffer = bytearray()
+        self.pos = 0
+        self.depth = 0
+        self.in_string = False
+        self.string_start = None
+        self.last_string = None
+        self.key = None
+        self.target_depth = None
+        self.item_start = None
+        self.done = False
+
+    def decode(self, item: bytes) -> Any:
+        """ decode a single item """
+        return json_loads(item)
+
+    def emit(self, end: int, items: List[Any]) -> None:
+        """ decode current item (if not empty) """
+        item = bytes(self.buffer[self.item_start:end]).strip()
+        if item:
+            items.append(self.decode(item))
+
+    def feed(self, data: bytes) -> List[Any]:
+        """ parse received bytes - returns all items completed with these bytes """
+        items = []
+
+        # ignore remaining content (e.g. other keys after items)
+        if self.done:
+            return items
+
+        self.buffer.extend(data)
+
+        while self.pos < len(self.buffer) and not self.done:
+
+            if self.in_string:
+                match = STRING_PATTERN.search(self.buffer, self.pos)
+                if match is None:
+                    self.pos = len(self.buffer)
+                    break
+                index = match.start()
+                # escaped character might be in next chunk
+                if self.buffer[index] == 0x5c:
+                    if index + 1 >= len(self.buffer):
+                        self.pos = index
+                        break
+                    self.pos = index + 2
+                    continue
+
+                self.in_string = False
+                if self.depth == 1 and self.target_depth is None:
+                    self.last_string = bytes(self.buffer[self.string_start:index])
+                self.string_start = None
+                self.pos = index + 1
+                continue
+
+            match = TOKEN_PATTERN.search(self.buffer, self.pos)
+            if match is None:
+                self.pos = len(self.buffer)
+                break
+
+            index = match.start()
+            token = self.buffer[index:index + 1]
+            self.pos = index + 1
+
+            if token == b'"':
+                self.in_string = True
+                self.string_start = index + 1
+            elif token == b':':
+                if self.depth == 1:
+                    self.key = self.last_string
+            elif token in (b'[', b'{'):
+                self.depth += 1
+                is_items = self.items_key is None and self.depth == 1 or self.key == self.items_key and self.depth == 2
+                if token == b'[' and self.target_depth is None and is_items:
+                    self.target_depth = self.depth
+                    self.item_start = index + 1
+            elif token in (b']', b'}'):
+                if token == b']' and self.depth == self.target_depth:
+                    self.emit(index, items)
+                    self.target_depth = None
+                    self.item_start = None
+                    self.done = True
+                self.depth -= 1
+            elif token == b',':
+                if self.depth == self.target_depth:
+                    self.emit(index, items)
+                    self.item_start = index + 1
+
+        # drop parsed bytes (keep current item)
+        keep = self.pos
+        if self.item_start is not None:
+            keep = min(keep, self.item_start)
+        if self.in_string and self.string_start is not None:
+            keep = min(keep, self.string_start)
+        if keep > 0:
+            del self.buffer[:keep]
+            self.pos -= keep
+            if self.item_start is not None:
+                self.item_start -= keep
+            if self.string_start is not None:
+                self.string_start -= keep
+
+        return items
@@ -15,12 +15,14 @@ All requests with bodies use generic params variable to pass JSON body
 
 """
 
+import asyncio
 import httpx
 import logging
 from tenacity import retry
 
 from dracoon.client import DRACOONClient, OAuth2ConnectionType, RETRY_CONFIG
 from dracoon.crypto import create_plain_userkeypair, encrypt_private_key
+from dracoon.crypto.keypool import KeyPairFactory
 from dracoon.crypto.models import UserKeyPairContainer, UserKeyPairVersion
 from dracoon.errors import ClientDisconnectedError, InvalidClientError, InvalidArgumentError
 from .models import UpdateAccount, UserAccount
@@ -76,7 +78,7 @@ class DRACOONUser:
             await self.dracoon.handle_http_error(err=e, raise_on_err=raise_on_err)
         
         self.logger.info("Retrieved user account.")
-        return UserAccount(**res.json())
+        return UserAccount.model_validate_json(res.content)
 
     @retry(**RETRY_CONFIG)
     async def update_account_information(self, account_update: UpdateAccount, raise_on_err: bool = False) -> UserAccount:
@@ -101,7 +103,7 @@ class DRACOONUser:
             await self.dracoon.handle_http_error(err=e, raise_on_err=raise_on_err)
         
         self.logger.info("Updated user account.")
-        return UserAccount(**res.json())
+        return UserAccount.model_validate_json(res.content)
 
     def make_account_update(self, user_name: str = None, acceptEULA: bool = None, first_name: str = None, last_name: str = None, email: str = None, 
                             phone: str = None, language: str = None) -> UpdateAccount:
@@ -143,12 +145,17 @@ class DRACOONUser:
             await self.dracoon.handle_http_error(err=e, raise_on_err=raise_on_err)
         
         self.logger.info("Retrieved user keypair.")
-        return UserKeyPairContainer(**res.json())
+        return UserKeyPairContainer.model_validate_json(res.content)
 
     @retry(**RETRY_CONFIG)
-    async def set_user_keypair(self, secret: str, version: UserKeyPairVersion = UserKeyPairVersion.RSA4096, raise_on_err: bool = False) -> None:
+    async def set_user_keypair(self, secret: str, version: UserKeyPairVersion = UserKeyPairVersion.RSA4096, raise_on_err: bool = False, 
+                               keypair_factory: KeyPairFactory = None) -> None:
         """ sets encrypted user keypair protected with secret (if none present) for authenticated user """
-        plain_keypair = create_plain_userkeypair(version=version)
+        # keypair generation takes seconds - event loop is not blocked
+        if keypair_factory is not None:
+            plain_keypair = await keypair_factory.create(version=version)
+        else:
+            plain_keypair = await asyncio.to_thread(create_plain_userkeypair, version)
         encrypted_keypair = encrypt_private_key(secret=secret, plain_key=plain_keypair)
 
         if self.raise_on_err:
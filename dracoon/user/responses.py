@@ -26,6 +26,13 @@ class Role(BaseModel):
 class RoleList(BaseModel):
     items: List[Role]
 
+class KeyValueEntry(BaseModel):
+    key: str
+    value: str
+
+class UserAttributes(BaseModel):
+    items: List[KeyValueEntry]
+
 class UserItem(BaseModel):
     id: int
     userName: str
@@ -41,6 +48,7 @@ class UserItem(BaseModel):
     phone: Optional[str] = None
     homeRoomId: Optional[int] = None
     userRoles: Optional[RoleList] = None
+    userAttributes: Optional[UserAttributes] = None
 
 class UserList(BaseModel):
     range: Range
@@ -86,10 +94,6 @@ class LastAdminUserRoomList(BaseModel):
     items: List[LastAdminUserRoom]
 
 
-class KeyValueEntry(BaseModel):
-    key: str
-    value: str
-
 class AttributesResponse(BaseModel):
     range: Range
     items: List[KeyValueEntry]
@@ -14,13 +14,15 @@ Please note: maximum 500 items are returned in GET requests
 
 """
 
-from typing import List
+from typing import List, Union
 import logging
 import urllib.parse
 
 import httpx
 from tenacity import retry
 
+from dracoon.compact import CompactList, parse_compact_list
+from dracoon.serialization import json_loads
 from dracoon.client import DRACOONClient, OAuth2ConnectionType, RETRY_CONFIG
 from dracoon.user.responses import (AttributesResponse, LastAdminUserRoomList, RoleList, 
                                     UserData, UserGroupList, UserList)
@@ -73,7 +75,7 @@ class DRACOONUsers:
             await self.dracoon.handle_http_error(err=e, raise_on_err=raise_on_err)
         
         self.logger.info("Created user.")
-        return UserData(**res.json())
+        return UserData.model_validate_json(res.content)
 
     def make_local_user(self, first_name: str, last_name: str, email: str, login: str = None,
                         language: str = None, notify: bool = None, expiration: Expiration = None, 
@@ -195,7 +197,7 @@ class DRACOONUsers:
     @retry(**RETRY_CONFIG)
     async def get_users(self, offset: int = 0, filter: str = None, limit: int = None, 
                         sort: str = None, raise_on_err: bool = False, include_attributes: bool = False,
-                        include_roles: bool = False) -> UserList:     
+                        include_roles: bool = False, compact: bool = False) -> Union[UserList, CompactList[UserList]]:     
         """ list (all) users """
         if not await self.dracoon.test_connection() and self.dracoon.connection:
             await self.dracoon.connect(OAuth2ConnectionType.refresh_token)
@@ -219,7 +221,9 @@ class DRACOONUsers:
             await self.dracoon.handle_http_error(err=e, raise_on_err=raise_on_err)
         
         self.logger.info("Retrieved users.")
-        return UserList(**res.json())
+        if compact:
+            return parse_compact_list(UserList, json_loads(res.content))
+        return UserList.model_validate_json(res.content)
 
     @retry(**RETRY_CONFIG)
     async def get_user(self, user_id: int, raise_on_err: bool = False) -> UserData:
@@ -239,7 +243,7 @@ class DRACOONUsers:
             await self.dracoon.handle_http_error(err=e, raise_on_err=raise_on_err)
         
         self.logger.info("Retrieved user.")
-        return UserData(**res.json())
+        return UserData.model_validate_json(res.content)
 
 
     @retry(**RETRY_CONFIG)
@@ -263,7 +267,7 @@ class DRACOONUsers:
             await self.dracoon.handle_http_error(err=e, raise_on_err=raise_on_err)
         
         self.logger.info("Updated user.")
-        return UserData(**res.json())
+        return UserData.model_validate_json(res.content)
 
     @retry(**RETRY_CONFIG)
     async def delete_user(self, user_id: int, raise_on_err: bool = False) -> None:
@@ -310,7 +314,7 @@ class DRACOONUsers:
             await self.dracoon.handle_http_error(err=e, raise_on_err=raise_on_err)
         
         self.logger.info("Retrieved user groups.")
-        return UserGroupList(**res.json())
+        return UserGroupList.model_validate_json(res.content)
 
     @retry(**RETRY_CONFIG)
     async def get_user_last_admin_rooms(self, user_id: int, 
@@ -331,7 +335,7 @@ class DRACOONUsers:
             await self.dracoon.handle_http_error(err=e, raise_on_err=raise_on_err)
 
         self.logger.info("Retrieved user last admin rooms.")
-        return LastAdminUserRoomList(**res.json())
+        return LastAdminUserRoomList.model_validate_json(res.content)
 
     @retry(**RETRY_CONFIG)
     async def get_user_roles(self, user_id: int, raise_on_err: bool = False) -> RoleList:
@@ -351,7 +355,7 @@ class DRACOONUsers:
             await self.dracoon.handle_http_error(err=e, raise_on_err=raise_on_err)
         
         self.logger.info("Retrieved user roles.")
-        return RoleList(**res.json())
+        return RoleList.model_validate_json(res.content)
 
     @retry(**RETRY_CONFIG)
     async def get_user_attributes(self, user_id: int, offset: int = 0, filter: str = None, 
@@ -378,7 +382,7 @@ class DRACOONUsers:
             await self.dracoon.handle_http_error(err=e, raise_on_err=raise_on_err)
         
         self.logger.info("Retrieved user attributes.")
-        return AttributesResponse(**res.json())
+        return AttributesResponse.model_validate_json(res.content)
 
     @retry(**RETRY_CONFIG)
     async def delete_user_attribute(self, user_id: int, key: str, 
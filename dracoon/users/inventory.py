@@ -0,0 +1,124 @@
+"""
+User inventory export for DRACOON users adapter
+
+Exports all users with roles, attributes and groups to CSV or JSONL.
+Roles and attributes are included in the user list (include_roles /
+include_attributes), only groups require a request per user (bounded concurrency).
+User pages are requested in windows and rows are written while
+processing - the full user list is never kept in memory.
+
+"""
+
+import csv
+import json
+import logging
+from typing import Any, AsyncIterator, Dict, List
+
+from dracoon.concurrency import DEFAULT_CONCURRENCY, gather_bounded
+from dracoon.errors import InvalidArgumentError
+from dracoon.user.responses import UserList
+
+# maximum items per list request
+INVENTORY_PAGE_SIZE = 500
+# columns of inventory export
+USER_FIELDS = ['id', 'userName', 'firstName', 'lastName', 'email', 'phone', 'isLocked', 'isEncryptionEnabled',
+               'createdAt', 'lastLoginSuccessAt', 'expireAt']
+INVENTORY_FIELDS = USER_FIELDS + ['roles', 'groups', 'attributes']
+
+INVENTORY_FORMATS = ['csv', 'jsonl']
+
+
+def format_csv_value(value: Any) -> Any:
+    """ flatten lists (roles, groups) and attributes for CSV """
+    if isinstance(value, list):
+        return ';'.join(str(item) for item in value)
+    if isinstance(value, dict):
+        return ';'.join(f'{key}={item}' for key, item in value.items())
+    return value
+
+
+class UserInventory:
+    """ export users with roles, attributes and groups """
+
+    def __init__(self, users_adapter, filter: str = None, include_roles: bool = True, include_attributes: bool = True,
+                 include_groups: bool = True, concurrency: int = DEFAULT_CONCURRENCY):
+        self.logger = logging.getLogger('dracoon.users.inventory')
+        self.users_adapter = users_adapter
+        self.filter = filter
+        self.include_roles = include_roles
+        self.include_attributes = include_attributes
+        self.include_groups = include_groups
+        self.concurrency = concurrency
+
+    def get_users(self, offset: int = 0):
+        return self.users_adapter.get_users(offset=offset, filter=self.filter, limit=INVENTORY_PAGE_SIZE, include_roles=self.include_roles,
+                                            include_attributes=self.include_attributes, compact=True, raise_on_err=True)
+
+    async def iter_pages(self) -> AsyncIterator[UserList]:
+        """ get user pages in order (at most <concurrency> pages are requested at the same time) """
+        first_page = await self.get_users()
+        yield first_page
+
+        offsets = list(range(INVENTORY_PAGE_SIZE, first_page.range.total, INVENTORY_PAGE_SIZE))
+        for i in range(0, len(offsets), self.concurrency):
+            pages = await gather_bounded([self.get_users(offset=offset) for offset in offsets[i:i + self.concurrency]], limit=self.concurrency)
+            for page in pages:
+                yield page
+
+    async def get_group_names(self, user_id: int) -> List[str]:
+        """ get names of all groups of a user """
+        groups = await self.users_adapter.get_user_groups(user_id=user_id, filter='isMember:eq:true', limit=INVENTORY_PAGE_SIZE, raise_on_err=True)
+        names = [group.name for group in groups.items]
+
+        for offset in range(INVENTORY_PAGE_SIZE, groups.range.total, INVENTORY_PAGE_SIZE):
+            page = await self.users_adapter.get_user_groups(user_id=user_id, filter='isMember:eq:true', limit=INVENTORY_PAGE_SIZE, offset=offset,
+                                                            raise_on_err=True)
+            names.extend(group.name for group in page.items)
+
+        return names
+
+    def make_row(self, user: Any, groups: List[str] = None) -> Dict[str, Any]:
+        """ make export row of a user """
+        row = {field: getattr(user, field) for field in USER_FIELDS}
+        for field in ('createdAt', 'lastLoginSuccessAt', 'expireAt'):
+            if row[field] is not None:
+                row[field] = row[field].isoformat()
+
+        row['roles'] = [role.name for role in user.userRoles.items] if user.userRoles else []
+        row['groups'] = groups or []
+        row['attributes'] = {entry.key: entry.value for entry in user.userAttributes.items} if user.userAttributes else {}
+
+        return row
+
+    async def iter_rows(self) -> AsyncIterator[Dict[str, Any]]:
+        """ get export rows of all users (groups are requested concurrently per page) """
+        async for page in self.iter_pages():
+            groups = [None] * len(page.items)
+            if self.include_groups:
+                groups = await gather_bounded([self.get_group_names(user.id) for user in page.items], limit=self.concurrency)
+
+            for user, user_groups in zip(page.items, groups):
+                yield self.make_row(user, user_groups)
+
+    async def export(self, file_path: str, format: str = 'csv') -> int:
+        """ export users to file (csv or jsonl) - returns number of users """
+        if format not in INVENTORY_FORMATS:
+            raise InvalidArgumentError(message=f'Unsupported format: {format}')
+
+        count = 0
+
+        with open(file_path, 'w', newline='', encoding='utf-8') as export_file:
+            writer = None
+            if format == 'csv':
+                writer = csv.DictWriter(export_file, fieldnames=INVENTORY_FIELDS)
+                writer.writeheader()
+
+            async for row in self.iter_rows():
+                if writer:
+                    writer.writerow({key: format_csv_value(value) for key, value in row.items()})
+                else:
+                    export_file.write(json.dumps(row) + '\n')
+                count += 1
+
+        self.logger.info("Exported %s user(s).", count)
+        return count
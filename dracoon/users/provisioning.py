@@ -0,0 +1,188 @@
+"""
+User provisioning for DRACOON users adapter
+
+Creates (or updates) users from rows (e.g. a CSV file read lazily):
+existing users are detected via a login index (all users fetched once),
+rows are processed with bounded concurrency and results are written
+to a report (CSV) while processing - only the running rows are kept in memory.
+
+Row format (CSV header):
+
+    firstName,lastName,email,login,phone,language
+
+login is optional for local users (email is used as login).
+
+"""
+
+import asyncio
+import csv
+import logging
+from typing import Any, Dict, Iterable, Iterator, Optional
+
+from pydantic import ValidationError
+
+from dracoon.concurrency import DEFAULT_CONCURRENCY, gather_bounded
+from dracoon.errors import DRACOONBaseError, InvalidArgumentError
+from .models import CreateUser, UpdateUser
+
+# maximum items per list request
+PROVISIONING_PAGE_SIZE = 500
+# columns of provisioning report
+REPORT_FIELDS = ['row', 'login', 'action', 'userId', 'error']
+
+AUTH_METHODS = ['basic', 'openid', 'active_directory']
+REQUIRED_FIELDS = ['firstName', 'lastName', 'email']
+
+
+def read_user_csv(file_path: str, delimiter: str = ',', encoding: str = 'utf-8') -> Iterator[Dict[str, str]]:
+    """ read rows of a CSV file (with header) lazily """
+    with open(file_path, 'r', newline='', encoding=encoding) as csv_file:
+        for row in csv.DictReader(csv_file, delimiter=delimiter):
+            yield row
+
+
+class UserProvisioning:
+    """ create or update users from rows (bounded concurrency, incremental report) """
+
+    def __init__(self, users_adapter, auth_method: str = 'basic', auth_config_id: int = None, update_existing: bool = False,
+                 notify: bool = None, concurrency: int = DEFAULT_CONCURRENCY):
+        """ auth_config_id: OIDC or AD config id (required for openid / active_directory) """
+        if auth_method not in AUTH_METHODS:
+            raise InvalidArgumentError(message=f'Unsupported auth method: {auth_method}')
+        if auth_method != 'basic' and auth_config_id is None:
+            raise InvalidArgumentError(message=f'Auth config id required for auth method: {auth_method}')
+
+        self.logger = logging.getLogger('dracoon.users.provisioning')
+        self.users_adapter = users_adapter
+        self.auth_method = auth_method
+        self.auth_config_id = auth_config_id
+        self.update_existing = update_existing
+        self.notify = notify
+        self.concurrency = concurrency
+        # login (lower case) -> user id
+        self.logins: Dict[str, int] = {}
+        self.summary: Dict[str, int] = {'created': 0, 'updated': 0, 'skipped': 0, 'failed': 0}
+
+    async def load_logins(self) -> None:
+        """ get logins of all users (paged, pages are requested concurrently) """
+        first_page = await self.users_adapter.get_users(limit=PROVISIONING_PAGE_SIZE, compact=True, raise_on_err=True)
+        pages = [first_page]
+        total = first_page.range.total
+
+        if total > PROVISIONING_PAGE_SIZE:
+            page_reqs = [self.users_adapter.get_users(offset=offset, limit=PROVISIONING_PAGE_SIZE, compact=True, raise_on_err=True)
+                         for offset in range(PROVISIONING_PAGE_SIZE, total, PROVISIONING_PAGE_SIZE)]
+            pages.extend(await gather_bounded(page_reqs, limit=self.concurrency))
+
+        self.logins = {user.userName.lower(): user.id for page in pages for user in page.items}
+        self.logger.info("Loaded logins of %s user(s).", len(self.logins))
+
+    def get_login(self, row: Dict[str, str]) -> Optional[str]:
+        """ get login of a row (email for local users without login) """
+        login = row.get('login') or row.get('userName')
+        if not login and self.auth_method == 'basic':
+            login = row.get('email')
+        return login or None
+
+    def make_user(self, row: Dict[str, str]) -> CreateUser:
+        """ make user payload of a row """
+        missing = [field for field in REQUIRED_FIELDS if not row.get(field)]
+        if missing:
+            raise InvalidArgumentError(message=f'Missing field(s): {", ".join(missing)}')
+
+        user = {
+            'first_name': row.get('firstName'),
+            'last_name': row.get('lastName'),
+            'email': row.get('email'),
+            'login': self.get_login(row),
+            'language': row.get('language') or None,
+            'phone': row.get('phone') or None,
+            'notify': self.notify
+        }
+
+        if self.auth_method == 'openid':
+            return self.users_adapter.make_oidc_user(oidc_id=self.auth_config_id, **user)
+        if self.auth_method == 'active_directory':
+            return self.users_adapter.make_ad_user(ad_id=self.auth_config_id, **user)
+        return self.users_adapter.make_local_user(**user)
+
+    def make_user_update(self, row: Dict[str, str]) -> UpdateUser:
+        """ make user update payload of a row """
+        return self.users_adapter.make_user_update(first_name=row.get('firstName') or None, last_name=row.get('lastName') or None,
+                                                   email=row.get('email') or None, phone=row.get('phone') or None,
+                                                   language=row.get('language') or None)
+
+    async def provision_row(self, index: int, row: Dict[str, str]) -> Dict[str, Any]:
+        """ create or update user of a row - returns report entry """
+        login = self.get_login(row)
+        result = {'row': index, 'login': login, 'action': None, 'userId': None, 'error': None}
+
+        try:
+            if not login:
+                raise InvalidArgumentError(message='Missing login.')
+
+            user_id = self.logins.get(login.lower())
+
+            if user_id is None:
+                user = self.make_user(row)
+                # duplicate rows are detected as existing user
+                self.logins[login.lower()] = 0
+                try:
+                    created = await self.users_adapter.create_user(user=user, raise_on_err=True)
+                except Exception:
+                    del self.logins[login.lower()]
+                    raise
+                self.logins[login.lower()] = created.id
+                result.update(action='created', userId=created.id)
+            elif self.update_existing and user_id:
+                await self.users_adapter.update_user(user_id=user_id, user_update=self.make_user_update(row), raise_on_err=True)
+                result.update(action='updated', userId=user_id)
+            else:
+                result.update(action='skipped', userId=user_id or None)
+
+        except (DRACOONBaseError, ValidationError) as e:
+            self.logger.error("Provisioning failed for row %s.", index)
+            result.update(action='failed', error=getattr(e, 'message', None) or str(e))
+        # other errors (e.g. connection errors) fail the row only
+        except Exception as e:
+            self.logger.error("Provisioning failed for row %s: %s", index, type(e).__name__)
+            result.update(action='failed', error=str(e) or type(e).__name__)
+
+        return result
+
+    async def run(self, rows: Iterable[Dict[str, str]], report_path: str = None) -> Dict[str, int]:
+        """ provision users of all rows - returns number of users per action (created, updated, skipped, failed) """
+        if not self.logins:
+            await self.load_logins()
+
+        self.summary = {'created': 0, 'updated': 0, 'skipped': 0, 'failed': 0}
+
+        report_file = open(report_path, 'w', newline='') if report_path else None
+        report = csv.DictWriter(report_file, fieldnames=REPORT_FIELDS) if report_file else None
+        if report:
+            report.writeheader()
+
+        # rows are read on demand by a fixed number of workers
+        row_iter = enumerate(rows, start=1)
+
+        async def worker() -> None:
+            for index, row in row_iter:
+                result = await self.provision_row(index, row)
+                self.summary[result['action']] += 1
+                if report:
+                    report.writerow(result)
+                    report_file.flush()
+
+        workers = [asyncio.ensure_future(worker()) for _ in range(max(self.concurrency, 1))]
+        try:
+            await asyncio.gather(*workers)
+        finally:
+            # other workers are stopped if reading rows failed
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            if report_file:
+                report_file.close()
+
+        self.logger.info("Provisioned users: %s", self.summary)
+        return self.summary
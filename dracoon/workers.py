@@ -0,0 +1,227 @@
+"""
+Worker pool for bulk operations (multiple processes)
+
+Shards a bulk operation across worker processes - each worker uses its own
+DRACOON client and event loop. Workers share the tokens of the parent via a
+FileTokenStore (no additional logins, coordinated refresh) and a global
+rate limit for API requests. Results are returned to the parent in the
+order of the provided items.
+
+Jobs are async functions on module level (must be picklable):
+
+    async def update_user(dracoon: DRACOON, user_id: int):
+        return await dracoon.users.update_user(user_id=user_id, user_update=...)
+
+"""
+
+import asyncio
+import atexit
+import logging
+import math
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, List, Tuple
+
+from dracoon import DRACOON
+from dracoon.client import OAuth2ConnectionType
+from dracoon.client.token_store import FileTokenStore
+from dracoon.concurrency import DEFAULT_CONCURRENCY, gather_bounded
+from dracoon.errors import ClientDisconnectedError, DRACOONHttpError, InvalidArgumentError, WorkerError
+
+# shards per worker process (balances slow shards)
+SHARDS_PER_WORKER = 4
+
+Job = Callable[[DRACOON, Any], Awaitable[Any]]
+
+# state of worker process (created by init_worker)
+worker_state: Dict[str, Any] = {}
+
+
+class RateLimiter:
+    """ global rate limit (requests per second) shared by processes """
+
+    def __init__(self, rate: float, next_at: Any = None):
+        self.rate = rate
+        # time of next allowed request (shared memory)
+        self.next_at = next_at if next_at is not None else multiprocessing.Value('d', 0.0)
+
+    def reserve(self) -> float:
+        """ reserve next slot - returns wait time (in seconds) """
+        now = time.time()
+
+        with self.next_at.get_lock():
+            start = max(now, self.next_at.value)
+            self.next_at.value = start + 1 / self.rate
+
+        return start - now
+
+    async def wait(self) -> None:
+        """ wait for next slot """
+        delay = self.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    async def on_request(self, request: Any) -> None:
+        """ httpx request hook """
+        await self.wait()
+
+
+def get_worker_error(err: BaseException) -> WorkerError:
+    """ picklable error of a failed job """
+    status_code = None
+    if isinstance(err, DRACOONHttpError) and err.error is not None:
+        status_code = err.error.response.status_code
+
+    return WorkerError(message=str(err) or repr(err), error_type=type(err).__name__, status_code=status_code)
+
+
+def init_worker(config: Dict[str, Any], next_at: Any = None) -> None:
+    """ create client and event loop of worker process (connects with stored tokens) """
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+
+    dracoon = DRACOON(base_url=config['base_url'], client_id=config['client_id'], client_secret=config['client_secret'],
+                      raise_on_err=config['raise_on_err'], token_store=FileTokenStore(config['token_file']))
+    dracoon.client.token_key = config['token_key']
+
+    # rate limit applies to API requests, uploads and downloads
+    if config['rate_limit']:
+        rate_limiter = RateLimiter(rate=config['rate_limit'], next_at=next_at)
+        for http_client in [dracoon.client.http, dracoon.client.uploader, dracoon.client.downloader]:
+            http_client.event_hooks['request'].append(rate_limiter.on_request)
+
+    worker_state.update(loop=loop, dracoon=dracoon)
+    atexit.register(close_worker)
+
+    loop.run_until_complete(dracoon.connect(connection_type=OAuth2ConnectionType.refresh_token, full_info=False))
+
+    if config['crypto_secret']:
+        loop.run_until_complete(dracoon.get_keypair(secret=config['crypto_secret']))
+
+    worker_state.update(concurrency=config['concurrency'])
+
+
+def close_worker() -> None:
+    """ close clients and event loop of worker process (on exit, tokens are kept) """
+    loop = worker_state.pop('loop', None)
+    dracoon = worker_state.pop('dracoon', None)
+
+    if loop is None or loop.is_closed():
+        return
+
+    try:
+        if dracoon is not None:
+            loop.run_until_complete(dracoon.client.disconnect())
+        loop.run_until_complete(loop.shutdown_asyncgens())
+    finally:
+        loop.close()
+
+
+def run_shard(job: Job, shard: List[Tuple[int, Any]]) -> List[Tuple[int, Any]]:
+    """ run job for all items of a shard in worker process """
+    loop = worker_state['loop']
+    dracoon = worker_state['dracoon']
+
+    results = loop.run_until_complete(gather_bounded([job(dracoon, item) for _, item in shard], limit=worker_state['concurrency'],
+                                                     return_exceptions=True))
+
+    return [(index, get_worker_error(result) if isinstance(result, BaseException) else result)
+            for (index, _), result in zip(shard, results)]
+
+
+class WorkerPool:
+    """ run bulk jobs in worker processes (requires a DRACOON connection with FileTokenStore) """
+
+    def __init__(self, dracoon: DRACOON, processes: int = None, concurrency: int = DEFAULT_CONCURRENCY, rate_limit: float = None,
+                 shard_size: int = None, crypto_secret: str = None):
+        """ rate limit: max. API requests per second (all workers) - concurrency: concurrent jobs per worker """
+        token_store = dracoon.client.token_store
+        if not isinstance(token_store, FileTokenStore):
+            raise InvalidArgumentError(message='Worker pool requires a FileTokenStore (shared tokens).')
+
+        self.logger = logging.getLogger('dracoon.workers')
+        self.dracoon = dracoon
+        self.processes = processes or os.cpu_count() or 1
+        self.concurrency = concurrency
+        self.rate_limit = rate_limit
+        self.shard_size = shard_size
+        self.crypto_secret = crypto_secret
+        self.executor: ProcessPoolExecutor = None
+
+    def start(self) -> None:
+        """ start worker processes """
+        if self.executor is not None:
+            return
+
+        if not self.dracoon.client.connection or self.dracoon.client.token_key is None:
+            raise ClientDisconnectedError()
+
+        client = self.dracoon.client
+        config = {
+            'base_url': client.base_url,
+            'client_id': client.client_id,
+            'client_secret': client.client_secret,
+            'raise_on_err': client.raise_on_err,
+            'token_file': client.token_store.file_path,
+            'token_key': client.token_key,
+            'rate_limit': self.rate_limit,
+            'concurrency': self.concurrency,
+            'crypto_secret': self.crypto_secret
+        }
+
+        # no fork of running event loop
+        context = multiprocessing.get_context('spawn')
+        next_at = context.Value('d', 0.0) if self.rate_limit else None
+
+        self.executor = ProcessPoolExecutor(max_workers=self.processes, mp_context=context, initializer=init_worker,
+                                            initargs=(config, next_at))
+        self.logger.info("Started worker pool (%s processes).", self.processes)
+
+    def close(self) -> None:
+        """ stop worker processes """
+        if self.executor is not None:
+            self.executor.shutdown(wait=True)
+            self.executor = None
+            self.logger.info("Stopped worker pool.")
+
+    async def __aenter__(self) -> 'WorkerPool':
+        self.start()
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        await asyncio.get_running_loop().run_in_executor(None, self.close)
+
+    async def run(self, job: Job, items: List[Any], return_exceptions: bool = False) -> List[Any]:
+        """
+        run job for all items in worker processes - results in order of items
+        failed jobs are returned as WorkerError (return_exceptions) or the first one is raised
+        """
+        self.start()
+        items = list(items)
+
+        if not items:
+            return []
+
+        shard_size = self.shard_size or math.ceil(len(items) / (self.processes * SHARDS_PER_WORKER))
+        indexed = list(enumerate(items))
+        shards = [indexed[i:i + shard_size] for i in range(0, len(indexed), shard_size)]
+
+        self.logger.debug("Running %s items in %s shards.", len(items), len(shards))
+
+        loop = asyncio.get_running_loop()
+        shard_results = await asyncio.gather(*[loop.run_in_executor(self.executor, run_shard, job, shard) for shard in shards])
+
+        results = [None] * len(items)
+        for shard_result in shard_results:
+            for index, result in shard_result:
+                results[index] = result
+
+        errors = [result for result in results if isinstance(result, WorkerError)]
+        if errors:
+            self.logger.error("Worker jobs failed: %s of %s", len(errors), len(items))
+            if not return_exceptions:
+                raise errors[0]
+
+        return results
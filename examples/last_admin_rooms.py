@@ -11,7 +11,7 @@ from dracoon import DRACOON, OAuth2ConnectionType
 import asyncio
 import csv
 
-from dracoon.eventlog.responses import AuditNodeInfo, AuditNodeResponse, AuditUserPermission
+from dracoon.eventlog.audit import ManagerCountAggregation
 
 # client_id = 'XXXXXXXXXXXXXXXX'
 # client_secret = 'XXXXXXXXXXXXXXXX'
@@ -45,32 +45,13 @@ async def main():
   auth_code = input("Enter auth code: ")
   await dracoon.connect(connection_type=OAuth2ConnectionType.auth_code, auth_code=auth_code)
 
-# retrieve datarooms with permission manage
-  room_list = await dracoon.eventlog.get_permissions(filter=f'userId:eq:{str(user_id)}|permissionsManage:eq:true', raise_on_err=True)
+# retrieve room managers of all datarooms (paged) - find datarooms where user is the only admin
+  last_admin_aggregation = ManagerCountAggregation(count=1, user_id=user_id)
+  async for _ in dracoon.eventlog.iter_permissions(filter='permissionsManage:eq:true', concurrency=5, hooks=[last_admin_aggregation], 
+                                                   raise_on_err=True):
+    pass
 
-#check for more than 500 rooms
-  while len(room_list) == 500:
-    offset = 500
-    offset_room_list = await dracoon.eventlog.get_permissions(filter=f'userId:eq:{str(user_id)}', offset= offset, raise_on_err=True)
-    offset = offset+500
-    room_list.extend(offset_room_list)
-
-#find datarooms where only 1 admin
-  last_admin_rooms = []
-  for room in room_list:
-    all_room_managers= await dracoon.eventlog.get_permissions(filter=f'nodeId:eq:{str(room.nodeId)}|permissionsManage:eq:true', raise_on_err=True)
-    for managers in all_room_managers:
-        if len(managers.auditUserPermissionList) ==1:
-            for user in managers.auditUserPermissionList:
-                parentId = managers.nodeParentId
-                parentNodePath = managers.nodeParentPath
-
-                room_list = []
-                room_list.append(managers.nodeId)
-                room_list.append(managers.nodeName)
-                #room_list.append(managers.nodeParentId)
-                room_list.append(parentNodePath)
-                last_admin_rooms.append(room_list)
+  last_admin_rooms = [[room.nodeId, room.nodeName, room.nodeParentPath] for room in last_admin_aggregation.rooms]
 
   create_csv(last_admin_rooms, file_path)
 
@@ -21,25 +21,10 @@ client_id = 'xxxxxxxxxxxxxxxxxxx'
 client_secret = 'xxxxxxxxxxxxxxxxxxx'
 base_url = "https://your-dracoon.domain.com"
 
-# get all rooms
+# get all rooms (breadth-first, concurrent requests)
 async def get_rooms(room_id: int, dracoon: DRACOON) -> List[AuditNodeInfo]:
   
-  subroom_list = await dracoon.eventlog.get_rooms(parent_id=room_id, offset=0)
-  
-  if subroom_list.range.total > 500:
-    # collect all items if more than 500 (requests)
-    subroom_reqs = [dracoon.eventlog.get_rooms(parent_id=room_id, offset=offset) for offset in range(500, subroom_list.range.total, 500)]
-    for batch in dracoon.batch_process(subroom_reqs):
-      responses = await asyncio.gather(*batch)
-      for response in responses:
-        if "items" in response:
-            subroom_list.items.extend(response.items)
-            
-  for subroom in list(subroom_list.items):
-    subrooms = await get_rooms(room_id=subroom.nodeId, dracoon=dracoon)
-    subroom_list.items.extend(subrooms)
-    
-  return subroom_list.items
+  return [room async for room in dracoon.eventlog.crawl_rooms(parent_id=room_id, concurrency=10, raise_on_err=True)]
             
   
 # get room permissions
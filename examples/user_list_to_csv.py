@@ -5,10 +5,10 @@ Export user list to CSV file
 """
 
 import asyncio
-import csv
 
 from dracoon import DRACOON
 from dracoon.client import OAuth2ConnectionType
+from dracoon.users.inventory import UserInventory
 
 
 base_url = 'https://staging.dracoon.com'
@@ -30,27 +30,11 @@ async def main():
     
     await dracoon.connect(connection_type=OAuth2ConnectionType.auth_code, auth_code=auth_code)
 
-    user_list = await dracoon.users.get_users()
+    # roles and attributes are included in user list, groups are requested per user (concurrently)
+    inventory = UserInventory(dracoon.users, concurrency=10)
+    count = await inventory.export('users.csv')
 
-    if user_list.range.total > 500:
-        user_reqs = [dracoon.users.get_users(offset=offset) for offset in range(0, user_list.range.total, 500)]
-
-        for batch in dracoon.batch_process(user_reqs):
-            next_lists = asyncio.gather(*batch)
-
-            for next_list in next_lists:
-                user_list.items.extend(next_list.items)
-    
-    dracoon.logger.info((f"Found {len(user_list.items)} users"))
-
-    with open('users.csv', 'w', newline='') as csvfile:
-        writer = csv.writer(csvfile, delimiter=',', quotechar='"', quoting=csv.QUOTE_MINIMAL)
-
-        writer.writerow(['id', 'username', 'first_name', 'last_name', 'email', 'created_at', 'last_login_at'])
-
-        for user in user_list.items:
-            last_login = user.lastLoginSuccessAt if user.lastLoginSuccessAt else "N/A"
-            writer.writerow([user.id, user.userName, user.firstName, user.lastName, user.email, user.createdAt, last_login])
+    dracoon.logger.info(f"Exported {count} users")
 
 
 if __name__ == '__main__':
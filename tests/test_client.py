@@ -1,5 +1,16 @@
 import unittest
-from dracoon.client import DRACOONClient
+import json
+import os
+import tempfile
+from datetime import datetime, timedelta, timezone
+
+import respx
+
+from dracoon.client import DRACOONClient, OAuth2ConnectionType
+from dracoon.client.token_store import FileTokenStore, MemoryTokenStore, TokenStore
+from dracoon.nodes.models import NodeType
+from dracoon.serialization import JSON_BACKENDS, get_json_backend, set_json_backend, stdlib_dumps
+from dracoon.shares.models import Expiration
 
 class TestDRACOONClient(unittest.TestCase):
 
@@ -30,6 +41,105 @@ class TestDRACOONClient(unittest.TestCase):
         self.assertEqual(dracoon_default_redirect.get_code_url(), f'{dracoon_custom_redirect.base_url}/oauth/authorize?branding=full&response_type=code&client_id={dracoon_default_redirect.client_id}&redirect_uri=https://foo.bar/oauth/callback&scope=all')
 
 
+    def test_client_json_request_body(self):
+        dracoon = DRACOONClient(base_url='https://foo.bar')
+        default_backend = get_json_backend()
+
+        for backend in JSON_BACKENDS:
+            set_json_backend(backend)
+            request = dracoon.http.build_request('POST', 'https://foo.bar/api/v4/nodes/rooms', json={'name': 'ä room', 'parentId': 1})
+            self.assertEqual(request.headers['Content-Type'], 'application/json')
+            self.assertEqual(json.loads(request.content), {'name': 'ä room', 'parentId': 1})
+
+        set_json_backend(default_backend)
+        self.assertRaises(ValueError, set_json_backend, 'unknown')
+
+    def test_json_backends_same_output(self):
+        expiration = Expiration(enableExpiration=True, expireAt='2020-01-01T00:00:00Z')
+        payload = {'expireAt': datetime(2020, 1, 1, 12, 30, tzinfo=timezone.utc), 'expiration': expiration, 'type': NodeType.room,
+                   'name': 'ä room', 1: None}
+
+        # datetime and pydantic values are encoded by all backends
+        self.assertEqual(json.loads(stdlib_dumps(payload)), {'expireAt': '2020-01-01T12:30:00+00:00', 'type': 'room', 'name': 'ä room',
+                                                             'expiration': {'enableExpiration': True, 'expireAt': '2020-01-01T00:00:00Z'},
+                                                             '1': None})
+        for backend in JSON_BACKENDS.values():
+            self.assertEqual(backend['dumps'](payload), stdlib_dumps(payload))
+
+
+
+class TestAsyncDRACOONClient(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self) -> None:
+        with open('tests/responses/auth/auth_ok.json', 'r') as json_file:
+            self.login_json = json.load(json_file)
+
+        return super().setUp()
+
+    @respx.mock
+    async def test_client_token_store(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            token_file = os.path.join(tmp_dir, 'tokens.json')
+            login_mock = respx.post('https://dracoon.team/oauth/token').respond(200, json=self.login_json)
+
+            first = DRACOONClient(base_url='https://dracoon.team', token_store=FileTokenStore(token_file))
+            await first.connect(OAuth2ConnectionType.password_flow, username='test_user', password='test_password')
+            self.assertEqual(login_mock.call_count, 1)
+            self.assertTrue(os.path.exists(token_file))
+
+            # password is verified unless stored tokens are reused explicitly
+            await first.connect(OAuth2ConnectionType.password_flow, username='test_user', password='test_password')
+            self.assertEqual(login_mock.call_count, 2)
+
+            # other process reuses stored tokens
+            second = DRACOONClient(base_url='https://dracoon.team', token_store=FileTokenStore(token_file))
+            connection = await second.connect(OAuth2ConnectionType.password_flow, username='test_user', password='test_password', 
+                                              reuse_stored=True)
+            self.assertEqual(login_mock.call_count, 2)
+            self.assertTrue(second.connected)
+            self.assertEqual(connection.access_token, self.login_json['access_token'])
+            self.assertEqual(second.http.headers['Authorization'], 'Bearer ' + self.login_json['access_token'])
+
+            # other user requires own tokens
+            other = DRACOONClient(base_url='https://dracoon.team', token_store=FileTokenStore(token_file))
+            await other.connect(OAuth2ConnectionType.password_flow, username='other_user', password='test_password', reuse_stored=True)
+            self.assertEqual(login_mock.call_count, 3)
+
+            # token stores implement load, save and delete
+            with self.assertRaises(TypeError):
+                TokenStore()
+
+            revoke_mock = respx.post('https://dracoon.team/oauth/revoke').respond(200)
+            await first.logout()
+            self.assertTrue(revoke_mock.called)
+            self.assertIsNone(await FileTokenStore(token_file).load(second.token_key))
+
+    @respx.mock
+    async def test_client_token_store_refresh(self):
+        token_store = MemoryTokenStore()
+        refreshed_json = {**self.login_json, 'access_token': 'refreshed_token', 'refresh_token': 'refreshed_refresh_token'}
+        login_mock = respx.post('https://dracoon.team/oauth/token').respond(200, json=self.login_json)
+
+        first = DRACOONClient(base_url='https://dracoon.team', token_store=token_store)
+        second = DRACOONClient(base_url='https://dracoon.team', token_store=token_store)
+        await first.connect(OAuth2ConnectionType.password_flow, username='test_user', password='test_password')
+        await second.connect(OAuth2ConnectionType.password_flow, username='test_user', password='test_password', reuse_stored=True)
+        self.assertEqual(login_mock.call_count, 1)
+
+        # expired access token is refreshed once (stored refresh token)
+        stored = await token_store.load(first.token_key)
+        stored.connected_at = datetime.now() - timedelta(seconds=stored.access_token_validity)
+        login_mock.respond(200, json=refreshed_json)
+
+        await first.connect(OAuth2ConnectionType.refresh_token)
+        await second.connect(OAuth2ConnectionType.refresh_token)
+
+        self.assertEqual(login_mock.call_count, 2)
+        self.assertIn(b'grant_type=refresh_token', login_mock.calls.last.request.content)
+        self.assertEqual(first.connection.access_token, 'refreshed_token')
+        self.assertEqual(second.connection.access_token, 'refreshed_token')
+        self.assertTrue(await second.check_access_token())
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,141 @@
+import unittest
+import respx
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+from dracoon import DRACOON, OAuth2ConnectionType
+from dracoon.errors import ClientDisconnectedError
+from dracoon.instance import InstanceInfoCache
+from dracoon.nodes import DRACOONNodes
+from dracoon.public.responses import SystemInfo
+from dracoon.reports.responses import Report
+
+CLIENT_ID = 'client_id'
+CLIENT_SECRET = 'client_secret'
+BASE_URL = 'https://dracoon.team'
+
+
+class TestAsyncDRACOON(unittest.IsolatedAsyncioTestCase):
+
+    @respx.mock
+    async def asyncSetUp(self) -> None:
+        self.dracoon = DRACOON(base_url=BASE_URL, client_id=CLIENT_ID, client_secret=CLIENT_SECRET, raise_on_err=True, log_file_out=False)
+
+        with open('tests/responses/auth/auth_ok.json', 'r') as json_file:
+            self.login_json = json.load(json_file)
+            login_mock = respx.post(
+                f'{BASE_URL}/oauth/token').respond(200, json=self.login_json)
+            await self.dracoon.connect(username='test_user', password='test_password', connection_type=OAuth2ConnectionType.password_flow, 
+                                       full_info=False)
+
+            assert login_mock.called
+
+            return await super().asyncSetUp()
+
+    def setUp(self) -> None:
+
+        with open('tests/responses/system/system_info_ok.json', 'r') as json_file:
+            self.system_info_json = json.load(json_file)
+
+        return super().setUp()
+
+    @respx.mock
+    async def test_adapters_cached(self):
+        nodes = self.dracoon.nodes
+        assert isinstance(nodes, DRACOONNodes)
+        assert self.dracoon.nodes is nodes
+        assert self.dracoon.users is self.dracoon.users
+
+        # new adapters after reconnect
+        respx.post(f'{BASE_URL}/oauth/token').respond(200, json=self.login_json)
+        await self.dracoon.connect(username='test_user', password='test_password', connection_type=OAuth2ConnectionType.password_flow, 
+                                   full_info=False)
+        assert self.dracoon.nodes is not nodes
+
+    async def test_adapters_disconnected(self):
+        self.dracoon.client.connection = None
+
+        with self.assertRaises(ClientDisconnectedError):
+            self.dracoon.nodes
+
+    @respx.mock
+    async def test_get_system_info(self):
+        system_info_mock = respx.get(f'{BASE_URL}/api/v4/public/system/info').respond(200, json=self.system_info_json)
+        assert self.dracoon.system_info is None
+
+        system_info = await self.dracoon.get_system_info()
+        assert system_info_mock.call_count == 1
+        assert system_info.useS3Storage == True
+        assert self.dracoon.system_info is system_info
+
+        # cached
+        system_info = await self.dracoon.get_system_info()
+        assert system_info_mock.call_count == 1
+
+        system_info = await self.dracoon.get_system_info(refresh=True)
+        assert system_info_mock.call_count == 2
+
+    @respx.mock
+    async def test_get_system_info_persisted(self):
+        system_info_mock = respx.get(f'{BASE_URL}/api/v4/public/system/info').respond(200, json=self.system_info_json)
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            cache_file = os.path.join(tmp_dir, 'dracoon_info.json')
+            first_run = DRACOON(base_url=BASE_URL, client_id=CLIENT_ID, client_secret=CLIENT_SECRET, info_cache_file=cache_file)
+            first_run.client = self.dracoon.client
+            await first_run.get_system_info()
+            assert system_info_mock.call_count == 1
+
+            second_run = DRACOON(base_url=BASE_URL, client_id=CLIENT_ID, client_secret=CLIENT_SECRET, info_cache_file=cache_file)
+            second_run.client = self.dracoon.client
+            system_info = await second_run.get_system_info()
+            assert system_info_mock.call_count == 1
+            assert system_info.useS3Storage == True
+            assert system_info.s3Hosts == ['string']
+
+            expired_run = DRACOON(base_url=BASE_URL, client_id=CLIENT_ID, client_secret=CLIENT_SECRET, info_cache_file=cache_file, info_ttl=0)
+            expired_run.client = self.dracoon.client
+            await expired_run.get_system_info()
+            assert system_info_mock.call_count == 2
+
+    @respx.mock
+    async def test_get_report_files(self):
+        with open('tests/responses/nodes/nodes_ok.json', 'r') as json_file:
+            nodes_json = json.load(json_file)
+        node_json = nodes_json['items'][0]
+        nodes_json['range']['total'] = 2
+        nodes_json['items'] = [{**node_json, 'id': 3, 'type': 'file', 'name': 'Audit|Q1: users.csv'},
+                               {**node_json, 'id': 4, 'type': 'file', 'name': 'Audit Q1 users.csv'}]
+        nodes_mock = respx.get(url__startswith=f'{BASE_URL}/api/v4/nodes').respond(200, json=nodes_json)
+
+        report = Report(id=1, name='audit|Q1: users', target={'id': 2})
+        files = await self.dracoon.get_report_files(report=report)
+
+        # filter separators in report name are not sent
+        assert nodes_mock.calls.last.request.url.params['filter'] == 'type:eq:file|name:cn:audit'
+        assert [file.id for file in files] == [3]
+
+    def test_lazy_imports(self):
+        # adapters and crypto are imported on first use
+        code = ("import sys, dracoon; dracoon.DRACOON(base_url='https://dracoon.team'); "
+                "print(sorted(m for m in ['dracoon.nodes', 'dracoon.crypto', 'cryptography'] if m in sys.modules))")
+        res = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+        assert res.stdout.strip() == '[]'
+
+    def test_instance_info_cache_none(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            cache_file = os.path.join(tmp_dir, 'dracoon_info.json')
+            instance_info = InstanceInfoCache(base_url=BASE_URL, file_path=cache_file)
+
+            # missing information is not cached (fetched again)
+            instance_info.set(name='system_info', value=None)
+            assert instance_info.get(name='system_info', model=SystemInfo) is None
+            instance_info.save()
+
+            with open(cache_file, 'w') as cache:
+                json.dump({BASE_URL: {'system_info': {'fetched_at': 0}}}, cache)
+            assert InstanceInfoCache(base_url=BASE_URL, file_path=cache_file, ttl=10**10).get(name='system_info', model=SystemInfo) is None
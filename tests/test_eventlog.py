@@ -0,0 +1,241 @@
+import unittest
+import respx
+import httpx
+
+import json
+import os
+import tempfile
+from datetime import datetime, timedelta, timezone
+
+from dracoon.client import DRACOONClient, OAuth2ConnectionType
+from dracoon.eventlog import DRACOONEvents
+from dracoon.eventlog.audit import ManagerCountAggregation, PermissionAggregation, UserRoomCountAggregation
+from dracoon.eventlog.export import EventExport
+from dracoon.eventlog.tailer import EventTailer
+from dracoon.errors import DRACOONHttpError
+
+CLIENT_ID = 'client_id'
+CLIENT_SECRET = 'client_secret'
+BASE_URL = 'https://dracoon.team'
+DEFAULT_STRING = 'string'
+
+
+class ChunkedStream(httpx.AsyncByteStream):
+    """ response content received in chunks """
+
+    def __init__(self, chunks):
+        self.chunks = chunks
+
+    async def __aiter__(self):
+        for chunk in self.chunks:
+            yield chunk
+
+
+class TestAsyncDRACOONEvents(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self) -> None:
+
+        with open('tests/responses/eventlog/permissions_ok.json', 'r') as json_file:
+            self.permissions_json = json.load(json_file)
+
+        return super().setUp()
+
+    @respx.mock
+    async def asyncSetUp(self) -> None:
+        self.client = DRACOONClient(
+            base_url=BASE_URL, client_id=CLIENT_ID, client_secret=CLIENT_SECRET, raise_on_err=True)
+        with open('tests/responses/auth/auth_ok.json', 'r') as json_file:
+            login_json = json.load(json_file)
+            login_mock = respx.post(
+                f'{BASE_URL}/oauth/token').respond(200, json=login_json)
+            await self.client.connect(username='test_user', password='test_password', connection_type=OAuth2ConnectionType.password_flow)
+
+            assert login_mock.called
+            assert self.client.connected
+
+            self.eventlog = DRACOONEvents(self.client)
+
+            return await super().asyncSetUp()
+
+    def assert_permissions(self, permissions) -> None:
+        assert len(permissions) == 2
+        node_permissions = permissions[0]
+        assert node_permissions.nodeId == 1
+        assert node_permissions.nodeName == DEFAULT_STRING
+        assert node_permissions.nodeCntChildren == 2
+        assert len(node_permissions.auditUserPermissionList) == 1
+        user_permissions = node_permissions.auditUserPermissionList[0]
+        assert user_permissions.userId == 3
+        assert user_permissions.userLogin == DEFAULT_STRING
+        assert user_permissions.permissions.manage == True
+        assert permissions[1].nodeId == 2
+        assert permissions[1].nodeName == 'string "]},'
+        assert permissions[1].auditUserPermissionList == []
+
+    @respx.mock
+    async def test_get_permissions(self):
+        get_permissions_mock = respx.get(
+            f'{BASE_URL}/api/v4/eventlog/audits/nodes?offset=0').respond(200, json=self.permissions_json)
+        permissions = await self.eventlog.get_permissions()
+        assert get_permissions_mock.called
+        self.assert_permissions(permissions)
+
+    @respx.mock
+    async def test_stream_permissions(self):
+        content = json.dumps(self.permissions_json).encode('utf-8')
+        # response received in small chunks
+        chunks = [content[i:i + 16] for i in range(0, len(content), 16)]
+        get_permissions_mock = respx.get(
+            f'{BASE_URL}/api/v4/eventlog/audits/nodes?offset=0&filter=nodeId%3Aeq%3A1').mock(return_value=httpx.Response(200, stream=ChunkedStream(chunks)))
+        permissions = [node_permissions async for node_permissions in self.eventlog.stream_permissions(filter='nodeId:eq:1')]
+        assert get_permissions_mock.called
+        self.assert_permissions(permissions)
+
+    @respx.mock
+    async def test_crawl_rooms(self):
+        def room(node_id: int, parent_id: int, children: int):
+            return {'nodeId': node_id, 'nodeName': DEFAULT_STRING, 'nodeParentId': parent_id, 'countChildren': children}
+
+        # room 1 has two pages of subrooms, room 2 has no subrooms
+        pages = {
+            ('0', '0'): {'range': {'offset': 0, 'limit': 500, 'total': 2}, 'items': [room(1, 0, 2), room(2, 0, 0)]},
+            ('1', '0'): {'range': {'offset': 0, 'limit': 500, 'total': 501}, 'items': [room(3, 1, 0)]},
+            ('1', '500'): {'range': {'offset': 500, 'limit': 500, 'total': 501}, 'items': [room(4, 1, 0)]}
+        }
+
+        def get_rooms(request: httpx.Request):
+            params = request.url.params
+            return httpx.Response(200, json=pages[(params['parent_id'], params['offset'])])
+
+        get_rooms_mock = respx.get(url__startswith=f'{BASE_URL}/api/v4/eventlog/audits/node_info').mock(side_effect=get_rooms)
+
+        rooms = [room async for room in self.eventlog.crawl_rooms(concurrency=2)]
+        assert get_rooms_mock.call_count == 3
+        assert sorted(room.nodeId for room in rooms) == [1, 2, 3, 4]
+        # parents are returned before subrooms
+        assert [room.nodeId for room in rooms][:2] == [1, 2]
+
+    @respx.mock
+    async def test_iter_permissions(self):
+        def get_permissions(request: httpx.Request):
+            offset = int(request.url.params['offset'])
+            return httpx.Response(200, json=self.permissions_json[offset:offset + 1])
+
+        get_permissions_mock = respx.get(
+            url__regex=rf'{BASE_URL}/api/v4/eventlog/audits/nodes\?offset=\d+&filter=permissionsManage%3Aeq%3Atrue&limit=1').mock(side_effect=get_permissions)
+
+        last_admin_rooms = ManagerCountAggregation(count=1, user_id=3)
+        user_rooms = UserRoomCountAggregation(permission='manage')
+        permissions = [node_permissions async for node_permissions in self.eventlog.iter_permissions(
+            filter='permissionsManage:eq:true', page_size=1, concurrency=2, hooks=[last_admin_rooms, user_rooms])]
+
+        # pages are requested until a page is incomplete
+        assert get_permissions_mock.call_count == 4
+        self.assert_permissions(permissions)
+        assert [room.nodeId for room in last_admin_rooms.rooms] == [1]
+        assert user_rooms.rooms == {3: 1}
+
+        # failed page is raised (audit would be incomplete)
+        self.client.raise_on_err = False
+        self.eventlog.raise_on_err = False
+        get_permissions_mock.side_effect = lambda request: (httpx.Response(403, json={}) if request.url.params['offset'] == '1'
+                                                            else get_permissions(request))
+        with self.assertRaises(DRACOONHttpError):
+            [node_permissions async for node_permissions in self.eventlog.iter_permissions(
+                filter='permissionsManage:eq:true', page_size=1, concurrency=2)]
+
+        # aggregations implement add
+        with self.assertRaises(TypeError):
+            PermissionAggregation()
+
+    @respx.mock
+    async def test_event_tailer(self):
+        def event(event_id: int, time: str):
+            return {'id': event_id, 'time': time, 'userId': 1, 'message': DEFAULT_STRING}
+
+        first_json = {'range': {'offset': 0, 'limit': 500, 'total': 2},
+                      'items': [event(1, '2024-01-01T10:00:00.000Z'), event(2, '2024-01-01T10:01:00.000Z')]}
+        # overlap contains already processed event
+        second_json = {'range': {'offset': 0, 'limit': 500, 'total': 2},
+                       'items': [event(2, '2024-01-01T10:01:00.000Z'), event(3, '2024-01-01T10:02:00.000Z')]}
+
+        events_mock = respx.get(url__startswith=f'{BASE_URL}/api/v4/eventlog/events').respond(200, json=first_json)
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            checkpoint_path = os.path.join(tmp_dir, 'checkpoint.json')
+            # naive start time is UTC
+            tailer = EventTailer(self.eventlog, checkpoint_path=checkpoint_path, start_time=datetime(2024, 1, 1))
+
+            pages = [page async for page in tailer.poll()]
+            assert [[event.id for event in page] for page in pages] == [[1, 2]]
+            params = events_mock.calls.last.request.url.params
+            assert params['date_start'] == '2023-12-31T23:55:00.000000Z'
+            assert params['sort'] == 'time:asc'
+
+            events_mock.respond(200, json=second_json)
+            pages = [page async for page in tailer.poll()]
+            assert [[event.id for event in page] for page in pages] == [[3]]
+
+            # checkpoint is persisted
+            restored_tailer = EventTailer(self.eventlog, checkpoint_path=checkpoint_path)
+            assert restored_tailer.checkpoint == datetime(2024, 1, 1, 10, 2, tzinfo=timezone.utc)
+            assert [page async for page in restored_tailer.poll()] == []
+
+            # events are delivered page by page - checkpoint is committed per page
+            def get_events(request: httpx.Request):
+                offset = int(request.url.params['offset'])
+                items = [event(4, '2024-01-01T10:03:00.000Z'), event(5, '2024-01-01T10:04:00.000Z')][offset:offset + 1]
+                return httpx.Response(200, json={'range': {'offset': offset, 'limit': 1, 'total': 2}, 'items': items})
+
+            events_mock.side_effect = get_events
+            checkpoints = []
+            async for page in tailer.poll():
+                assert len(page) == 1
+                checkpoints.append(EventTailer(self.eventlog, checkpoint_path=checkpoint_path).checkpoint)
+            assert events_mock.calls.last.request.url.params['offset'] == '1'
+            assert checkpoints == [datetime(2024, 1, 1, 10, 2, tzinfo=timezone.utc), datetime(2024, 1, 1, 10, 3, tzinfo=timezone.utc)]
+            assert tailer.checkpoint == datetime(2024, 1, 1, 10, 4, tzinfo=timezone.utc)
+
+        # poll interval is doubled without events
+        assert tailer.next_interval(0) == tailer.min_interval * 2
+        assert tailer.next_interval(1) == tailer.min_interval
+
+    @respx.mock
+    async def test_event_export(self):
+        failed_days = ['03']
+
+        def get_events(request: httpx.Request):
+            day = request.url.params['date_start'][8:10]
+            if day in failed_days:
+                return httpx.Response(403, json={})
+            # events at slice borders are returned by both slices
+            items = [{'id': int(day) * 10, 'time': f'2024-01-{day}T00:00:00.000Z', 'userId': 1, 'message': DEFAULT_STRING},
+                     {'id': int(day) * 10 + 1, 'time': f'2024-01-{day}T10:00:00.000Z', 'userId': 1, 'message': DEFAULT_STRING},
+                     {'id': (int(day) + 1) * 10, 'time': f'2024-01-{int(day) + 1:02d}T00:00:00.000Z', 'userId': 1, 'message': DEFAULT_STRING}]
+            return httpx.Response(200, json={'range': {'offset': 0, 'limit': 500, 'total': 3}, 'items': items})
+
+        events_mock = respx.get(url__startswith=f'{BASE_URL}/api/v4/eventlog/events').mock(side_effect=get_events)
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            file_path = os.path.join(tmp_dir, 'events.jsonl')
+
+            def make_export():
+                return EventExport(self.eventlog, date_start=datetime(2024, 1, 1), date_end=datetime(2024, 1, 4), file_path=file_path,
+                                   slice_size=timedelta(days=1), concurrency=2)
+
+            with self.assertRaises(DRACOONHttpError):
+                await make_export().run()
+
+            with open(file_path + '.manifest.json', 'r') as manifest_file:
+                assert json.load(manifest_file)['completed'] == 2
+
+            # export is resumed with failed slice
+            failed_days.clear()
+            call_count = events_mock.call_count
+            count = await make_export().run()
+
+            assert events_mock.call_count == call_count + 1
+            assert count == 6
+            with open(file_path, 'r') as export_file:
+                events = [json.loads(line) for line in export_file]
+            assert [event['id'] for event in events] == [10, 11, 20, 21, 30, 31]
@@ -1,5 +1,6 @@
 import unittest
 import respx
+import httpx
 
 import json
 from datetime import datetime
@@ -24,6 +25,9 @@ class TestAsyncDRACOONGroups(unittest.IsolatedAsyncioTestCase):
         with open('tests/responses/groups/group_ok.json', 'r') as json_file:
             self.group_json = json.load(json_file)
 
+        with open('tests/responses/groups/group_users_ok.json', 'r') as json_file:
+            self.group_users_json = json.load(json_file)
+
         return super().setUp()
 
     def assert_group(self, group) -> None:
@@ -155,3 +159,41 @@ class TestAsyncDRACOONGroups(unittest.IsolatedAsyncioTestCase):
             f'{BASE_URL}/api/v4/groups/{group_id}').respond(204)
         group = await self.groups.delete_group(group_id)
         assert group_mock.called
+
+    @respx.mock
+    async def test_sync_group_members(self):
+        group_id = 1
+        users_mock = respx.get(
+            f'{BASE_URL}/api/v4/groups/{group_id}/users?offset=0&filter=isMember%3Aeq%3Atrue&limit=500').respond(200, json=self.group_users_json)
+        add_mock = respx.post(f'{BASE_URL}/api/v4/groups/{group_id}/users').respond(200, json=self.group_json)
+        delete_mock = respx.delete(f'{BASE_URL}/api/v4/groups/{group_id}/users').respond(200, json=self.group_json)
+
+        result = await self.groups.sync_group_members(group_id=group_id, desired_user_ids=[2, 3, 4, 5], batch_size=2)
+        assert users_mock.called
+        assert result.added == [3, 4, 5]
+        assert result.removed == [1]
+        assert add_mock.call_count == 2
+        assert json.loads(add_mock.calls[0].request.content) == {'ids': [3, 4]}
+        assert json.loads(delete_mock.calls.last.request.content) == {'ids': [1]}
+
+        # users of failed batches are not reported as added / removed
+        self.client.raise_on_err = False
+        self.groups.raise_on_err = False
+        add_mock.side_effect = [httpx.Response(403), httpx.Response(200, json=self.group_json)]
+        result = await self.groups.sync_group_members(group_id=group_id, desired_user_ids=[2, 3, 4, 5], batch_size=2)
+        assert result.added == [5]
+        assert result.addFailed == [3, 4]
+        assert result.removed == [1]
+        assert result.removeFailed == []
+        add_mock.side_effect = None
+        add_call_count = add_mock.call_count
+        self.client.raise_on_err = True
+        self.groups.raise_on_err = True
+
+        # failed groups are returned as exception
+        respx.get(f'{BASE_URL}/api/v4/groups/2/users?offset=0&filter=isMember%3Aeq%3Atrue&limit=500').respond(404)
+        results = await self.groups.sync_groups_members({group_id: [1, 2], 2: [1]}, dry_run=True)
+        assert results[0].added == []
+        assert results[0].removed == []
+        assert isinstance(results[1], Exception)
+        assert add_mock.call_count == add_call_count
@@ -1,14 +1,26 @@
 import unittest
 import respx
 import asyncio
+import httpx
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from unittest.mock import patch
 
+import copy
 import json
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 
+from dracoon import crypto
 from dracoon.client import DRACOONClient, OAuth2ConnectionType
 from dracoon.nodes import DRACOONNodes
-from dracoon.nodes.models import NodeType
-from dracoon.crypto.models import FileKeyVersion
+from dracoon.nodes.index import NodeIndex
+from dracoon.nodes.permissions import RoomPermissionEngine
+from dracoon.nodes.recyclebin import RecycleBin, is_deleted_before, is_larger_than
+from dracoon.nodes.rekey import FileKeyRekey
+from dracoon.nodes.models import Node, NodeType
+from dracoon.crypto.models import FileKey, FileKeyVersion, UserKeyPairVersion
+from dracoon.errors import HTTPForbiddenError
 
 CLIENT_ID = 'client_id'
 CLIENT_SECRET = 'client_secret'
@@ -49,6 +61,9 @@ class TestAsyncDRACOONNodes(unittest.IsolatedAsyncioTestCase):
         with open('tests/responses/nodes/room_groups_ok.json', 'r') as json_file:
             self.room_groups_json = json.load(json_file)
 
+        with open('tests/responses/nodes/room_users_ok.json', 'r') as json_file:
+            self.room_users_json = json.load(json_file)
+
         return super().setUp()
 
     def assert_node(self, node, is_folder: bool = False) -> None:
@@ -135,6 +150,26 @@ class TestAsyncDRACOONNodes(unittest.IsolatedAsyncioTestCase):
         node = nodes.items[0]
         self.assert_node(node)
 
+    @respx.mock
+    async def test_get_nodes_compact(self):
+        get_nodes_mock = respx.get(
+            f'{BASE_URL}/api/v4/nodes?offset=0&parent_id=0&room_manager=false').respond(200, json=self.nodes_json)
+        nodes = await self.nodes.get_nodes(compact=True)
+        assert get_nodes_mock.called
+        assert nodes.range.total == 1
+        assert len(nodes.items) == 1
+        node = nodes.items[0]
+        assert not isinstance(node, Node)
+        self.assert_node(node)
+        assert node.createdAt == node.to_model().createdAt
+        self.assert_node(node.to_model())
+
+        # compact list is serialized as full list
+        full_nodes = await self.nodes.get_nodes()
+        assert nodes.model_dump_json() == full_nodes.model_dump_json()
+        assert nodes.model_dump() == full_nodes.model_dump()
+        assert node.model_dump_json() == full_nodes.items[0].model_dump_json()
+
     @respx.mock
     async def test_get_nodes_with_room_manager(self):
         get_nodes_mock = respx.get(
@@ -213,6 +248,82 @@ class TestAsyncDRACOONNodes(unittest.IsolatedAsyncioTestCase):
         await self.nodes.delete_node(node_id=node_id)
         assert delete_node_mock.called
 
+    @respx.mock
+    async def test_get_node_from_path(self):
+        search_mock = respx.get(url__startswith=f'{BASE_URL}/api/v4/nodes/search').respond(200, json=self.nodes_json)
+        node = await self.nodes.get_node_from_path(path='/parent/string/')
+        assert search_mock.call_count == 1
+        self.assert_node(node)
+
+        # cached
+        node = await self.nodes.get_node_from_path(path='/parent/string')
+        assert search_mock.call_count == 1
+        self.assert_node(node)
+
+        # invalidated by delete
+        delete_node_mock = respx.delete(f'{BASE_URL}/api/v4/nodes/{node.id}').respond(204)
+        await self.nodes.delete_node(node_id=node.id)
+        assert delete_node_mock.called
+        node = await self.nodes.get_node_from_path(path='/parent/string/')
+        assert search_mock.call_count == 2
+
+        # not cached
+        node = await self.nodes.get_node_from_path(path='/parent/string/', use_cache=False)
+        assert search_mock.call_count == 3
+
+    @respx.mock
+    async def test_get_node_from_path_cached_parent(self):
+        parent = Node(**{ **self.nodes_json["items"][0], "id": 99 })
+        self.nodes.path_cache.put(node=parent, path='/parent')
+
+        search_mock = respx.get(
+            f'{BASE_URL}/api/v4/nodes/search?search_string=string&parent_id=99&depth_level=0').respond(200, json=self.nodes_json)
+        node = await self.nodes.get_node_from_path(path='/parent/string')
+        assert search_mock.called
+        self.assert_node(node)
+        assert self.nodes.path_cache.get('/parent/string/').id == node.id
+
+    @respx.mock
+    async def test_get_node_from_path_cached_ancestor(self):
+        room = Node(**{ **self.nodes_json["items"][0], "id": 99 })
+        self.nodes.path_cache.put(node=room, path='/Room')
+
+        item = self.nodes_json["items"][0]
+        search_json = {**self.nodes_json, "items": [{ **item, "id": 3, "name": "file.txt.bak", "parentPath": "/Room/Folder/" },
+                                                    { **item, "id": 4, "name": "file.txt", "parentPath": "/Room/Other/" },
+                                                    { **item, "id": 5, "name": "file.txt", "parentPath": "/Room/Folder/" }]}
+        search_mock = respx.get(
+            f'{BASE_URL}/api/v4/nodes/search?search_string=File.TXT&parent_id=99&depth_level=1').respond(200, json=search_json)
+
+        # longest cached part of path is searched, names are case-insensitive
+        node = await self.nodes.get_node_from_path(path='/room/folder/File.TXT')
+        assert search_mock.call_count == 1
+        assert node.id == 5
+
+        node = await self.nodes.get_node_from_path(path='/ROOM/Folder/file.txt')
+        assert search_mock.call_count == 1
+        assert node.id == 5
+
+    @respx.mock
+    async def test_path_cache_invalidation(self):
+        base = self.nodes_json["items"][0]
+        target = { **base, "id": 4, "type": "folder", "name": "target", "parentPath": "/room/" }
+        self.nodes.path_cache.put(node=Node(**{ **base, "id": 3, "type": "file" }), path='/room/target/file')
+        self.nodes.path_cache.put(node=Node(**{ **base, "id": 6, "type": "file" }), path='/other/file')
+
+        # nodes below target might be replaced by copy (path of target from response)
+        respx.post(f'{BASE_URL}/api/v4/nodes/4/copy_to').respond(200, json=target)
+        copy_node = self.nodes.make_node_transfer(items=[self.nodes.make_node_item(node_id=5)], resolution_strategy='overwrite')
+        await self.nodes.copy_nodes(target_id=4, copy_node=copy_node)
+        assert self.nodes.path_cache.get('/room/target/file') is None
+        assert self.nodes.path_cache.get('/other/file').id == 6
+
+        # deleted (uncached) folder might be an ancestor of cached nodes
+        self.nodes.path_cache.put(node=Node(**{ **base, "id": 3, "type": "file" }), path='/room/target/file')
+        respx.delete(f'{BASE_URL}/api/v4/nodes/4').respond(204)
+        await self.nodes.delete_node(node_id=4)
+        assert len(self.nodes.path_cache) == 0
+
     @respx.mock
     async def test_copy_nodes(self):
         parent_id = 2
@@ -464,13 +575,282 @@ class TestAsyncDRACOONNodes(unittest.IsolatedAsyncioTestCase):
         assert len(nodes.items) == 1
         node = nodes.items[0]
         self.assert_node(node)
-    
-
-
 
+    @respx.mock
+    async def test_wait_for_s3_uploads(self):
+        with open('tests/responses/upload/upload_status_ok.json', 'r') as json_file:
+            upload_status_json = json.load(json_file)
+        with open('tests/responses/upload/upload_status_pending_ok.json', 'r') as json_file:
+            upload_status_pending_json = json.load(json_file)
+
+        first_status_mock = respx.get(f'{BASE_URL}/api/v4/nodes/files/uploads/first').respond(200, json=upload_status_json)
+        second_status_mock = respx.get(f'{BASE_URL}/api/v4/nodes/files/uploads/second')
+        second_status_mock.side_effect = [httpx.Response(200, json=upload_status_pending_json), httpx.Response(200, json=upload_status_json)]
+
+        upload_status = await self.nodes.wait_for_s3_uploads(upload_ids=['first', 'second', 'first'])
+        assert first_status_mock.call_count == 1
+        assert second_status_mock.call_count == 2
+        assert len(upload_status) == 2
+        assert upload_status['first'].status == 'done'
+        assert upload_status['second'].status == 'done'
+        assert upload_status['second'].node is not None
+
+    @respx.mock
+    async def test_wait_for_s3_uploads_error(self):
+        respx.get(f'{BASE_URL}/api/v4/nodes/files/uploads/failed').respond(403)
+
+        with self.assertRaises(HTTPForbiddenError):
+            await self.nodes.wait_for_s3_uploads(upload_ids=['failed'], raise_on_err=True)
+
+        # failed status check is returned as error status
+        self.client.raise_on_err = False
+        self.nodes.raise_on_err = False
+        upload_status = await self.nodes.wait_for_s3_uploads(upload_ids=['failed'], raise_on_err=False)
+        assert upload_status['failed'].status == 'error'
+
+        # connection errors are returned as error status (status is checked by adapter of client)
+        with patch.object(DRACOONNodes, 'check_s3_upload', side_effect=ConnectionError()):
+            upload_status = await DRACOONNodes(self.client).wait_for_s3_uploads(upload_ids=['unreachable'])
+            assert upload_status['unreachable'].status == 'error'
+
+            with self.assertRaises(ConnectionError):
+                await self.nodes.wait_for_s3_uploads(upload_ids=['unreachable'], raise_on_err=True)
+
+    @respx.mock
+    async def test_node_index(self):
+        base = self.nodes_json["items"][0]
+        room = { **base, "id": 1, "type": "room", "name": "room", "parentId": None, "parentPath": "/" }
+        folder = { **base, "id": 2, "type": "folder", "name": "folder", "parentId": 1, "parentPath": "/room/" }
+        file = { **base, "id": 3, "type": "file", "name": "file.txt", "parentId": 2, "parentPath": "/room/folder/" }
+        nodes_json = { "range": { "offset": 0, "limit": 500, "total": 3 }, "items": [room, folder, file] }
+
+        search_mock = respx.get(
+            f'{BASE_URL}/api/v4/nodes/search?search_string=%2A&offset=0&parent_id=0&depth_level=-1&limit=500').respond(200, json=nodes_json)
+
+        index = NodeIndex(self.nodes)
+        await index.load()
+        assert search_mock.called
+        assert len(index) == 3
+        assert index.get(3).name == 'file.txt'
+        assert index.get_by_path('/room/folder/').id == 2
+        assert [node.id for node in index.get_children(1)] == [2]
+        assert sorted(node.id for node in index.iter_subtree(1)) == [1, 2, 3]
+
+        # folder renamed
+        renamed_folder = { **folder, "name": "renamed" }
+        refresh_json = { "range": { "offset": 0, "limit": 500, "total": 1 }, "items": [renamed_folder] }
+        refresh_mock = respx.get(url__regex=rf'{BASE_URL}/api/v4/nodes/search\?.*filter=updatedAt%3Age%3A.*').respond(200, json=refresh_json)
         
+        updated = await index.refresh()
+        assert refresh_mock.called
+        assert updated == 1
+        assert index.get_by_path('/room/folder') is None
+        assert index.get_by_path('/room/renamed/file.txt').id == 3
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            db_path = os.path.join(tmp_dir, 'index.db')
+            index.save(db_path)
+            restored_index = NodeIndex(self.nodes)
+            restored_index.restore(db_path)
+
+        assert len(restored_index) == 3
+        assert restored_index.get_by_path('/room/renamed/file.txt').id == 3
+        assert restored_index.refreshed_at == index.refreshed_at
+
+        index.remove(2)
+        assert len(index) == 1
+        assert index.get_children(1) == []
+
+    @respx.mock
+    async def test_node_index_refresh(self):
+        base = self.nodes_json["items"][0]
+        room = { **base, "id": 1, "type": "room", "name": "room", "parentId": None, "parentPath": "/" }
+        folder = { **base, "id": 2, "type": "folder", "name": "folder", "parentId": 1, "parentPath": "/room/" }
+        file = { **base, "id": 3, "type": "file", "name": "file", "parentId": 2, "parentPath": "/room/folder/" }
+        other = { **base, "id": 4, "type": "file", "name": "other", "parentId": 2, "parentPath": "/room/folder/" }
+
+        def nodes_page(items):
+            return { "range": { "offset": 0, "limit": 500, "total": len(items) }, "items": items }
+
+        search_mock = respx.get(
+            f'{BASE_URL}/api/v4/nodes/search?search_string=%2A&offset=0&parent_id=0&depth_level=-1&limit=500').respond(
+                200, json=nodes_page([room, folder, file, other]))
+
+        index = NodeIndex(self.nodes)
+        await index.load()
+        assert index.get_by_path('/Room/FOLDER/file').id == 3
+
+        # child updated before renamed parent keeps its new path
+        renamed_folder = { **folder, "name": "folder2" }
+        moved_file = { **file, "parentPath": "/room/folder2/" }
+        respx.get(url__regex=rf'{BASE_URL}/api/v4/nodes/search\?.*filter=updatedAt%3Age%3A.*').respond(
+            200, json=nodes_page([moved_file, renamed_folder]))
+
+        await index.refresh()
+        assert index.get_by_path('/room/folder2/file').id == 3
+        assert index.get_by_path('/room/folder2/other').id == 4
+        assert index.get_by_path('/room/folder/file') is None
+
+        # full refresh removes deleted nodes
+        search_mock.respond(200, json=nodes_page([room, renamed_folder, moved_file]))
+        await index.refresh(full=True)
+        assert 4 not in index
+        assert index.get_by_path('/room/folder2/other') is None
+        assert index.get_by_path('/room/folder2/file').id == 3
+
+    @respx.mock
+    async def test_room_permission_engine(self):
+        users_mock = respx.get(url__regex=rf'{BASE_URL}/api/v4/nodes/rooms/\d+/users\?offset=0&filter=isGranted%3Aeq%3Atrue&limit=500').respond(
+            200, json=self.room_users_json)
+        groups_mock = respx.get(url__regex=rf'{BASE_URL}/api/v4/nodes/rooms/\d+/groups\?offset=0&filter=isGranted%3Aeq%3Atrue&limit=500').respond(
+            200, json=self.room_groups_json)
+        update_users_mock = respx.put(f'{BASE_URL}/api/v4/nodes/rooms/1/users').respond(204)
+        delete_groups_mock = respx.delete(f'{BASE_URL}/api/v4/nodes/rooms/1/groups').respond(204)
+
+        admin = self.nodes.make_permissions(manage=True, delete_recycle_bin=True)
+        read_only = self.nodes.make_permissions(manage=False, create=False, change=False, delete=False, manage_shares=False,
+                                                manage_file_requests=False, restore_recycle_bin=False)
+        desired = {
+            1: {'users': {3: admin, 4: read_only}, 'groups': {3: None}},
+            2: {'users': {3: admin}}
+        }
 
-
-
-
-    
\ No newline at end of file
+        engine = RoomPermissionEngine(self.nodes)
+        room_diffs = await engine.plan(desired)
+        assert users_mock.call_count == 2
+        assert groups_mock.call_count == 2
+        assert len(room_diffs) == 1
+        assert room_diffs[0].room_id == 1
+        assert [item.id for item in room_diffs[0].update_users] == [4]
+        assert room_diffs[0].delete_groups == [3]
+        assert room_diffs[0].delete_users == []
+
+        room_diffs = await engine.apply(desired)
+        assert update_users_mock.call_count == 1
+        assert json.loads(update_users_mock.calls.last.request.content)['items'][0]['id'] == 4
+        assert json.loads(delete_groups_mock.calls.last.request.content) == {'ids': [3]}
+        assert room_diffs[0].error is None
+
+        # users and groups not in desired state are removed
+        prune_engine = RoomPermissionEngine(self.nodes, prune=True)
+        room_diffs = await prune_engine.plan({2: {'users': {4: read_only}}})
+        assert room_diffs[0].delete_users == [3]
+        assert room_diffs[0].delete_groups == [3]
+
+    @respx.mock
+    async def test_file_key_rekey(self):
+        previous_keypair = crypto.create_plain_userkeypair(UserKeyPairVersion.RSA2048)
+        user_keypair = crypto.create_plain_userkeypair(UserKeyPairVersion.RSA2048)
+        plain_file_key = crypto.create_file_key()
+        file_key = crypto.encrypt_file_key(plain_file_key=plain_file_key, keypair=previous_keypair)
+
+        # file key of file 4 cannot be decrypted
+        missing_keys = copy.deepcopy(self.missing_keys_json)
+        missing_keys['items'].append({'userId': 2, 'fileId': 4})
+        missing_keys['users'][0]['publicKeyContainer'] = user_keypair.publicKeyContainer.model_dump()
+        missing_keys['files'][0]['fileKeyContainer'] = file_key.model_dump()
+        missing_keys['files'].append({'id': 4, 'fileKeyContainer': self.missing_keys_json['files'][0]['fileKeyContainer']})
+
+        missing_keys_mock = respx.get(url__startswith=f'{BASE_URL}/api/v4/nodes/missingFileKeys').mock(
+            side_effect=[httpx.Response(200, json=missing_keys), httpx.Response(200, json=self.missing_keys_empty_json)])
+        set_keys_mock = respx.post(f'{BASE_URL}/api/v4/nodes/files/keys').respond(204)
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            checkpoint_path = os.path.join(tmp_dir, 'rekey.json')
+            rekey = FileKeyRekey(self.nodes, previous_keypair, user_id=2, processes=0, checkpoint_path=checkpoint_path)
+            summary = await rekey.run()
+
+            with open(checkpoint_path, 'r') as checkpoint_file:
+                checkpoint = json.load(checkpoint_file)
+
+        assert summary == {'rekeyed': 1, 'failed': 1}
+        assert [file_id for file_id, _, _ in checkpoint['failed']] == [4]
+        assert missing_keys_mock.calls[0].request.url.params['use_key'] == 'previous_user_key'
+        # failed file key is skipped
+        assert missing_keys_mock.calls[1].request.url.params['offset'] == '1'
+
+        payload = json.loads(set_keys_mock.calls.last.request.content)
+        assert [(item['fileId'], item['userId']) for item in payload['items']] == [(3, 2)]
+        new_file_key = crypto.decrypt_file_key(file_key=FileKey(**payload['items'][0]['fileKey']), keypair=user_keypair)
+        assert new_file_key.key == plain_file_key.key
+
+    @respx.mock
+    async def test_file_key_rekey_processes(self):
+        previous_keypair = crypto.create_plain_userkeypair(UserKeyPairVersion.RSA2048)
+        user_keypair = crypto.create_plain_userkeypair(UserKeyPairVersion.RSA2048)
+        plain_file_key = crypto.create_file_key()
+
+        missing_keys = copy.deepcopy(self.missing_keys_json)
+        missing_keys['users'][0]['publicKeyContainer'] = user_keypair.publicKeyContainer.model_dump()
+        missing_keys['files'][0]['fileKeyContainer'] = crypto.encrypt_file_key(plain_file_key=plain_file_key,
+                                                                               keypair=previous_keypair).model_dump()
+
+        # set file key is still returned as missing
+        missing_keys_mock = respx.get(url__startswith=f'{BASE_URL}/api/v4/nodes/missingFileKeys').respond(200, json=missing_keys)
+        set_keys_mock = respx.post(f'{BASE_URL}/api/v4/nodes/files/keys').respond(204)
+
+        rekey = FileKeyRekey(self.nodes, previous_keypair, user_id=2, processes=1)
+        with patch('dracoon.nodes.rekey.ProcessPoolExecutor', wraps=ProcessPoolExecutor) as executor_mock:
+            summary = await rekey.run()
+
+        # crypto in worker process (shut down after run), no second rekey of the same key
+        assert executor_mock.call_count == 1
+        assert rekey.executor is None
+        assert summary == {'rekeyed': 1, 'failed': 0}
+        assert missing_keys_mock.call_count == 2
+        assert set_keys_mock.call_count == 1
+
+        payload = json.loads(set_keys_mock.calls.last.request.content)
+        new_file_key = crypto.decrypt_file_key(file_key=FileKey(**payload['items'][0]['fileKey']), keypair=user_keypair)
+        assert new_file_key.key == plain_file_key.key
+
+    @respx.mock
+    async def test_recycle_bin_scan_and_purge(self):
+        now = datetime.now(timezone.utc)
+
+        def make_version(node_id: int, name: str, days: int, size: int):
+            return {'id': node_id, 'parentId': 1, 'parentPath': '/room', 'type': 'file', 'name': name, 'size': size,
+                    'deletedAt': (now - timedelta(days=days)).isoformat()}
+
+        # names with reserved characters are encoded
+        versions = {
+            'Q&A #2.txt': [make_version(11, 'Q&A #2.txt', 400, 100), make_version(12, 'Q&A #2.txt', 1, 10)],
+            'b': [make_version(21, 'b', 40, 1000)]
+        }
+        summaries = [{'parentId': 1, 'parentPath': '/room', 'name': name, 'type': 'file', 'cntVersions': len(items),
+                      'firstDeletedAt': DEFAULT_DATE, 'lastDeletedAt': DEFAULT_DATE, 'lastDeletedNodeId': items[-1]['id']}
+                     for name, items in versions.items()]
+
+        def get_versions(request: httpx.Request):
+            assert request.url.params['type'] == 'file'
+            assert request.url.params['offset'] == '0'
+            items = versions[request.url.params['name']]
+            return httpx.Response(200, json={'range': {'offset': 0, 'limit': 500, 'total': len(items)}, 'items': items})
+
+        summaries_mock = respx.get(url__startswith=f'{BASE_URL}/api/v4/nodes/1/deleted_nodes?').respond(
+            200, json={'range': {'offset': 0, 'limit': 500, 'total': 2}, 'items': summaries})
+        respx.get(url__startswith=f'{BASE_URL}/api/v4/nodes/2/deleted_nodes?').respond(403)
+        versions_mock = respx.get(url__startswith=f'{BASE_URL}/api/v4/nodes/1/deleted_nodes/versions').mock(side_effect=get_versions)
+        purge_mock = respx.delete(f'{BASE_URL}/api/v4/nodes/deleted_nodes').respond(204)
+        restore_mock = respx.post(f'{BASE_URL}/api/v4/nodes/deleted_nodes/actions/restore').respond(204)
+
+        recycle_bin = RecycleBin(self.nodes, batch_size=1)
+        scan = await recycle_bin.scan(room_ids=[1, 2])
+
+        assert summaries_mock.called
+        assert versions_mock.call_count == 2
+        assert sorted(call.request.url.params['name'] for call in versions_mock.calls) == ['Q&A #2.txt', 'b']
+        assert list(scan.errors) == [2]
+        assert scan.count == 3
+        assert scan.size == 1110
+
+        buckets = scan.aggregate(ages=[timedelta(days=30), timedelta(days=365)], now=now)
+        assert [(bucket.count, bucket.size) for bucket in buckets] == [(1, 10), (1, 1000), (1, 100)]
+
+        results = await recycle_bin.purge(scan.select([is_deleted_before(timedelta(days=30), now=now)]))
+        assert purge_mock.call_count == 2
+        assert sorted(json.loads(call.request.content)['deletedNodeIds'][0] for call in purge_mock.calls) == [11, 21]
+        assert all(result.error is None for result in results)
+
+        await recycle_bin.restore(scan.select([is_larger_than(5), lambda node: node.name == 'Q&A #2.txt' and node.id != 11]), parent_id=3)
+        assert json.loads(restore_mock.calls.last.request.content) == {'deletedNodeIds': [12], 'parentId': 3}
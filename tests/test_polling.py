@@ -0,0 +1,71 @@
+import unittest
+import asyncio
+
+from dracoon.polling import CompletionWatcher
+
+
+class TestAsyncCompletionWatcher(unittest.IsolatedAsyncioTestCase):
+
+    async def test_wait_all(self):
+        checks = {}
+
+        async def check_fn(key: str):
+            checks[key] = checks.get(key, 0) + 1
+            # key is done after <key> checks
+            return checks[key] >= int(key)
+
+        watcher = CompletionWatcher(check_fn=check_fn, is_complete=lambda result: result, min_wait=0.01, max_wait=0.02)
+        results = await watcher.wait_all(['1', '3', '1'])
+
+        assert results == {'1': True, '3': True}
+        assert checks == {'1': 1, '3': 3}
+        assert watcher.pending == 0
+
+    async def test_wait_shared(self):
+        checks = []
+
+        async def check_fn(key: str):
+            checks.append(key)
+            return 'done'
+
+        watcher = CompletionWatcher(check_fn=check_fn, is_complete=lambda result: result == 'done', min_wait=0.01)
+        results = await asyncio.gather(watcher.wait('upload'), watcher.wait('upload'))
+
+        assert results == ['done', 'done']
+        assert checks == ['upload']
+
+    async def test_wait_error(self):
+
+        async def check_fn(key: str):
+            raise ValueError(key)
+
+        watcher = CompletionWatcher(check_fn=check_fn, is_complete=lambda result: True, min_wait=0.01)
+
+        with self.assertRaises(ValueError):
+            await watcher.wait('upload')
+
+        assert watcher.pending == 0
+
+    async def test_wait_is_complete_error(self):
+
+        async def check_fn(key: str):
+            return key
+
+        def is_complete(result):
+            raise KeyError(result)
+
+        watcher = CompletionWatcher(check_fn=check_fn, is_complete=is_complete, min_wait=0.01)
+
+        # waiters are resolved with the error (poller does not die)
+        results = await asyncio.wait_for(asyncio.gather(watcher.wait('first'), watcher.wait('second'), return_exceptions=True), timeout=1)
+
+        assert all(isinstance(result, KeyError) for result in results)
+        assert watcher.pending == 0
+
+    def test_next_wait_capped(self):
+        watcher = CompletionWatcher(check_fn=None, is_complete=None, max_wait=1, jitter=0.2)
+
+        for _ in range(100):
+            wait = watcher.next_wait(64)
+            assert 0.8 <= wait <= 1.2
+
@@ -0,0 +1,97 @@
+import unittest
+import respx
+import httpx
+
+import json
+
+from dracoon.client import DRACOONClient, OAuth2ConnectionType
+from dracoon.reports import DRACOONReports
+from dracoon.reports.models import ReportFormat
+from dracoon.reports.responses import ReportState
+
+CLIENT_ID = 'client_id'
+CLIENT_SECRET = 'client_secret'
+BASE_URL = 'https://dracoon.team'
+DEFAULT_STRING = 'string'
+
+
+class TestAsyncDRACOONReports(unittest.IsolatedAsyncioTestCase):
+
+    @respx.mock
+    async def asyncSetUp(self) -> None:
+        self.client = DRACOONClient(
+            base_url=BASE_URL, client_id=CLIENT_ID, client_secret=CLIENT_SECRET, raise_on_err=True)
+        with open('tests/responses/auth/auth_ok.json', 'r') as json_file:
+            login_json = json.load(json_file)
+            login_mock = respx.post(
+                f'{BASE_URL}/oauth/token').respond(200, json=login_json)
+            await self.client.connect(username='test_user', password='test_password', connection_type=OAuth2ConnectionType.password_flow)
+
+            assert login_mock.called
+            assert self.client.connected
+
+            self.reports = DRACOONReports(self.client)
+            self.reports.report_watcher.min_wait = 0.01
+            self.reports.report_watcher.max_wait = 0.01
+            self.reports.report_watcher.jitter = 0
+            self.reports.report_states_ttl = 0.005
+
+            return await super().asyncSetUp()
+
+    def make_reports(self, states):
+        items = [{'id': report_id, 'name': DEFAULT_STRING, 'state': state} for report_id, state in states.items()]
+        return {'pagination': {'offset': 0, 'limit': 500, 'total': len(items)}, 'items': items}
+
+    @respx.mock
+    async def test_get_reports(self):
+        reports_mock = respx.get(url__startswith=f'{BASE_URL}/reporting/api/reports').respond(200, json=self.make_reports({1: 'finished'}))
+
+        reports = await self.reports.get_reports(name='audit report', state='finished', enabled=True, limit=10)
+
+        assert reports.items[0].state == ReportState.finished
+        params = reports_mock.calls.last.request.url.params
+        assert params['name'] == 'audit report'
+        assert params['state'] == 'finished'
+        assert params['enabled'] == 'true'
+        assert params['limit'] == '10'
+
+    @respx.mock
+    async def test_create_report(self):
+        create_mock = respx.post(f'{BASE_URL}/reporting/api/reports').respond(201, json={'id': 1, 'name': DEFAULT_STRING, 'state': 'waiting'})
+
+        report = self.reports.make_report(name=DEFAULT_STRING, target_id=2, formats=[ReportFormat.csv])
+        created = await self.reports.create_report(report=report)
+
+        assert create_mock.called
+        assert created.id == 1
+        assert created.state == ReportState.waiting
+
+    @respx.mock
+    async def test_wait_for_reports(self):
+        rounds = [{1: 'waiting', 2: 'processing'},
+                  {1: 'finished', 2: 'processing'},
+                  {1: 'finished', 2: 'canceled', 3: 'finished'}]
+        polls = [0]
+
+        def get_reports(request: httpx.Request):
+            params = request.url.params
+            # one request per pending state and poll, generated reports are searched newest first
+            if params.get('state') == 'waiting':
+                polls[0] += 1
+            states = rounds[min(polls[0], len(rounds)) - 1]
+            if 'state' in params:
+                return httpx.Response(200, json=self.make_reports({report_id: state for report_id, state in states.items()
+                                                                   if state == params['state']}))
+            assert params['sort'] == 'created:desc'
+            return httpx.Response(200, json=self.make_reports(states))
+
+        reports_mock = respx.get(url__startswith=f'{BASE_URL}/reporting/api/reports').mock(side_effect=get_reports)
+
+        reports = await self.reports.wait_for_reports(report_ids=[1, 2])
+
+        assert reports[1].state == ReportState.finished
+        assert reports[2].state == ReportState.canceled
+        # reports due at the same time share one request per pending state (plus one search if generated)
+        assert reports_mock.call_count == 8
+        # generated reports are no longer requested
+        assert self.reports.report_ids == set()
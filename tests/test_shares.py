@@ -0,0 +1,169 @@
+import unittest
+import respx
+import httpx
+
+import copy
+import json
+from datetime import datetime, timedelta, timezone
+
+from dracoon import crypto
+from dracoon.client import DRACOONClient, OAuth2ConnectionType
+from dracoon.crypto.keypool import KeyPairPool
+from dracoon.crypto.models import UserKeyPairVersion
+from dracoon.nodes import DRACOONNodes
+from dracoon.serialization import JSON_BACKENDS, get_json_backend, set_json_backend
+from dracoon.shares import DRACOONShares
+from dracoon.shares.cleanup import ShareCleanup, is_created_by, is_expired, is_never_used
+from dracoon.shares.encrypted import EncryptedShares
+
+CLIENT_ID = 'client_id'
+CLIENT_SECRET = 'client_secret'
+BASE_URL = 'https://dracoon.team'
+DEFAULT_STRING = 'string'
+
+
+class TestAsyncDRACOONShares(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self) -> None:
+
+        with open('tests/responses/shares/download_shares_ok.json', 'r') as json_file:
+            self.shares_json = json.load(json_file)
+        with open('tests/responses/shares/upload_shares_ok.json', 'r') as json_file:
+            self.file_requests_json = json.load(json_file)
+
+        return super().setUp()
+
+    @respx.mock
+    async def asyncSetUp(self) -> None:
+        self.client = DRACOONClient(
+            base_url=BASE_URL, client_id=CLIENT_ID, client_secret=CLIENT_SECRET, raise_on_err=True)
+        with open('tests/responses/auth/auth_ok.json', 'r') as json_file:
+            login_json = json.load(json_file)
+            login_mock = respx.post(
+                f'{BASE_URL}/oauth/token').respond(200, json=login_json)
+            await self.client.connect(username='test_user', password='test_password', connection_type=OAuth2ConnectionType.password_flow)
+
+            assert login_mock.called
+            assert self.client.connected
+
+            self.shares = DRACOONShares(self.client)
+
+            return await super().asyncSetUp()
+
+    def make_page(self, list_json, offset: int, total: int, update_item):
+        page = {'range': {'offset': offset, 'limit': 500, 'total': total}, 'items': []}
+        for item_id in range(offset + 1, min(offset + 500, total) + 1):
+            item = copy.deepcopy(list_json['items'][0])
+            item['id'] = item_id
+            update_item(item)
+            page['items'].append(item)
+        return page
+
+    @respx.mock
+    async def test_find_and_delete_shares(self):
+        def update_share(share):
+            # every third share was never downloaded, share 501 does not expire
+            share['cntDownloads'] = 0 if share['id'] % 3 == 0 else 1
+            share['expireAt'] = None if share['id'] == 501 else '2020-01-01T00:00:00.000Z'
+
+        def get_shares(request: httpx.Request):
+            offset = int(request.url.params['offset'])
+            return httpx.Response(200, json=self.make_page(self.shares_json, offset, 501, update_share))
+
+        shares_mock = respx.get(url__startswith=f'{BASE_URL}/api/v4/shares/downloads').mock(side_effect=get_shares)
+        delete_mock = respx.delete(f'{BASE_URL}/api/v4/shares/downloads').mock(side_effect=[httpx.Response(204), httpx.Response(400)])
+
+        cleanup = ShareCleanup(self.shares, concurrency=2, batch_size=100)
+        shares = await cleanup.find_shares(predicates=[is_expired(), is_never_used()])
+
+        assert shares_mock.call_count == 2
+        assert [share.id for share in shares] == list(range(3, 501, 3))
+
+        results = await cleanup.delete_shares(share.id for share in shares)
+
+        assert delete_mock.call_count == 2
+        payloads = [json.loads(call.request.content) for call in delete_mock.calls]
+        assert sorted(len(payload['shareIds']) for payload in payloads) == [66, 100]
+        # failed batch is returned with error
+        assert len([result for result in results if result.error is not None]) == 1
+
+    @respx.mock
+    async def test_update_file_requests(self):
+        def update_file_request(file_request):
+            file_request['createdBy']['id'] = 4 if file_request['id'] == 2 else 3
+
+        file_requests_mock = respx.get(url__startswith=f'{BASE_URL}/api/v4/shares/uploads').respond(
+            200, json=self.make_page(self.file_requests_json, 0, 2, update_file_request))
+        update_mock = respx.put(f'{BASE_URL}/api/v4/shares/uploads').respond(204)
+
+        cleanup = ShareCleanup(self.shares)
+        file_requests = await cleanup.find_file_requests(predicates=[is_created_by([4])], filter='name:cn:string')
+
+        assert file_requests_mock.calls.last.request.url.params['filter'] == 'name:cn:string'
+        assert [file_request.id for file_request in file_requests] == [2]
+
+        expire_at = datetime.now(timezone.utc) + timedelta(days=1)
+        expiration = {'enableExpiration': True, 'expireAt': expire_at}
+        default_backend = get_json_backend()
+
+        # payload is the same with all JSON backends (orjson is optional)
+        try:
+            for backend in JSON_BACKENDS:
+                set_json_backend(backend)
+                results = await cleanup.update_file_requests([file_request.id for file_request in file_requests], expiration=expiration)
+
+                assert results[0].error is None
+                payload = json.loads(update_mock.calls.last.request.content)
+                assert payload['objectIds'] == [2]
+                assert payload['expiration']['enableExpiration'] == True
+                assert datetime.fromisoformat(payload['expiration']['expireAt'].replace('Z', '+00:00')) == expire_at
+                # limits are not reset by an expiration update
+                assert 'resetMaxSize' not in payload
+                assert 'resetMaxSlots' not in payload
+        finally:
+            set_json_backend(default_backend)
+
+        assert update_mock.call_count == len(JSON_BACKENDS)
+
+    @respx.mock
+    async def test_update_shares_keeps_limits(self):
+        update_mock = respx.put(f'{BASE_URL}/api/v4/shares/downloads').respond(204)
+
+        cleanup = ShareCleanup(self.shares)
+        await cleanup.update_shares([1, 2], show_creator_name=True)
+        payload = json.loads(update_mock.calls.last.request.content)
+        assert payload == {'objectIds': [1, 2], 'showCreatorName': True}
+
+        await cleanup.update_shares([1], reset_max_downloads=True)
+        assert json.loads(update_mock.calls.last.request.content)['resetMaxDownloads'] == True
+
+    @respx.mock
+    async def test_create_encrypted_shares(self):
+        user_keypair = crypto.create_plain_userkeypair(UserKeyPairVersion.RSA2048)
+        plain_file_key = crypto.create_file_key()
+        file_key = crypto.encrypt_file_key(plain_file_key=plain_file_key, keypair=user_keypair)
+
+        file_key_mock = respx.get(url__regex=rf'{BASE_URL}/api/v4/nodes/files/\d+/user_file_key').respond(200, json=file_key.model_dump())
+        share_json = copy.deepcopy(self.shares_json['items'][0])
+        create_mock = respx.post(f'{BASE_URL}/api/v4/shares/downloads').respond(201, json=share_json)
+
+        async with KeyPairPool(version=UserKeyPairVersion.RSA2048, size=2) as pool:
+            async with EncryptedShares(self.shares, DRACOONNodes(self.client), user_keypair, keypair_pool=pool,
+                                       concurrency=2) as encrypted_shares:
+                results = await encrypted_shares.create_shares(node_ids=[2, 3], password='VerySecret123!', name=DEFAULT_STRING)
+                assert encrypted_shares.private_key is not None
+
+        # parsed private key is dropped on close (no process-wide cache)
+        assert encrypted_shares.private_key is None
+        assert encrypted_shares.plain_keypair is None
+        assert not hasattr(crypto.load_private_key, 'cache_info')
+        assert file_key_mock.call_count == 2
+        assert create_mock.call_count == 2
+        assert all(result.id == 1 for result in results)
+
+        # share file key is decrypted with share keypair (password)
+        payload = json.loads(create_mock.calls.last.request.content)
+        assert 'password' not in payload
+        share_keypair = crypto.decrypt_private_key(secret='VerySecret123!', keypair=payload['keyPair'])
+        share_file_key = crypto.decrypt_file_key(file_key=crypto.models.FileKey(**payload['fileKey']), keypair=share_keypair)
+        assert share_file_key.key == plain_file_key.key
@@ -7,7 +7,8 @@ from datetime import datetime
 
 from dracoon.client import DRACOONClient, OAuth2ConnectionType
 from dracoon.user import DRACOONUser
-from dracoon.crypto import create_plain_userkeypair, encrypt_private_key
+from dracoon.crypto import create_plain_userkeypair, decrypt_private_key, encrypt_private_key
+from dracoon.crypto.keypool import KeyPairFactory
 from dracoon.crypto.models import UserKeyPairVersion
 
 CLIENT_ID = 'client_id'
@@ -115,6 +116,20 @@ class TestAsyncDRACOONUser(unittest.IsolatedAsyncioTestCase):
         await self.user.set_user_keypair(secret='test', version=UserKeyPairVersion.RSA4096)
         assert set_keypair_mock.called
 
+    @respx.mock
+    async def test_set_user_keypair_factory(self):
+        set_keypair_mock = respx.post(f'{BASE_URL}/api/v4/user/account/keypair').respond(204)
+
+        async with KeyPairFactory(size=1, versions=[UserKeyPairVersion.RSA2048]) as keypair_factory:
+            await self.user.set_user_keypair(secret='test', version=UserKeyPairVersion.RSA2048, keypair_factory=keypair_factory)
+            # one pool per requested version
+            assert list(keypair_factory.pools) == [UserKeyPairVersion.RSA2048]
+
+        assert set_keypair_mock.called
+        payload = json.loads(set_keypair_mock.calls.last.request.content)
+        keypair = decrypt_private_key(secret='test', keypair=payload)
+        assert keypair.privateKeyContainer.version == UserKeyPairVersion.RSA2048.value
+
     @respx.mock
     async def test_delete_user_keypair_4096(self):
         set_keypair_mock = respx.delete(f'{BASE_URL}/api/v4/user/account/keypair?version=RSA-4096').respond(204)
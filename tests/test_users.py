@@ -1,11 +1,16 @@
 import unittest
 import respx
 
+import csv
 import json
+import os
+import tempfile
 from datetime import datetime
 
 from dracoon.client import DRACOONClient, OAuth2ConnectionType
 from dracoon.users import DRACOONUsers
+from dracoon.users.inventory import UserInventory
+from dracoon.users.provisioning import UserProvisioning, read_user_csv
 
 CLIENT_ID = 'client_id'
 CLIENT_SECRET = 'client_secret'
@@ -65,6 +70,17 @@ class TestAsyncDRACOONUsers(unittest.IsolatedAsyncioTestCase):
         user = users.items[0]
         self.assert_user(user)
 
+    @respx.mock
+    async def test_get_users_compact(self):
+        get_users_mock = respx.get(
+            f'{BASE_URL}/api/v4/users').respond(200, json=self.users_json)
+        users = await self.users.get_users(compact=True)
+        assert get_users_mock.called
+        assert len(users.items) == 1
+        user = users.items[0]
+        self.assert_user(user)
+        self.assert_user(user.to_model())
+
     @respx.mock
     async def test_get_users_with_filter(self):
         filter = 'type:eq:file'
@@ -165,3 +181,78 @@ class TestAsyncDRACOONUsers(unittest.IsolatedAsyncioTestCase):
             f'{BASE_URL}/api/v4/users/{user_id}').respond(204)
         await self.users.delete_user(user_id=user_id)
         assert delete_user_mock.called
+
+    @respx.mock
+    async def test_user_provisioning(self):
+        users_mock = respx.get(f'{BASE_URL}/api/v4/users?offset=0&limit=500').respond(200, json=self.users_json)
+        create_mock = respx.post(f'{BASE_URL}/api/v4/users').respond(201, json={**self.user_json, 'id': 2})
+        update_mock = respx.put(url__regex=rf'{BASE_URL}/api/v4/users/\d+').respond(200, json=self.user_json)
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            csv_path = os.path.join(tmp_dir, 'users.csv')
+            report_path = os.path.join(tmp_dir, 'report.csv')
+            with open(csv_path, 'w', newline='') as csv_file:
+                csv_file.write('firstName,lastName,email,login\n')
+                csv_file.write('Jane,Doe,jane.doe@dracoon.team,\n')
+                csv_file.write('Existing,User,existing@dracoon.team,STRING\n')
+                csv_file.write(',Invalid,invalid@dracoon.team,\n')
+                csv_file.write('Jane,Doe,jane.doe@dracoon.team,\n')
+
+            provisioning = UserProvisioning(self.users, update_existing=True, concurrency=1)
+            summary = await provisioning.run(read_user_csv(csv_path), report_path=report_path)
+
+            with open(report_path, 'r', newline='') as report_file:
+                report = {int(row['row']): row for row in csv.DictReader(report_file)}
+
+            # unexpected errors fail the row only, summary is per run
+            update_mock.side_effect = ValueError('invalid response')
+            failed_summary = await provisioning.run(read_user_csv(csv_path))
+
+        assert failed_summary == {'created': 0, 'updated': 0, 'skipped': 0, 'failed': 4}
+        assert users_mock.call_count == 1
+        assert create_mock.call_count == 1
+        assert json.loads(create_mock.calls.last.request.content)['userName'] == 'jane.doe@dracoon.team'
+        assert update_mock.call_count == 5
+        assert summary == {'created': 1, 'updated': 2, 'skipped': 0, 'failed': 1}
+        assert report[1]['action'] == 'created'
+        assert report[2]['action'] == 'updated'
+        assert report[3]['action'] == 'failed'
+        assert report[3]['error']
+        # duplicate row is detected as existing user
+        assert report[4]['action'] == 'updated'
+        assert report[4]['userId'] == '2'
+
+    @respx.mock
+    async def test_user_inventory(self):
+        user = {**self.users_json['items'][0],
+                'userRoles': {'items': [{'id': 1, 'name': 'CONFIG_MANAGER', 'description': DEFAULT_STRING}]},
+                'userAttributes': {'items': [{'key': 'department', 'value': 'sales'}]}}
+        users_json = {'range': {'offset': 0, 'limit': 500, 'total': 1}, 'items': [user]}
+        groups_json = {'range': {'offset': 0, 'limit': 500, 'total': 1}, 'items': [{'id': 2, 'isMember': True, 'name': 'sales'}]}
+
+        users_mock = respx.get(
+            f'{BASE_URL}/api/v4/users?offset=0&limit=500&include_attributes=true&include_roles=true').respond(200, json=users_json)
+        groups_mock = respx.get(
+            f'{BASE_URL}/api/v4/users/1/groups?offset=0&filter=isMember%3Aeq%3Atrue&limit=500').respond(200, json=groups_json)
+
+        inventory = UserInventory(self.users)
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            csv_path = os.path.join(tmp_dir, 'users.csv')
+            jsonl_path = os.path.join(tmp_dir, 'users.jsonl')
+            assert await inventory.export(csv_path) == 1
+            assert await inventory.export(jsonl_path, format='jsonl') == 1
+
+            with open(csv_path, 'r', newline='') as csv_file:
+                rows = list(csv.DictReader(csv_file))
+            with open(jsonl_path, 'r') as jsonl_file:
+                json_rows = [json.loads(line) for line in jsonl_file]
+
+        assert users_mock.call_count == 2
+        assert groups_mock.call_count == 2
+        assert rows[0]['userName'] == DEFAULT_STRING
+        assert rows[0]['roles'] == 'CONFIG_MANAGER'
+        assert rows[0]['groups'] == 'sales'
+        assert rows[0]['attributes'] == 'department=sales'
+        assert json_rows[0]['attributes'] == {'department': 'sales'}
+        assert json_rows[0]['groups'] == ['sales']
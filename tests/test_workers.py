@@ -0,0 +1,107 @@
+import unittest
+import respx
+
+import asyncio
+
+import json
+import os
+import tempfile
+import time
+
+from dracoon import DRACOON, OAuth2ConnectionType
+from dracoon.client.token_store import FileTokenStore
+from dracoon.errors import InvalidArgumentError, WorkerError
+from dracoon.workers import RateLimiter, WorkerPool, close_worker, worker_state
+
+BASE_URL = 'https://dracoon.team'
+
+
+async def double_item(dracoon: DRACOON, item: int):
+    return item * 2, dracoon.client.connection.access_token
+
+
+async def get_request_hooks(dracoon: DRACOON, item: int):
+    return [[hook.__qualname__ for hook in http_client.event_hooks['request']]
+            for http_client in [dracoon.client.http, dracoon.client.uploader, dracoon.client.downloader]]
+
+
+async def fail_item(dracoon: DRACOON, item: int):
+    if item % 2:
+        raise ValueError(f'Odd item: {item}')
+    return item
+
+
+class TestAsyncDRACOONWorkers(unittest.IsolatedAsyncioTestCase):
+
+    @respx.mock
+    async def asyncSetUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        token_store = FileTokenStore(os.path.join(self.tmp_dir.name, 'tokens.json'))
+        self.dracoon = DRACOON(base_url=BASE_URL, raise_on_err=True, log_file_out=False, token_store=token_store)
+
+        with open('tests/responses/auth/auth_ok.json', 'r') as json_file:
+            self.login_json = json.load(json_file)
+            login_mock = respx.post(f'{BASE_URL}/oauth/token').respond(200, json=self.login_json)
+            await self.dracoon.connect(username='test_user', password='test_password', connection_type=OAuth2ConnectionType.password_flow,
+                                       full_info=False)
+
+            assert login_mock.called
+
+        return await super().asyncSetUp()
+
+    async def asyncTearDown(self) -> None:
+        self.tmp_dir.cleanup()
+        return await super().asyncTearDown()
+
+    async def test_worker_pool(self):
+        async with WorkerPool(self.dracoon, processes=2, concurrency=2, rate_limit=100) as pool:
+            results = await pool.run(double_item, range(10))
+
+            self.assertEqual([result[0] for result in results], [item * 2 for item in range(10)])
+            # workers reuse stored tokens of parent
+            self.assertTrue(all(result[1] == self.login_json['access_token'] for result in results))
+
+            results = await pool.run(fail_item, range(4), return_exceptions=True)
+            self.assertEqual(results[0], 0)
+            self.assertIsInstance(results[1], WorkerError)
+            self.assertEqual(results[1].error_type, 'ValueError')
+
+            with self.assertRaises(WorkerError):
+                await pool.run(fail_item, range(4))
+
+            # rate limit applies to all clients of a worker
+            hooks = (await pool.run(get_request_hooks, [0]))[0]
+            self.assertTrue(all('RateLimiter.on_request' in client_hooks for client_hooks in hooks))
+
+    async def test_worker_pool_requires_file_store(self):
+        dracoon = DRACOON(base_url=BASE_URL, log_file_out=False)
+        self.assertRaises(InvalidArgumentError, WorkerPool, dracoon)
+
+    async def test_rate_limiter(self):
+        rate_limiter = RateLimiter(rate=50)
+        started_at = time.time()
+
+        for _ in range(5):
+            await rate_limiter.wait()
+
+        self.assertGreaterEqual(time.time() - started_at, 4 / 50)
+
+
+class TestDRACOONWorker(unittest.TestCase):
+
+    def test_close_worker(self):
+        loop = asyncio.new_event_loop()
+        dracoon = DRACOON(base_url=BASE_URL, log_file_out=False)
+        worker_state.update(loop=loop, dracoon=dracoon)
+
+        close_worker()
+
+        self.assertTrue(loop.is_closed())
+        self.assertTrue(dracoon.client.http.is_closed)
+        self.assertTrue(dracoon.client.uploader.is_closed)
+        self.assertTrue(dracoon.client.downloader.is_closed)
+        self.assertNotIn('loop', worker_state)
+
+
+if __name__ == '__main__':
+    unittest.main()